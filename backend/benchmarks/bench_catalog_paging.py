@@ -0,0 +1,91 @@
+"""Deep paging benchmark for catalog browsing
+
+Fills the catalog with synthetic products and pages through a filtered
+query five products at a time. Compares re-running the query and slicing
+for every "show me more" (the old browse_catalog behaviour) against a
+ResultCursor, and reports the cost of the page at several depths plus
+resolving "the seventh one" from the first page.
+Run from the backend directory:
+
+    uv run python benchmarks/bench_catalog_paging.py [catalog_size]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import commerce_backend
+from catalog_cursor import PAGE_SIZE, ResultCursor
+from commerce_backend import iter_products, list_products
+from inventory import Inventory
+
+CATEGORIES = ["mug", "clothing", "stationery", "kitchen"]
+COLORS = ["black", "blue", "white", "gray", "red"]
+DEPTHS = [1, 10, 100, 1000]
+FILTERS = {"category": "mug", "max_price": 2000, "in_stock": True}
+
+
+def build_catalog(size: int) -> None:
+    products = [
+        {
+            "id": f"sku-{i:07d}",
+            "name": f"Product {i}",
+            "price": 100 + (i * 37) % 3000,
+            "currency": "INR",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "color": COLORS[i % len(COLORS)],
+            "stock": 0 if i % 10 == 0 else 5,
+        }
+        for i in range(size)
+    ]
+    commerce_backend.PRODUCTS = products
+    commerce_backend.PRODUCTS_BY_ID = {p["id"]: p for p in products}
+    commerce_backend.PRODUCT_POSITION = {p["id"]: i for i, p in enumerate(products)}
+    commerce_backend.INVENTORY = Inventory({p["id"]: p["stock"] for p in products})
+
+
+def requery_page(page: int) -> list:
+    start = page * PAGE_SIZE
+    return list_products(FILTERS)[start : start + PAGE_SIZE]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    build_catalog(size)
+    print(f"{size:,} products, filters {FILTERS}, {PAGE_SIZE} per page")
+
+    # Re-running the query costs the same full scan at every depth
+    started = time.perf_counter()
+    requery_page(0)
+    requery_ms = (time.perf_counter() - started) * 1000
+
+    cursor = ResultCursor(iter_products(FILTERS))
+    page_ms = {}
+    total_started = time.perf_counter()
+    for page in range(1, max(DEPTHS) + 1):
+        started = time.perf_counter()
+        cursor.next_page()
+        if page in DEPTHS:
+            page_ms[page] = (time.perf_counter() - started) * 1000
+    cursor_total_ms = (time.perf_counter() - total_started) * 1000
+
+    print(f"{'page':>6} {'re-query ms':>12} {'cursor ms':>10}")
+    for depth in DEPTHS:
+        print(f"{depth:>6} {requery_ms:>12.2f} {page_ms[depth]:>10.3f}")
+    print(
+        f"pages 1-{max(DEPTHS)}: re-query ~{requery_ms * max(DEPTHS) / 1000:.1f}s total, cursor {cursor_total_ms:.1f}ms total"
+    )
+
+    cursor = ResultCursor(iter_products(FILTERS))
+    cursor.next_page()
+    started = time.perf_counter()
+    cursor.item(7)
+    print(
+        f"'the seventh one' after page 1: re-query {requery_ms:.2f}ms, cursor {(time.perf_counter() - started) * 1000:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
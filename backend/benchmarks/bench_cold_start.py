@@ -0,0 +1,114 @@
+"""Cold-start benchmark for the agent entrypoints
+
+For each persona, runs fresh interpreters from the src directory and
+compares the old eager startup (every provider plugin and the turn
+detector imported with the agent module) against the lazy session
+factory:
+
+- import ms: ``-X importtime`` cumulative time for the agent module
+- worker ready ms: import + register_worker_plugins, what the main worker
+  process pays before it can accept jobs
+- job ready ms: import + prewarm, what each job process pays before its
+  first session can start
+
+Run from the backend directory:
+
+    uv run python benchmarks/bench_cold_start.py [runs]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+PERSONAS = {"shopping": "agent", "sdr": "agent_sdr", "wellness": "wellness_agent"}
+
+# What every agent module used to import up front
+EAGER_IMPORTS = (
+    "from livekit.plugins import murf, silero, google, deepgram, noise_cancellation\n"
+    "import inference_batching\n"
+)
+
+READY_SCRIPT = """
+import time
+started = time.perf_counter()
+{eager}import {module}
+from session_factory import register_worker_plugins
+{step}
+print(f"READY {{(time.perf_counter() - started) * 1000:.1f}}")
+"""
+
+WORKER_STEP = 'register_worker_plugins("{persona}")'
+JOB_STEP = "{module}.prewarm(type('Proc', (), {{'userdata': {{}}}})())"
+
+
+def _run(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    args = [sys.executable]
+    if importtime:
+        args += ["-X", "importtime"]
+    return subprocess.run(
+        [*args, "-c", code], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+
+
+def import_ms(module: str, eager: bool) -> float:
+    """Cumulative import time of the agent module (plus the eager plugins)"""
+    code = (EAGER_IMPORTS if eager else "") + f"import {module}\n"
+    stderr = _run(code, importtime=True).stderr
+    wanted = {module}
+    if eager:
+        wanted |= {
+            "livekit.plugins.murf",
+            "livekit.plugins.silero",
+            "livekit.plugins.google",
+            "livekit.plugins.deepgram",
+            "livekit.plugins.noise_cancellation",
+            "inference_batching",
+        }
+    total_us = 0
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        # Only top-level entries, so nested imports aren't counted twice
+        if match and len(match.group(2)) == 1 and match.group(3) in wanted:
+            total_us += int(match.group(1))
+    return total_us / 1000
+
+
+def ready_ms(persona: str, module: str, eager: bool, step: str) -> float:
+    code = READY_SCRIPT.format(
+        eager=EAGER_IMPORTS if eager else "",
+        module=module,
+        step=step.format(persona=persona, module=module),
+    )
+    stdout = _run(code).stdout
+    return float(re.search(r"READY ([\d.]+)", stdout).group(1))
+
+
+def median_of(runs: int, fn, *args) -> float:
+    return statistics.median(fn(*args) for _ in range(runs))
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"median of {runs} fresh interpreters per cell")
+    print(
+        f"{'persona':<10} {'mode':<6} {'import ms':>10} {'worker ready ms':>16} {'job ready ms':>13}"
+    )
+    for persona, module in PERSONAS.items():
+        for eager in (True, False):
+            imported = median_of(runs, import_ms, module, eager)
+            worker = median_of(runs, ready_ms, persona, module, eager, WORKER_STEP)
+            job = median_of(runs, ready_ms, persona, module, eager, JOB_STEP)
+            mode = "eager" if eager else "lazy"
+            print(
+                f"{persona:<10} {mode:<6} {imported:>10.1f} {worker:>16.1f} {job:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
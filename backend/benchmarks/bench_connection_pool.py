@@ -0,0 +1,163 @@
+"""First-audio latency for new rooms with and without connection warm-up
+
+Starts local stand-ins for the STT and TTS providers behind proxies that
+delays every new TCP connection by HANDSHAKE_MS (the TCP + TLS round
+trips a real provider costs). The TTS stand-in answers each text message
+over its WebSocket with audio after SYNTH_MS.
+
+Each simulated room is a fresh job process: a new ProviderConnectionPool,
+ROOM_CONNECT_MS of room setup, then the STT stream opens and the greeting
+is synthesized through a WebSocket ConnectionPool, the way the Murf plugin
+does it. With warm-up, warm_session's work (host warm-up, then TTS
+prewarm) runs while the room connects.
+
+Run from the backend directory:
+
+    uv run python benchmarks/bench_connection_pool.py [rooms]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from aiohttp import web
+from livekit.agents import utils
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from connection_pool import ProviderConnectionPool
+
+HANDSHAKE_MS = 120
+SYNTH_MS = 80
+ROOM_CONNECT_MS = 250
+
+
+async def start_provider() -> web.AppRunner:
+    async def root(request):
+        return web.Response(text="ok")
+
+    async def stream(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for _msg in ws:
+            await asyncio.sleep(SYNTH_MS / 1000)
+            await ws.send_bytes(b"\x00" * 960)
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", root)
+    app.router.add_get("/v1/tts", stream)
+    app.router.add_get("/v1/listen", stream)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    return runner
+
+
+async def start_handshake_proxy(upstream_port: int) -> asyncio.AbstractServer:
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        await asyncio.sleep(HANDSHAKE_MS / 1000)
+        upstream_reader, upstream_writer = await asyncio.open_connection(
+            "127.0.0.1", upstream_port
+        )
+        await asyncio.gather(
+            pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer)
+        )
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def room(stt_url: str, tts_url: str, warm: bool) -> dict:
+    started = time.perf_counter()
+    pool = ProviderConnectionPool()
+
+    async def connect_tts(timeout: float):
+        return await pool.http_session().ws_connect(
+            tts_url.replace("http", "ws", 1) + "/v1/tts"
+        )
+
+    async def close_ws(ws):
+        await ws.close()
+
+    tts_pool = utils.ConnectionPool(
+        connect_cb=connect_tts, close_cb=close_ws, max_session_duration=300
+    )
+    warmup = (
+        asyncio.create_task(pool.warm([stt_url, tts_url], components=[tts_pool]))
+        if warm
+        else None
+    )
+
+    await asyncio.sleep(ROOM_CONNECT_MS / 1000)
+
+    stt_ws = await pool.http_session().ws_connect(
+        stt_url.replace("http", "ws", 1) + "/v1/listen"
+    )
+    stt_ready_ms = (time.perf_counter() - started) * 1000
+
+    first_request = time.perf_counter()
+    async with tts_pool.connection(timeout=5) as tts_ws:
+        await tts_ws.send_str(
+            "Welcome to our online store! What are you looking for today?"
+        )
+        await tts_ws.receive()
+    first_audio_ms = (time.perf_counter() - started) * 1000
+    request_to_audio_ms = (time.perf_counter() - first_request) * 1000
+
+    if warmup:
+        await warmup
+    await stt_ws.close()
+    await tts_pool.aclose()
+    await pool.aclose()
+    return {
+        "stt_ready_ms": stt_ready_ms,
+        "first_audio_ms": first_audio_ms,
+        "request_to_audio_ms": request_to_audio_ms,
+        "stats": pool.get_stats(),
+    }
+
+
+async def run(rooms: int) -> None:
+    provider = await start_provider()
+    site = web.TCPSite(provider, "127.0.0.1", 0)
+    await site.start()
+    # Separate proxies stand in for the STT and TTS providers' hosts
+    port = site._server.sockets[0].getsockname()[1]
+    proxies = [await start_handshake_proxy(port) for _ in range(2)]
+    stt_url, tts_url = (
+        f"http://127.0.0.1:{proxy.sockets[0].getsockname()[1]}" for proxy in proxies
+    )
+
+    print(
+        f"{rooms} rooms, handshake {HANDSHAKE_MS}ms, synthesis {SYNTH_MS}ms, room connect {ROOM_CONNECT_MS}ms"
+    )
+    print(
+        f"{'mode':<8} {'stt ready ms':>13} {'first audio ms':>15} {'request->audio ms':>18}  pool stats (last room)"
+    )
+    for warm in (False, True):
+        results = [await room(stt_url, tts_url, warm) for _ in range(rooms)]
+        label = "warm" if warm else "cold"
+        print(
+            f"{label:<8} {statistics.median(r['stt_ready_ms'] for r in results):>13.1f} "
+            f"{statistics.median(r['first_audio_ms'] for r in results):>15.1f} "
+            f"{statistics.median(r['request_to_audio_ms'] for r in results):>18.1f}  {results[-1]['stats']}"
+        )
+
+    for proxy in proxies:
+        proxy.close()
+    await provider.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 10))
@@ -0,0 +1,121 @@
+"""End-of-turn batching benchmark
+
+Replays conversation transcripts as 1, 10 and 50 concurrent sessions
+against the stock multilingual EOU runner and BatchedMultilingualRunner,
+the same way the worker's shared inference process calls them (a thread
+pool sized to the CPU count). Reports end-of-turn latency and CPU time
+per room.
+
+The end-of-turn model scores chat text, not audio, so sessions are
+replayed from transcripts rather than recorded audio; speech-to-text cost
+is not included. Without arguments a single built-in sample conversation
+is used for every session, which only shows batching overhead and
+speedup; pass transcripts exported from real sessions for representative
+numbers. No results are checked in: they depend on the model revision and
+the machine.
+
+Needs the turn detector model locally (`uv run src/agent.py download-files`).
+Run from the backend directory:
+
+    uv run python benchmarks/bench_eou_batching.py [transcript.json ...]
+
+Each transcript file is a JSON list of {"role": ..., "content": ...} turns,
+e.g. exported from a recorded session's chat history.
+"""
+
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from livekit.plugins.turn_detector.multilingual import _EUORunnerMultilingual
+
+from inference_batching import BatchedMultilingualRunner
+
+CONCURRENCY = [1, 10, 50]
+
+SAMPLE_CONVERSATION = [
+    {
+        "role": "assistant",
+        "content": "Welcome to our online store! What are you looking for today?",
+    },
+    {"role": "user", "content": "I'm looking for a coffee mug"},
+    {
+        "role": "assistant",
+        "content": "Here are the products I found: a stoneware coffee mug and a blue ceramic mug.",
+    },
+    {"role": "user", "content": "I'll take the blue one um"},
+    {"role": "assistant", "content": "How many would you like?"},
+    {"role": "user", "content": "two please and can you tell me when it ships"},
+]
+
+
+def load_conversations(paths):
+    if not paths:
+        return [SAMPLE_CONVERSATION]
+    conversations = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            conversations.append(json.load(f))
+    return conversations
+
+
+def requests_for(conversation):
+    """One EOU request per user turn, with the history up to that turn"""
+    for i, turn in enumerate(conversation):
+        if turn["role"] == "user":
+            yield json.dumps({"chat_ctx": conversation[max(0, i - 5) : i + 1]}).encode()
+
+
+def bench(runner, conversations, sessions):
+    requests = [
+        req
+        for session in range(sessions)
+        for req in requests_for(conversations[session % len(conversations)])
+    ]
+    latencies = []
+
+    def predict(data):
+        started = time.perf_counter()
+        runner.run(data)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    pool_size = math.ceil(os.cpu_count() or 1)
+    cpu_started = time.process_time()
+    with ThreadPoolExecutor(max_workers=pool_size) as pool:
+        list(pool.map(predict, requests))
+    cpu_ms = (time.process_time() - cpu_started) * 1000
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return statistics.median(latencies), p99, cpu_ms / sessions
+
+
+def main():
+    conversations = load_conversations(sys.argv[1:])
+    runners = {
+        "stock": _EUORunnerMultilingual(),
+        "batched": BatchedMultilingualRunner(),
+    }
+    for runner in runners.values():
+        runner.initialize()
+
+    print(
+        f"{'runner':<8} {'sessions':>8} {'p50 ms':>8} {'p99 ms':>8} {'cpu ms/room':>12}"
+    )
+    for sessions in CONCURRENCY:
+        for name, runner in runners.items():
+            p50, p99, cpu_per_room = bench(runner, conversations, sessions)
+            print(
+                f"{name:<8} {sessions:>8} {p50:>8.1f} {p99:>8.1f} {cpu_per_room:>12.1f}"
+            )
+    print(f"batched runner: {runners['batched']._batcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
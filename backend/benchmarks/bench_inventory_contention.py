@@ -0,0 +1,76 @@
+"""Inventory contention benchmark
+
+Hundreds of concurrent checkout sessions race for a few units of one SKU,
+both as threads and as asyncio tasks with a think-time between reserve and
+confirm. Verifies nothing is oversold and reports throughput.
+Run from the backend directory:
+
+    uv run python benchmarks/bench_inventory_contention.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from inventory import Inventory
+
+SESSIONS = 500
+ATTEMPTS_PER_SESSION = 200
+STOCK = 50
+
+
+def bench_threads():
+    inventory = Inventory({"hoodie-001": STOCK})
+
+    def session(_):
+        sold = 0
+        for _ in range(ATTEMPTS_PER_SESSION):
+            reservation = inventory.reserve("hoodie-001")
+            if reservation and inventory.confirm(reservation):
+                sold += 1
+        return sold
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        sold = sum(pool.map(session, range(SESSIONS)))
+    elapsed = time.perf_counter() - started
+
+    attempts = SESSIONS * ATTEMPTS_PER_SESSION
+    print(
+        f"threads: {attempts:,} reserve attempts in {elapsed:.2f}s ({attempts / elapsed:,.0f}/s), sold {sold}/{STOCK}"
+    )
+    return sold == STOCK and inventory.available("hoodie-001") == 0
+
+
+async def bench_asyncio():
+    inventory = Inventory({"mug-002": STOCK})
+
+    async def session():
+        reservation = inventory.reserve("mug-002")
+        if reservation is None:
+            return 0
+        # The customer takes a moment to say "yes, place the order"
+        await asyncio.sleep(0.001)
+        return 1 if inventory.confirm(reservation) else 0
+
+    started = time.perf_counter()
+    sold = sum(await asyncio.gather(*(session() for _ in range(SESSIONS))))
+    elapsed = time.perf_counter() - started
+    print(
+        f"asyncio: {SESSIONS} sessions checked out in {elapsed * 1000:.1f}ms, sold {sold}/{STOCK}"
+    )
+    return sold == STOCK
+
+
+def main():
+    ok = bench_threads()
+    ok = asyncio.run(bench_asyncio()) and ok
+    print("PASS" if ok else "FAIL: oversold or undersold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Synthetic-load benchmark for the load governor
+
+Starts simulated rooms one after another, each in its own process like a
+LiveKit job. Every room burns CPU once per 20ms audio frame; the cost per
+frame depends on its pipeline profile (the multilingual turn detector and
+BVC being the expensive parts). Two runs are compared:
+
+- ungoverned: every room is admitted and runs the full profile
+- governed: rooms are admitted only while load_fnc stays under the
+  dispatcher threshold, and pick their profile with LoadGovernor
+
+Reports p99 audio frame lag across rooms. Run from the backend directory:
+
+    uv run python benchmarks/bench_load_governor.py [rooms_per_cpu]
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from load_governor import FRAME_INTERVAL_MS, FrameDeadlineMonitor, LoadGovernor
+
+# Simulated CPU cost per 20ms frame for each profile
+FRAME_COST_MS = {"full": 6.0, "reduced": 3.0, "minimal": 1.5}
+ROOM_SECONDS = 6.0
+ARRIVAL_INTERVAL = 0.3
+LOAD_THRESHOLD = 0.7
+
+
+def _burn(ms: float) -> None:
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+async def _room(name: str, profile: str, state_dir: str) -> dict:
+    monitor = FrameDeadlineMonitor(name, f"job-{name}", state_dir)
+    monitor.start()
+    deadline = time.perf_counter() + ROOM_SECONDS
+    while time.perf_counter() < deadline:
+        _burn(FRAME_COST_MS[profile])
+        await asyncio.sleep(FRAME_INTERVAL_MS / 1000)
+    stats = monitor.stats()
+    await monitor.stop()
+    return stats
+
+
+def room_process(name: str, governed: bool, state_dir: str, results) -> None:
+    profile = (
+        LoadGovernor(state_dir=state_dir).select_profile().name if governed else "full"
+    )
+    stats = asyncio.run(_room(name, profile, state_dir))
+    results.put({"room": name, "profile": profile, **stats})
+
+
+def run(governed: bool, rooms: int) -> None:
+    state_dir = tempfile.mkdtemp(prefix="load-bench-")
+    governor = LoadGovernor(state_dir=state_dir)
+    if governed:
+        # Like the worker's load_fnc: one sampler, read by every room process
+        governor.start_cpu_sampler()
+    results = mp.Queue()
+    processes = []
+    rejected = 0
+
+    for i in range(rooms):
+        if governed and governor.load() >= LOAD_THRESHOLD:
+            rejected += 1
+        else:
+            process = mp.Process(
+                target=room_process, args=(f"room-{i}", governed, state_dir, results)
+            )
+            process.start()
+            processes.append(process)
+        time.sleep(ARRIVAL_INTERVAL)
+
+    stats = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    lags = sorted(room["p99_lag_ms"] for room in stats)
+    profiles = {}
+    for room in stats:
+        profiles[room["profile"]] = profiles.get(room["profile"], 0) + 1
+    label = "governed" if governed else "ungoverned"
+    print(
+        f"{label:<10} admitted {len(stats):>3}, rejected {rejected:>3}, profiles {profiles}, "
+        f"worst room p99 lag {lags[-1]:.1f}ms, median room p99 lag {lags[len(lags) // 2]:.1f}ms"
+    )
+
+
+def main():
+    rooms_per_cpu = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    rooms = rooms_per_cpu * (os.cpu_count() or 1)
+    print(f"{rooms} rooms arriving every {ARRIVAL_INTERVAL}s, {ROOM_SECONDS}s each")
+    run(governed=False, rooms=rooms)
+    run(governed=True, rooms=rooms)
+
+
+if __name__ == "__main__":
+    main()
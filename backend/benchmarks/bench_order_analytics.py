@@ -0,0 +1,172 @@
+"""Streaming order analytics benchmark
+
+Writes N synthetic orders shaped like commerce_backend orders (1-3 lines,
+mixed INR/USD, spread over a year) as JSON Lines, then times:
+
+- a cold aggregation of every order by product, category, hour and currency
+- a refresh after one more day of orders is appended, using the cache
+- reports answered from the cached per-day partials
+
+Peak RSS is reported for the cold run. On a smaller file, the peak traced
+memory of streaming is compared with loading the file whole the way the
+ad-hoc scripts do. Run from the backend directory:
+
+    uv run python benchmarks/bench_order_analytics.py [n_orders]
+"""
+
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from order_analytics import DIMENSIONS, OrderAnalytics
+from pricing import to_minor
+from product_catalog import PRODUCTS
+
+N_ORDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+DAYS = 365
+NEW_DAY_ORDERS = 20_000
+MEMORY_ORDERS = 200_000
+START = date(2025, 1, 1)
+
+
+def synthetic_lines(
+    n_orders: int, first_id: int, start_day: date, days: int, seed: int
+):
+    rng = random.Random(seed)
+    per_day = max(n_orders // days, 1)
+    for i in range(n_orders):
+        day = start_day + timedelta(days=min(i // per_day, days - 1))
+        currency = rng.choice(("INR", "INR", "INR", "USD"))
+        items = []
+        for product in rng.sample(PRODUCTS, rng.randint(1, 3)):
+            items.append(
+                {
+                    "product_id": product["id"],
+                    "product_name": product["name"],
+                    "quantity": rng.randint(1, 4),
+                    "unit_price": product["price"],
+                    "unit_price_minor": to_minor(product["price"], currency),
+                    "currency": currency,
+                }
+            )
+        order = {
+            "id": f"{first_id + i:08x}",
+            "items": items,
+            "currency": currency,
+            "status": "CONFIRMED",
+            "created_at": f"{day.isoformat()}T{rng.randint(8, 22):02d}:{rng.randint(0, 59):02d}:00",
+        }
+        yield json.dumps(order) + "\n"
+
+
+def write_orders(
+    path: str,
+    n_orders: int,
+    first_id: int = 0,
+    start_day: date = START,
+    days: int = DAYS,
+    mode: str = "w",
+) -> None:
+    with open(path, mode, encoding="utf-8") as f:
+        f.writelines(
+            synthetic_lines(n_orders, first_id, start_day, days, seed=first_id)
+        )
+
+
+def naive_report(path: str) -> dict:
+    """Load everything, then group in Python, as the ad-hoc scripts do"""
+    with open(path, encoding="utf-8") as f:
+        orders = [json.loads(line) for line in f]
+    units = defaultdict(int)
+    for order in orders:
+        for item in order["items"]:
+            units[item["product_id"]] += item["quantity"]
+    return units
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp(prefix="orders-bench-")
+    path = os.path.join(directory, "orders.jsonl")
+    cache = os.path.join(directory, "cache.json")
+
+    started = time.perf_counter()
+    write_orders(path, N_ORDERS)
+    size_mb = os.path.getsize(path) / 1e6
+    print(
+        f"{N_ORDERS:,} orders over {DAYS} days, {size_mb:,.0f}MB (written in {time.perf_counter() - started:.0f}s)"
+    )
+
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    analytics = OrderAnalytics(path, cache)
+    analytics.refresh()
+    analytics.save()
+    cold_s = time.perf_counter() - started
+    print(
+        f"cold aggregation:     {cold_s:>8.1f}s ({N_ORDERS / cold_s:,.0f} orders/s, "
+        f"peak RSS {peak_rss_mb():,.0f}MB, {rss_before:,.0f}MB before)"
+    )
+
+    write_orders(
+        path,
+        NEW_DAY_ORDERS,
+        first_id=N_ORDERS,
+        start_day=START + timedelta(days=DAYS),
+        days=1,
+        mode="a",
+    )
+    started = time.perf_counter()
+    analytics = OrderAnalytics(path, cache)
+    added = analytics.refresh()
+    analytics.save()
+    print(
+        f"refresh with cache:   {time.perf_counter() - started:>8.2f}s ({added:,} new orders read)"
+    )
+
+    started = time.perf_counter()
+    for by in DIMENSIONS:
+        analytics.report(by)
+    all_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    last_week = (START + timedelta(days=DAYS - 6)).isoformat()
+    top = analytics.report("product", start=last_week, top=3)
+    print(
+        f"reports from cache:   {all_ms:>8.1f}ms for all {len(DIMENSIONS)} dimensions, "
+        f"{(time.perf_counter() - started) * 1000:.2f}ms for last week's top 3"
+    )
+    print(
+        f"  top products since {last_week}: "
+        + ", ".join(f"{r['product']} ({r['units']:,} units)" for r in top)
+    )
+    assert analytics.orders == N_ORDERS + NEW_DAY_ORDERS
+
+    small = os.path.join(directory, "small.jsonl")
+    write_orders(small, MEMORY_ORDERS)
+    for name, run in [
+        ("streaming", lambda: OrderAnalytics(small, None).refresh()),
+        ("load whole", lambda: naive_report(small)),
+    ]:
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"{name:<11} peak traced memory on {MEMORY_ORDERS:,} orders: {peak / 1e6:>7.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Order sink throughput benchmark
+
+Writes 100k coffee orders through OrderSink, then streams them back by
+date range. Run from the backend directory:
+
+    uv run python benchmarks/bench_order_sink.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from order_helper import OrderSink, iter_orders
+
+ORDERS = 100_000
+TARGET_PER_MINUTE = 100_000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        sink = OrderSink(directory=directory)
+
+        started = time.perf_counter()
+        for i in range(ORDERS):
+            sink.write(
+                {
+                    "drinkType": "latte",
+                    "size": "medium",
+                    "milk": "oat milk",
+                    "extras": ["vanilla"],
+                    "name": f"customer-{i}",
+                }
+            )
+        sink.close()
+        write_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        count = sum(1 for _ in iter_orders(date.today(), date.today(), directory))
+        read_s = time.perf_counter() - started
+
+        segments = len(os.listdir(directory))
+
+    per_minute = ORDERS / write_s * 60
+    print(
+        f"write: {ORDERS} orders in {write_s:.2f}s ({per_minute:,.0f} orders/min, {segments} segment files)"
+    )
+    print(f"read:  {count} orders in {read_s:.2f}s")
+    print("PASS" if per_minute >= TARGET_PER_MINUTE and count == ORDERS else "FAIL")
+
+
+if __name__ == "__main__":
+    main()
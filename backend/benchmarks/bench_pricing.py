@@ -0,0 +1,58 @@
+"""Bulk pricing benchmark
+
+Builds synthetic stored orders shaped like commerce_backend orders, then
+times a reprice-all against the current catalog and a revenue report.
+Run from the backend directory:
+
+    uv run python benchmarks/bench_pricing.py [n_orders]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from commerce_backend import PRODUCTS
+from pricing import PricingEngine, reprice_orders, revenue_report
+
+
+def synthetic_orders(n_orders: int):
+    rng = random.Random(7)
+    orders = []
+    for i in range(n_orders):
+        items = []
+        for product in rng.sample(PRODUCTS, rng.randint(1, 3)):
+            items.append(
+                {
+                    "product_id": product["id"],
+                    "quantity": rng.randint(1, 4),
+                    "unit_price": product["price"],
+                    "currency": rng.choice(["INR", "INR", "INR", "USD"]),
+                }
+            )
+        orders.append({"id": str(i), "items": items})
+    return orders
+
+
+def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    orders = synthetic_orders(n_orders)
+    engine = PricingEngine(tax_bp=1800)
+    catalog = {product["id"]: product for product in PRODUCTS}
+
+    started = time.perf_counter()
+    totals = reprice_orders(engine, orders, catalog)
+    reprice_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    report = revenue_report(engine, orders)
+    report_s = time.perf_counter() - started
+
+    print(f"reprice-all: {len(totals):,} orders in {reprice_s:.2f}s")
+    print(f"revenue report: {len(report)} products in {report_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
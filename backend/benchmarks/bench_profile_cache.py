@@ -0,0 +1,111 @@
+"""Returning-customer profile cache benchmark
+
+Writes PROFILES profiles to a temp directory, then replays SESSIONS calls
+whose callers follow a Zipf-like distribution (a few regulars, a long
+tail). Every call loads the caller's profile at connect, reads it twice
+more from tools and records one update. Reports cache hit rate and load
+latency for several cache sizes, next to the naive alternative of
+parsing one shared history file (like wellness_log.json) per call.
+Run from the backend directory:
+
+    uv run python benchmarks/bench_profile_cache.py
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from customer_profiles import ProfileStore
+
+PROFILES = 10_000
+SESSIONS = 5_000
+CACHE_SIZES = [64, 256, 1024]
+ENTRY = {
+    "mood": "calm",
+    "energy": "good",
+    "goals": ["walk", "read"],
+    "summary": "Feeling calm with good energy.",
+    "timestamp": "2025-12-01T08:00:00",
+}
+
+
+def callers(seed: int = 7) -> list:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(PROFILES)]
+    return [
+        f"caller-{i}" for i in rng.choices(range(PROFILES), weights=weights, k=SESSIONS)
+    ]
+
+
+async def seed_profiles(directory: str) -> None:
+    store = ProfileStore(directory, capacity=1)
+    for i in range(PROFILES):
+        await store.record_wellness(f"caller-{i}", ENTRY)
+
+
+async def replay(directory: str, capacity: int, identities: list) -> dict:
+    store = ProfileStore(directory, capacity=capacity)
+    connect_ms = []
+    started = time.perf_counter()
+    for identity in identities:
+        t0 = time.perf_counter()
+        await store.get(identity)
+        connect_ms.append((time.perf_counter() - t0) * 1000)
+        await store.get(identity)
+        await store.get(identity)
+        await store.record_wellness(identity, ENTRY)
+    connect_ms.sort()
+    return {
+        "elapsed_s": time.perf_counter() - started,
+        "p50_connect_ms": connect_ms[len(connect_ms) // 2],
+        "p99_connect_ms": connect_ms[int(len(connect_ms) * 0.99)],
+        **store.get_stats(),
+    }
+
+
+def shared_file_ms(directory: str) -> float:
+    """Load one caller's history from a single shared log, as the wellness log is stored"""
+    path = os.path.join(directory, "shared_log.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            [
+                {**ENTRY, "identity": f"caller-{i % PROFILES}"}
+                for i in range(PROFILES * 3)
+            ],
+            f,
+        )
+    started = time.perf_counter()
+    for _ in range(20):
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        [e for e in entries if e["identity"] == "caller-42"][-5:]
+    return (time.perf_counter() - started) * 1000 / 20
+
+
+async def main() -> None:
+    directory = tempfile.mkdtemp(prefix="profiles-bench-")
+    await seed_profiles(directory)
+    identities = callers()
+    print(
+        f"{PROFILES:,} profiles, {SESSIONS:,} calls, {len(set(identities)):,} distinct callers"
+    )
+    print(
+        f"{'cache':>6} {'hit rate':>9} {'p50 connect ms':>15} {'p99 connect ms':>15} {'avg disk load ms':>17} {'total s':>8}"
+    )
+    for capacity in CACHE_SIZES:
+        r = await replay(directory, capacity, identities)
+        print(
+            f"{capacity:>6} {r['hit_rate']:>9.3f} {r['p50_connect_ms']:>15.3f} {r['p99_connect_ms']:>15.3f} "
+            f"{r['avg_load_ms']:>17.3f} {r['elapsed_s']:>8.2f}"
+        )
+    print(f"shared history file: {shared_file_ms(directory):.1f}ms per caller lookup")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,437 @@
+"""Offline replay benchmark for recorded conversations
+
+Replays the transcript scripts in benchmarks/replay/ (one per persona:
+shopping, sdr, wellness, tutor) against the real agent tool code. A
+deterministic ScriptedLLM stands in for the model: for each recorded user
+turn it returns the recorded tool call, which is checked against the
+tool's signature and then awaited directly, so no model, room or network
+is involved. Each reply must contain the turn's "expect" text.
+
+Per tool it reports p50/p95 latency over --iterations replays, the worst
+call's peak allocations (tracemalloc, measured in a separate pass so it
+doesn't inflate latency) and persistence I/O bytes read and written
+(from /proc/self/io, where available).
+
+Everything runs against a temporary copy of src/, data/ and shared-data/,
+so replays never touch the real order, lead or wellness files.
+
+The results are compared with benchmarks/replay/baselines.json and the
+script exits with status 1 if a metric regressed by more than --threshold
+(plus a small absolute slack for allocator noise). By default only the
+machine-independent metrics are gated: allocations and I/O bytes. The
+checked-in timings come from one developer machine and are shown for
+reference only. To gate on latency, record a baseline on the same machine
+first, e.g. from the base branch's checkout, and pass --check-timings.
+With --backend the scripts come from that checkout's benchmarks/replay/
+(or this one's, if it has none), and turns calling tools it doesn't have
+yet are skipped; only tools present in both runs are compared:
+
+    uv run python benchmarks/bench_replay.py --backend ../base/backend \
+        --update-baseline --baseline /tmp/base.json
+    uv run python benchmarks/bench_replay.py --check-timings --baseline /tmp/base.json
+
+CI does this for pull requests (.github/workflows/replay.yml). After an
+intended change, refresh the baselines with --update-baseline. Allocation
+figures depend on the Python version; CI records and checks them on 3.11.
+Run from the backend directory:
+
+    uv run python benchmarks/bench_replay.py
+"""
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPLAY_DIR = os.path.join(BACKEND_DIR, "benchmarks", "replay")
+BASELINE_PATH = os.path.join(REPLAY_DIR, "baselines.json")
+PERSONAS = ("shopping", "sdr", "wellness", "tutor")
+
+ITERATIONS = 30
+THRESHOLD = 0.3
+# Gated by default: these don't depend on the machine's speed or load
+STABLE_METRICS = ("alloc_kb", "read_bytes", "write_bytes")
+# Only comparable with a baseline recorded on the same machine
+TIMING_METRICS = ("p50_ms", "p95_ms")
+# Absolute slack per metric, so sub-millisecond tools don't flag on timer noise
+SLACK = {
+    "p50_ms": 0.2,
+    "p95_ms": 0.5,
+    "alloc_kb": 16,
+    "read_bytes": 512,
+    "write_bytes": 512,
+}
+
+
+class FakeRunContext:
+    room = None
+
+
+class ScriptedLLM:
+    """Deterministic stand-in for the model: answers each user turn with its recorded tool call"""
+
+    def __init__(self, turns: list[dict]) -> None:
+        self.calls = {
+            turn["user"]: (turn["tool"], turn.get("args", {})) for turn in turns
+        }
+
+    def choose(self, user_text: str) -> tuple[str, dict]:
+        if user_text not in self.calls:
+            raise KeyError(f"No recorded tool call for {user_text!r}")
+        return self.calls[user_text]
+
+
+def read_io() -> Optional[tuple[int, int]]:
+    """Bytes this process has read and written so far (Linux only)"""
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+        return int(counters["rchar"]), int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def io_overhead() -> tuple[int, int]:
+    """Bytes that reading /proc/self/io itself adds to a measurement"""
+    deltas = []
+    for _ in range(5):
+        before, after = read_io(), read_io()
+        if before is None or after is None:
+            return 0, 0
+        deltas.append((after[0] - before[0], after[1] - before[1]))
+    return min(d[0] for d in deltas), min(d[1] for d in deltas)
+
+
+def load_script(persona: str, replay_dir: str = REPLAY_DIR) -> dict:
+    """The persona's script from replay_dir, or from this checkout if it has none"""
+    path = os.path.join(replay_dir, f"{persona}.json")
+    if not os.path.exists(path):
+        path = os.path.join(REPLAY_DIR, f"{persona}.json")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Sandbox:
+    """Agent modules imported from a throwaway copy of the backend"""
+
+    def __init__(self, backend_dir: str = BACKEND_DIR) -> None:
+        self.root = tempfile.mkdtemp(prefix="replay-bench-")
+        for name in ("src", "data", "shared-data"):
+            shutil.copytree(
+                os.path.join(backend_dir, name),
+                os.path.join(self.root, name),
+                ignore=shutil.ignore_patterns("__pycache__", "profiles"),
+            )
+        sys.path.insert(0, os.path.join(self.root, "src"))
+        self.commerce = importlib.import_module("commerce_backend")
+        self.wellness_storage = importlib.import_module("wellness_storage")
+        self.tutor_content = importlib.import_module("tutor_content")
+        self.agents = {
+            "shopping": importlib.import_module("agent").EcommerceAgent,
+            "sdr": importlib.import_module("agent_sdr").SDRAgent,
+            "wellness": importlib.import_module("wellness_agent").WellnessCompanion,
+        }
+        self.stock = {p["id"]: p.get("stock", 0) for p in self.commerce.PRODUCTS}
+        self.wellness_log = self.wellness_storage._get_wellness_file_path()
+        self.wellness_seed = self.wellness_log + ".seed"
+        if os.path.exists(self.wellness_log):
+            shutil.copyfile(self.wellness_log, self.wellness_seed)
+
+    def reset(self) -> None:
+        """Put orders, stock and the wellness log back to where the replay starts"""
+        self.commerce.ORDERS.clear()
+        for sku, units in self.stock.items():
+            self.commerce.INVENTORY.restock(
+                sku, units - self.commerce.INVENTORY.available(sku)
+            )
+        if os.path.exists(self.wellness_seed):
+            shutil.copyfile(self.wellness_seed, self.wellness_log)
+        elif os.path.exists(self.wellness_log):
+            os.remove(self.wellness_log)
+        # Checkouts from before the trend snapshot have none to reset
+        if hasattr(self.wellness_storage, "_get_trends_file_path"):
+            trends_path = self.wellness_storage._get_trends_file_path()
+            if os.path.exists(trends_path):
+                os.remove(trends_path)
+            self.wellness_storage._trends = None
+
+    def new_conversation(self, persona: str):
+        """The object whose methods are the persona's tools"""
+        if persona == "tutor":
+            # There is no tutor agent; its flow is the tutor_content functions
+            return self.tutor_content
+        return self.agents[persona]()
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def takes_context(tool) -> bool:
+    """Agent tools take a RunContext first; plain content functions don't"""
+    return "context" in inspect.signature(tool).parameters
+
+
+async def call_tool(tool, args: dict):
+    result = tool(FakeRunContext(), **args) if takes_context(tool) else tool(**args)
+    return await result if inspect.isawaitable(result) else result
+
+
+def unfit_reason(target, persona: str, turn: dict) -> Optional[str]:
+    """Why a recorded call can't be replayed against target, or None if it can"""
+    tool = getattr(target, turn["tool"], None)
+    if tool is None:
+        return f"{persona}: unknown tool {turn['tool']!r}"
+    try:
+        if takes_context(tool):
+            inspect.signature(tool).bind(FakeRunContext(), **turn.get("args", {}))
+        else:
+            inspect.signature(tool).bind(**turn.get("args", {}))
+    except TypeError as e:
+        return (
+            f"{persona}: recorded call to {turn['tool']} doesn't fit its signature: {e}"
+        )
+    return None
+
+
+def check_script(
+    sandbox: Sandbox, persona: str, script: dict, skip_unfit: bool = False
+) -> dict:
+    """Fail early if a recorded call no longer matches the tool's signature
+
+    With skip_unfit (replaying another checkout, which may predate some
+    tools) such turns are left out instead. Returns the script to replay.
+    """
+    target = sandbox.new_conversation(persona)
+    turns = []
+    for turn in script["turns"]:
+        reason = unfit_reason(target, persona, turn)
+        if reason is None:
+            turns.append(turn)
+        elif skip_unfit:
+            print(f"Skipping {reason}")
+        else:
+            raise SystemExit(reason)
+    return {**script, "turns": turns}
+
+
+async def replay(
+    sandbox: Sandbox,
+    persona: str,
+    script: dict,
+    samples: dict[str, dict[str, list[float]]],
+    measure_alloc: bool,
+    overhead: tuple[int, int] = (0, 0),
+) -> None:
+    """One pass through a script, appending per-call measurements to samples"""
+    sandbox.reset()
+    llm = ScriptedLLM(script["turns"])
+    target = sandbox.new_conversation(persona)
+    for turn in script["turns"]:
+        name, args = llm.choose(turn["user"])
+        tool = getattr(target, name)
+        metrics = samples.setdefault(f"{persona}.{name}", {})
+        if measure_alloc:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            reply = await call_tool(tool, args)
+            metrics.setdefault("alloc_kb", []).append(
+                (tracemalloc.get_traced_memory()[1] - before) / 1024
+            )
+        else:
+            io_before = read_io()
+            started = time.perf_counter()
+            reply = await call_tool(tool, args)
+            metrics.setdefault("ms", []).append((time.perf_counter() - started) * 1000)
+            io_after = read_io()
+            if io_before is not None and io_after is not None:
+                metrics.setdefault("read_bytes", []).append(
+                    max(0, io_after[0] - io_before[0] - overhead[0])
+                )
+                metrics.setdefault("write_bytes", []).append(
+                    max(0, io_after[1] - io_before[1] - overhead[1])
+                )
+        expected = turn.get("expect")
+        if expected and expected.lower() not in str(reply).lower():
+            raise SystemExit(
+                f"{persona}: {turn['user']!r} -> {name} replied {str(reply)[:200]!r}, expected {expected!r}"
+            )
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def summarize(
+    samples: dict[str, dict[str, list[float]]],
+) -> dict[str, dict[str, Optional[float]]]:
+    results = {}
+    for tool, metrics in samples.items():
+        results[tool] = {
+            "calls": len(metrics["ms"]),
+            "p50_ms": round(statistics.median(metrics["ms"]), 3),
+            "p95_ms": round(percentile(metrics["ms"], 0.95), 3),
+            "alloc_kb": round(max(metrics["alloc_kb"]), 1),
+            # Worst call; I/O is deterministic for a given script, so this is stable
+            "read_bytes": max(metrics["read_bytes"])
+            if "read_bytes" in metrics
+            else None,
+            "write_bytes": max(metrics["write_bytes"])
+            if "write_bytes" in metrics
+            else None,
+        }
+    return results
+
+
+def regressions(
+    results: dict[str, dict],
+    baselines: dict[str, dict],
+    threshold: float,
+    gated: tuple[str, ...] = STABLE_METRICS,
+) -> list[str]:
+    """Gated metrics that grew past the threshold, for tools in both results"""
+    found = []
+    for tool, metrics in results.items():
+        baseline = baselines.get(tool)
+        if baseline is None:
+            continue
+        for metric in gated:
+            slack = SLACK[metric]
+            value, base = metrics.get(metric), baseline.get(metric)
+            if value is None or base is None:
+                continue
+            if value > base * (1 + threshold) + slack:
+                found.append(
+                    f"{tool} {metric}: {value} vs baseline {base} (+{value / base - 1:.0%})"
+                    if base
+                    else f"{tool} {metric}: {value} vs baseline {base}"
+                )
+    return found
+
+
+def print_results(results: dict[str, dict], baselines: dict[str, dict]) -> None:
+    def fmt(value) -> str:
+        return "n/a" if value is None else f"{value:,}"
+
+    print(
+        f"{'tool':<36} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'alloc KB':>9} {'read B':>9} {'write B':>9} {'p50 vs base':>12}"
+    )
+    for tool, m in results.items():
+        base = baselines.get(tool, {}).get("p50_ms")
+        change = f"{m['p50_ms'] / base - 1:+.0%}" if base else "new"
+        print(
+            f"{tool:<36} {m['calls']:>6} {m['p50_ms']:>8.3f} {m['p95_ms']:>8.3f} {m['alloc_kb']:>9.1f} "
+            f"{fmt(m['read_bytes']):>9} {fmt(m['write_bytes']):>9} {change:>12}"
+        )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay recorded conversations and check for regressions"
+    )
+    parser.add_argument(
+        "--persona",
+        action="append",
+        choices=PERSONAS,
+        help="Only replay these personas",
+    )
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="Allowed relative regression, e.g. 0.3 for 30%%",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results to the baseline file",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_PATH,
+        help=f"Baseline file (default {os.path.relpath(BASELINE_PATH, BACKEND_DIR)})",
+    )
+    parser.add_argument(
+        "--check-timings",
+        action="store_true",
+        help="Also gate on p50/p95 latency; needs a baseline from this machine",
+    )
+    parser.add_argument(
+        "--backend",
+        default=BACKEND_DIR,
+        help="Replay the src/ and data of another backend checkout",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    personas = args.persona or list(PERSONAS)
+    replay_dir = os.path.join(args.backend, "benchmarks", "replay")
+    scripts = {persona: load_script(persona, replay_dir) for persona in personas}
+    sandbox = Sandbox(args.backend)
+    other_checkout = os.path.realpath(args.backend) != BACKEND_DIR
+    samples: dict[str, dict[str, list[float]]] = {}
+    overhead = io_overhead()
+    try:
+        for persona, script in scripts.items():
+            script = check_script(sandbox, persona, script, other_checkout)
+            await replay(sandbox, persona, script, {}, measure_alloc=False)  # Warm-up
+            for _ in range(args.iterations):
+                await replay(
+                    sandbox,
+                    persona,
+                    script,
+                    samples,
+                    measure_alloc=False,
+                    overhead=overhead,
+                )
+            tracemalloc.start()
+            for _ in range(max(1, args.iterations // 10)):
+                await replay(sandbox, persona, script, samples, measure_alloc=True)
+            tracemalloc.stop()
+    finally:
+        sandbox.cleanup()
+    results = summarize(samples)
+
+    baselines: dict[str, dict] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baselines = json.load(f)
+    print_results(results, baselines)
+
+    if args.update_baseline:
+        baselines.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    if not baselines:
+        print("No baselines yet; run with --update-baseline to record them")
+        return 0
+    gated = STABLE_METRICS + (TIMING_METRICS if args.check_timings else ())
+    found = regressions(results, baselines, args.threshold, gated)
+    for line in found:
+        print(f"REGRESSION {line}")
+    print(
+        f"{len(found)} regression(s) above {args.threshold:.0%}"
+        if found
+        else f"No regressions in {', '.join(gated)}"
+    )
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
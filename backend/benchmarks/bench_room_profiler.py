@@ -0,0 +1,101 @@
+"""Room profiler overhead benchmark
+
+Replays shopping utterances through the real EcommerceAgent tools on an
+event loop (with a JSON dump of the order history after each turn as a
+stand-in for persistence), with the sampling profiler off and on at
+several intervals. Reports the best of three runs in turns per CPU
+second, the profiler's cost per sample and how samples split by
+pipeline stage and tool.
+Run from the backend directory:
+
+    uv run python benchmarks/bench_room_profiler.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from agent import EcommerceAgent
+from room_profiler import SamplingProfiler
+
+DURATION = 2.0
+ROUNDS = 3
+UTTERANCES = [
+    "show me mugs",
+    "show me more",
+    "show me clothing",
+    "anything in black?",
+    "what did I order recently?",
+]
+HISTORY = [
+    {
+        "id": f"{i:08x}",
+        "items": [{"product_id": "mug-001", "quantity": 2}],
+        "total": 1600,
+        "created_at": "2025-12-01T10:00:00",
+    }
+    for i in range(50)
+]
+
+
+class FakeRunContext:
+    room = None
+
+
+async def replay(agent: EcommerceAgent) -> float:
+    """Turns per second of CPU time (steadier than wall time on a shared machine)"""
+    context = FakeRunContext()
+    await agent.handle_shopping(context, "hi")
+    turns = 0
+    started = time.process_time()
+    deadline = time.perf_counter() + DURATION
+    while time.perf_counter() < deadline:
+        await agent.handle_shopping(context, UTTERANCES[turns % len(UTTERANCES)])
+        json.dumps(HISTORY)
+        turns += 1
+        await asyncio.sleep(0)
+    return turns / (time.process_time() - started)
+
+
+async def best_rate(agent: EcommerceAgent, interval_ms: Optional[float], tools: list):
+    """Best of ROUNDS replays, so machine noise doesn't read as profiler overhead"""
+    rates, profiler = [], None
+    for _ in range(ROUNDS):
+        if interval_ms is not None:
+            profiler = SamplingProfiler(interval=interval_ms / 1000, tools=tools)
+            profiler.start()
+        rates.append(await replay(agent))
+        if profiler is not None:
+            profiler.stop()
+    return max(rates), profiler
+
+
+async def main() -> None:
+    agent = EcommerceAgent()
+    tools = [tool.__name__ for tool in agent.tools]
+    await replay(agent)  # Warm-up
+    baseline, _ = await best_rate(agent, None, tools)
+    print(
+        f"{'profiler':<16} {'turns/cpu-s':>12} {'overhead':>9} {'samples':>8} {'us/sample':>10} {'sampler cpu':>12}"
+    )
+    print(f"{'off':<16} {baseline:>12,.0f}")
+    for interval_ms in (10, 5, 1):
+        rate, profiler = await best_rate(agent, interval_ms, tools)
+        stats = profiler.get_stats()
+        print(
+            f"{f'every {interval_ms}ms':<16} {rate:>12,.0f} {1 - rate / baseline:>9.1%} "
+            f"{stats['samples']:>8,} {stats['avg_sample_us']:>10.1f} "
+            f"{stats['samples'] * stats['avg_sample_us'] / 1e6 / DURATION:>12.2%}"
+        )
+    print(f"stages: {stats['stages']}")
+    print(f"tools: {stats['tools']}")
+    print("hottest stack: " + profiler.collapsed().splitlines()[0][-160:])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""Tracing overhead benchmark
+
+Times a tool coroutine shaped like update_wellness called directly,
+through @trace_tool with tracing disabled, and with tracing enabled at
+several sample rates (exporting to a temp JSONL file). Also compares the
+old eagerly formatted log line, which is paid even when INFO is
+filtered, with the lazy replacement. Run from the backend directory:
+
+    uv run python benchmarks/bench_tracing.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+import tracing
+from tracing import Tracer, start_tracing, trace_tool
+
+CALLS = 200_000
+STATE = {
+    "mood": "a bit anxious",
+    "energy": "low",
+    "stressors": "deadline at work",
+    "goals": ["walk", "sleep early"],
+    "completed_goals": [],
+    "summary": "",
+}
+
+
+class FakeJobContext:
+    def __init__(self) -> None:
+        self.log_context_fields = {"room": "bench-room"}
+
+    def add_shutdown_callback(self, callback) -> None:
+        pass
+
+
+class Companion:
+    def __init__(self) -> None:
+        self.wellness_state = dict(STATE)
+
+    async def plain(self, context, field: str, value: str):
+        self.wellness_state[field] = value
+        return "How are you feeling today?"
+
+    @trace_tool
+    async def traced(self, context, field: str, value: str):
+        self.wellness_state[field] = value
+        tracing.TRACER.event(
+            "wellness.updated",
+            field=field,
+            filled=lambda: [k for k, v in self.wellness_state.items() if v],
+        )
+        return "How are you feeling today?"
+
+
+async def per_call_us(tool) -> float:
+    context = object()
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        await tool(context, field="mood", value="calm")
+    return (time.perf_counter() - started) / CALLS * 1e6
+
+
+def log_us(emit) -> float:
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        emit()
+    return (time.perf_counter() - started) / CALLS * 1e6
+
+
+async def main() -> None:
+    path = os.path.join(tempfile.mkdtemp(prefix="trace-bench-"), "traces.jsonl")
+    agent = Companion()
+    start_tracing(FakeJobContext())
+
+    baseline = await per_call_us(agent.plain)
+    tracing.TRACER = Tracer(enabled=False, path=path)
+    disabled = await per_call_us(agent.traced)
+    print(f"{'tool call':<28} {'us/call':>8} {'overhead us':>12}")
+    print(f"{'untraced':<28} {baseline:>8.2f}")
+    print(f"{'tracing disabled':<28} {disabled:>8.2f} {disabled - baseline:>12.2f}")
+
+    for rate in (0.0, 0.1, 1.0):
+        tracer = Tracer(enabled=True, sample_rate=rate, path=path, max_queue=CALLS * 2)
+        tracing.TRACER = tracer
+        tracer.start()
+        enabled = await per_call_us(agent.traced)
+        await tracer.aclose()
+        label = f"enabled, sampling {rate:.0%}"
+        print(
+            f"{label:<28} {enabled:>8.2f} {enabled - baseline:>12.2f}  ({tracer.exported:,} records written)"
+        )
+
+    logger = logging.getLogger("wellness_agent")
+    logger.setLevel(logging.WARNING)
+    field = "mood"
+    eager = log_us(lambda: logger.info(f"Updated wellness: {agent.wellness_state}"))
+    lazy = log_us(lambda: logger.debug("Updated wellness field %s", field))
+    print(f"filtered log line: eager f-string {eager:.2f}us, lazy {lazy:.2f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""Time to first audio and TTS request count, sentence vs adaptive chunking
+
+Streams long replies (a browse_catalog listing, an order status, the
+save_lead_json recap) at LLM speed through each tokenizer and sends every
+chunk as one request to a local fake TTS over a WebSocket, the way the
+Murf plugin sends each token. The fake TTS handles requests in order and
+takes REQUEST_OVERHEAD_MS plus SYNTH_MS_PER_CHAR per character before
+returning a chunk's audio. Tokenizers are built by the session factory
+for the full load profile, plus adaptive chunking under the minimal one.
+
+Run from the backend directory:
+
+    uv run python benchmarks/bench_tts_chunking.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from load_governor import FULL, MINIMAL
+from session_factory import _build_tokenizer
+
+REQUEST_OVERHEAD_MS = 60
+SYNTH_MS_PER_CHAR = 1.5
+LLM_CHARS_PER_DELTA = 6
+LLM_DELTA_MS = 10
+
+REPLIES = {
+    "browse_catalog": (
+        "Here are the products I found:\n"
+        "1. Stoneware Coffee Mug - ₹800 (black ).\n"
+        "2. Blue Ceramic Mug - ₹650 (blue ).\n"
+        "3. Classic Cotton T-Shirt - ₹1,299 (white M).\n"
+        "4. Zip Hoodie - ₹2,499 (grey L) - out of stock\n\n"
+        "Would you like more details about any of these, or shall I help you place an order?"
+    ),
+    "order_status": (
+        "Your last order (ID: 20251203101500123-4242-1):\n2x Blue Ceramic Mug - ₹1300\n\n"
+        "Total: ₹1300\nStatus: confirmed\nPlaced: 2025-12-03T10:15:00"
+    ),
+    "lead_recap": (
+        "Thank you so much for your time today! Just to recap: I spoke with Asha from Acme Corp, "
+        "who is the Head of Growth. You're looking at Razorpay for recurring subscription billing, "
+        "with a timeline of next quarter. Our team will follow up by email at asha@acme.com with "
+        "pricing details and a short onboarding plan. Have a wonderful day!"
+    ),
+}
+
+# Built the way the session factory builds them for a persona
+TOKENIZERS = {
+    "sentence": lambda: _build_tokenizer({"min_sentence_len": 2}, FULL),
+    "adaptive": lambda: _build_tokenizer(
+        {"chunking": "adaptive", "min_sentence_len": 2}, FULL
+    ),
+    "adaptive/min": lambda: _build_tokenizer(
+        {"chunking": "adaptive", "min_sentence_len": 2}, MINIMAL
+    ),
+}
+
+
+async def start_fake_tts() -> web.AppRunner:
+    async def synthesize(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            await asyncio.sleep(
+                (REQUEST_OVERHEAD_MS + SYNTH_MS_PER_CHAR * len(msg.data)) / 1000
+            )
+            await ws.send_bytes(b"\x00" * 960)
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/v1/tts", synthesize)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    return runner
+
+
+async def speak(ws: aiohttp.ClientWebSocketResponse, tokenizer, text: str) -> dict:
+    stream = tokenizer.stream()
+    started = time.perf_counter()
+    requests = 0
+
+    async def llm():
+        for i in range(0, len(text), LLM_CHARS_PER_DELTA):
+            stream.push_text(text[i : i + LLM_CHARS_PER_DELTA])
+            await asyncio.sleep(LLM_DELTA_MS / 1000)
+        stream.end_input()
+
+    async def send():
+        nonlocal requests
+        async for ev in stream:
+            await ws.send_str(ev.token)
+            requests += 1
+
+    received = 0
+    first_audio_ms = None
+
+    async def receive():
+        nonlocal received, first_audio_ms
+        while True:
+            await ws.receive()
+            received += 1
+            if first_audio_ms is None:
+                first_audio_ms = (time.perf_counter() - started) * 1000
+
+    llm_task = asyncio.create_task(llm())
+    recv_task = asyncio.create_task(receive())
+    await send()
+    await llm_task
+    while received < requests:
+        await asyncio.sleep(0.001)
+    recv_task.cancel()
+    return {
+        "requests": requests,
+        "first_audio_ms": first_audio_ms,
+        "done_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+async def main() -> None:
+    runner = await start_fake_tts()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"ws://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1/tts"
+
+    print(
+        f"fake TTS: {REQUEST_OVERHEAD_MS}ms per request + {SYNTH_MS_PER_CHAR}ms per char, "
+        f"LLM: {LLM_CHARS_PER_DELTA} chars every {LLM_DELTA_MS}ms"
+    )
+    print(
+        f"{'reply':<16} {'tokenizer':<12} {'requests':>8} {'first audio ms':>15} {'all audio ms':>13}"
+    )
+    async with aiohttp.ClientSession() as session:
+        for reply, text in REPLIES.items():
+            for name, make_tokenizer in TOKENIZERS.items():
+                async with session.ws_connect(url) as ws:
+                    result = await speak(ws, make_tokenizer(), text)
+                print(
+                    f"{reply:<16} {name:<12} {result['requests']:>8} {result['first_audio_ms']:>15.1f} {result['done_ms']:>13.1f}"
+                )
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
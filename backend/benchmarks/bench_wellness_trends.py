@@ -0,0 +1,143 @@
+"""Wellness trend analytics benchmark
+
+Generates ENTRIES synthetic check-ins (several a day over a few years,
+mostly free-text mood/energy answers, 20% written before numeric scores
+were stored) and compares three ways of answering "how has my week and
+month been?":
+
+- naive: scan the whole log and normalize the text on every query
+- backfill: build the rolling aggregates once with NumPy
+- incremental: keep them updated per check-in and query in O(1)
+
+Run from the backend directory:
+
+    uv run python benchmarks/bench_wellness_trends.py
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from wellness_analytics import (
+    WellnessTrends,
+    add_scores,
+    backfill,
+    entry_day,
+    normalize_energy,
+    normalize_mood,
+)
+
+ENTRIES = 1_000_000
+QUERIES = 1_000
+MOODS = [
+    "great",
+    "good",
+    "okay",
+    "a bit low",
+    "really stressed",
+    "happy",
+    "tired",
+    "calm",
+    "8/10",
+    "anxious",
+]
+ENERGIES = [
+    "high",
+    "low",
+    "medium",
+    "very tired",
+    "energetic",
+    "5 out of 10",
+    "drained",
+    "okay",
+]
+GOALS = ["walk", "sleep early", "drink water", "meditate", "stretch", "read"]
+
+
+def make_entries(seed: int = 11) -> list:
+    rng = random.Random(seed)
+    start = date(2023, 1, 1)
+    per_day = 900
+    entries = []
+    for i in range(ENTRIES):
+        day = start + timedelta(days=i // per_day)
+        entry = {
+            "mood": rng.choice(MOODS),
+            "energy": rng.choice(ENERGIES),
+            "stressors": "",
+            "goals": rng.sample(GOALS, 2),
+            "completed_goals": [rng.choice(GOALS)] if rng.random() < 0.4 else [],
+            "summary": "",
+            "timestamp": f"{day.isoformat()}T{8 + i % 12:02d}:00:00",
+        }
+        if i >= ENTRIES // 5:
+            add_scores(entry)
+        entries.append(entry)
+    return entries
+
+
+def naive_means(entries: list, today: int) -> dict:
+    """What answering a trend question costs without aggregates"""
+    result = {}
+    for field, normalize in (("mood", normalize_mood), ("energy", normalize_energy)):
+        for window in (7, 30):
+            scores = [
+                normalize(e[field]) for e in entries if entry_day(e) > today - window
+            ]
+            scores = [s for s in scores if s is not None]
+            result[f"{field}_{window}d"] = (
+                round(sum(scores) / len(scores), 2) if scores else None
+            )
+    return result
+
+
+def main() -> None:
+    entries = make_entries()
+    today = entry_day(entries[-1])
+    print(f"{ENTRIES:,} check-ins over {today - entry_day(entries[0]) + 1} days")
+
+    started = time.perf_counter()
+    expected = naive_means(entries, today)
+    naive_s = time.perf_counter() - started
+    print(f"naive scan per query:        {naive_s * 1000:>10.1f}ms")
+
+    started = time.perf_counter()
+    trends = backfill(entries)
+    print(
+        f"vectorized backfill:         {(time.perf_counter() - started) * 1000:>10.1f}ms (one-off)"
+    )
+
+    started = time.perf_counter()
+    incremental = WellnessTrends()
+    for entry in entries:
+        if "mood_score" not in entry:
+            add_scores(entry)
+        incremental.add(entry)
+    add_s = time.perf_counter() - started
+    print(f"incremental add:             {add_s / ENTRIES * 1e6:>10.2f}us per check-in")
+
+    started = time.perf_counter()
+    for _ in range(QUERIES):
+        summary = trends.summary(today)
+    query_us = (time.perf_counter() - started) / QUERIES * 1e6
+    print(
+        f"aggregate query (summary):   {query_us:>10.2f}us ({naive_s * 1e6 / query_us:,.0f}x faster than naive)"
+    )
+
+    assert summary == incremental.summary(today)
+    assert all(abs(summary[key] - value) <= 0.01 for key, value in expected.items()), (
+        summary,
+        expected,
+    )
+    print(
+        f"results match: mood 7d {summary['mood_7d']}, energy 30d {summary['energy_30d']}, "
+        f"streak {summary['streak']}, goals {summary['goals_completed']:,}/{summary['goals_set']:,}"
+    )
+
+
+if __name__ == "__main__":
+    main()
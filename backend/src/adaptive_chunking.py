@@ -0,0 +1,241 @@
+import re
+from typing import Optional
+
+from livekit.agents import tokenize, utils
+
+# A clause ends at , ; : or a dash, a sentence at . ! ?, and a list line at a newline,
+# each only when followed by whitespace (so "1,299" and "4.5" never split)
+CLAUSE_END = re.compile(r"[,;:—]\s|[.!?]['\")\]]*\s|\n")
+SENTENCE_END = re.compile(r"[.!?]['\")\]]*\s|:\s*\n|\n")
+ABBREVIATIONS = (
+    "mr.",
+    "mrs.",
+    "ms.",
+    "dr.",
+    "rs.",
+    "e.g.",
+    "i.e.",
+    "vs.",
+    "etc.",
+    "no.",
+)
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    """Whether the period ending at ``end`` belongs to an abbreviation or list number"""
+    word = text[:end].rsplit(None, 1)[-1].lower() if text[:end].strip() else ""
+    return word in ABBREVIATIONS or word[:-1].isdigit()
+
+
+def _boundaries(pattern: re.Pattern, text: str) -> list[int]:
+    """End offsets (exclusive, before trailing whitespace) of each match in text"""
+    ends = []
+    for match in pattern.finditer(text):
+        end = match.start() + len(match.group().rstrip())
+        if match.group() == "\n":
+            end = match.start()
+        if text[match.start()] == "." and _is_abbreviation(text, end):
+            continue
+        ends.append(end)
+    return ends
+
+
+class ChunkPlanner:
+    """Decides where chunks of a growing text buffer end
+
+    The first chunk of a segment ends at the first clause or list-line
+    boundary after ``first_min_len`` characters (or at a word break once
+    ``first_max_len`` is reached), so audio can start early. Every later
+    chunk ends at the last sentence boundary within the current target
+    length, as long as it holds ``next_len`` characters by then (otherwise
+    at the first boundary past the target), so a long sentence starts the
+    next chunk instead of holding back the one before it. The target starts at
+    ``next_len`` and is multiplied by ``growth`` after each chunk, up to
+    ``max_len``.
+
+    While streaming, nothing is cut until the buffer holds ``context_len``
+    characters, like the stream context of the plain sentence tokenizer.
+    """
+
+    def __init__(
+        self,
+        first_min_len: int = 8,
+        first_max_len: int = 60,
+        next_len: int = 60,
+        growth: float = 2.0,
+        max_len: int = 300,
+        context_len: int = 0,
+    ) -> None:
+        self.first_min_len = first_min_len
+        self.first_max_len = first_max_len
+        self.next_len = next_len
+        self.growth = growth
+        self.max_len = max_len
+        self.context_len = context_len
+        self.reset()
+
+    def reset(self) -> None:
+        self.chunks = 0
+        self.target = self.next_len
+
+    def next_cut(self, text: str, complete: bool = False) -> Optional[int]:
+        """Offset where the next complete chunk of ``text`` ends, or None to wait
+
+        ``complete`` means no more text will follow, so no stream context is
+        needed.
+        """
+        context = 0 if complete else self.context_len
+        if self.chunks == 0:
+            for end in _boundaries(CLAUSE_END, text):
+                if len(text[:end].strip()) >= self.first_min_len:
+                    return end if len(text) >= context else None
+            if len(text) >= self.first_max_len:
+                space = text.rfind(" ", 0, self.first_max_len)
+                return space if space > 0 else self.first_max_len
+            return None
+
+        cut = None
+        for end in _boundaries(SENTENCE_END, text):
+            if end > self.max_len and cut is not None:
+                break
+            if len(text[:end].strip()) > self.target and self._long_enough(text, cut):
+                # This sentence would overshoot the target: stop before it
+                return cut
+            cut = end
+            if len(text[:end].strip()) >= self.target:
+                return cut if len(text) >= context else None
+        # Any further sentence would overshoot the target too
+        if len(text) > self.target and self._long_enough(text, cut):
+            return cut if len(text) >= context else None
+        if len(text) >= self.max_len:
+            # No sentence break within a whole chunk: break at a word instead
+            if cut is not None:
+                return cut
+            space = text.rfind(" ", 0, self.max_len)
+            return space if space > 0 else self.max_len
+        return None
+
+    def _long_enough(self, text: str, cut: Optional[int]) -> bool:
+        """Whether a later chunk ending at ``cut`` holds ``next_len`` characters"""
+        return cut is not None and len(text[:cut].strip()) >= self.next_len
+
+    def advance(self) -> None:
+        if self.chunks > 0:
+            self.target = min(int(self.target * self.growth), self.max_len)
+        self.chunks += 1
+
+    def split(self, text: str) -> list[str]:
+        """Chunk a complete text the same way a stream would"""
+        self.reset()
+        chunks = []
+        rest = text
+        while rest.strip():
+            cut = self.next_cut(rest, complete=True)
+            if cut is None or cut <= 0:
+                cut = len(rest)
+            chunk, rest = rest[:cut].strip(), rest[cut:]
+            if chunk:
+                chunks.append(chunk)
+                self.advance()
+        self.reset()
+        return chunks
+
+
+class AdaptiveSentenceStream(tokenize.SentenceStream):
+    """Streaming side of AdaptiveSentenceTokenizer, one segment per flush"""
+
+    def __init__(self, planner: ChunkPlanner) -> None:
+        super().__init__()
+        self._planner = planner
+        self._buf = ""
+        self._segment_id = utils.shortuuid()
+
+    def push_text(self, text: str) -> None:
+        self._check_not_closed()
+        if not text:
+            return
+        self._buf += text
+        while True:
+            cut = self._planner.next_cut(self._buf)
+            if cut is None or cut <= 0:
+                break
+            self._emit(self._buf[:cut])
+            self._buf = self._buf[cut:]
+
+    def _emit(self, text: str) -> None:
+        chunk = text.strip()
+        if chunk:
+            self._event_ch.send_nowait(
+                tokenize.TokenData(token=chunk, segment_id=self._segment_id)
+            )
+            self._planner.advance()
+
+    def flush(self) -> None:
+        self._check_not_closed()
+        for chunk in (
+            self._planner.split(self._buf)
+            if self._planner.chunks == 0
+            else self._rest_chunks()
+        ):
+            self._event_ch.send_nowait(
+                tokenize.TokenData(token=chunk, segment_id=self._segment_id)
+            )
+        self._buf = ""
+        self._planner.reset()
+        self._segment_id = utils.shortuuid()
+
+    def _rest_chunks(self) -> list[str]:
+        """Whatever is buffered, in chunks no longer than max_len"""
+        chunks, rest = [], self._buf
+        while len(rest) > self._planner.max_len:
+            cut = self._planner.next_cut(rest, complete=True) or self._planner.max_len
+            chunks.append(rest[:cut].strip())
+            rest = rest[cut:]
+        chunks.append(rest.strip())
+        return [chunk for chunk in chunks if chunk]
+
+    def end_input(self) -> None:
+        self.flush()
+        self._do_close()
+
+    async def aclose(self) -> None:
+        self._do_close()
+
+
+class AdaptiveSentenceTokenizer(tokenize.SentenceTokenizer):
+    """Sentence tokenizer for TTS that starts with a short chunk and then grows
+
+    A drop-in for ``tokenize.basic.SentenceTokenizer`` in TTS plugins. The
+    first chunk of every reply is a clause or list header, which gets the
+    first audio out sooner; later chunks grow (60, 120, 240... characters,
+    always ending on a sentence) so long replies such as product listings
+    and recaps take fewer TTS requests. ``context_len`` is the streaming
+    lookahead (see ChunkPlanner).
+    """
+
+    def __init__(
+        self,
+        first_min_len: int = 8,
+        first_max_len: int = 60,
+        next_len: int = 60,
+        growth: float = 2.0,
+        max_len: int = 300,
+        context_len: int = 0,
+    ) -> None:
+        self._options: tuple[int, int, int, float, int, int] = (
+            first_min_len,
+            first_max_len,
+            next_len,
+            growth,
+            max_len,
+            context_len,
+        )
+
+    def _planner(self) -> ChunkPlanner:
+        return ChunkPlanner(*self._options)
+
+    def tokenize(self, text: str, *, language: Optional[str] = None) -> list[str]:
+        return self._planner().split(text)
+
+    def stream(self, *, language: Optional[str] = None) -> AdaptiveSentenceStream:
+        return AdaptiveSentenceStream(self._planner())
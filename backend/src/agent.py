@@ -1,30 +1,148 @@
+import asyncio
 import logging
+import re
 
 from dotenv import load_dotenv
-from commerce_backend import list_products, create_order, get_last_order, get_product_by_id
+from commerce_backend import iter_products, create_order, get_last_order, get_product_by_id, reserve_product, release_reservation, INVENTORY
+from catalog_cursor import ResultCursor, ordinal_position
+from customer_profiles import PROFILES, profile_context, start_profile_load
+from inventory import OutOfStockError
+from speculative_tools import SpeculativeTool, SpeculativeToolRunner
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
     JobProcess,
     MetricsCollectedEvent,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     metrics,
-    tokenize,
     function_tool,
-    RunContext
+    RunContext,
+    UserInputTranscribedEvent,
+    UserStateChangedEvent,
 )
 import json
 from datetime import datetime
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from load_governor import GOVERNOR, current_load
+from connection_pool import POOL
+from tracing import start_tracing, trace_tool
+from room_profiler import start_room_profiler
+from session_factory import (
+    create_session,
+    import_plugins,
+    load_vad,
+    register_worker_plugins,
+    room_input_options,
+    warm_session,
+)
 
 logger = logging.getLogger("agent")
 
 load_dotenv(".env.local")
 
+COLORS = ["black", "blue", "white", "gray"]
+# "under 500", "under ₹1,000", "under rs 800"
+UNDER_PRICE = re.compile(r"\bunder\s+(?:₹|rs\.?\s*|rupees\s+)?(\d[\d,]*)")
+
+
+def catalog_filters(category: str = "", max_price: int = 0, color: str = "", search_term: str = "", in_stock_only: bool = False) -> dict:
+    """Build catalog filters from browse_catalog arguments"""
+    filters = {}
+    if category:
+        filters["category"] = category
+    if max_price > 0:
+        filters["max_price"] = max_price
+    if color:
+        filters["color"] = color
+    if search_term:
+        filters["name_contains"] = search_term
+    if in_stock_only:
+        filters["in_stock"] = True
+    return filters
+
+
+def search_catalog(category: str = "", max_price: int = 0, color: str = "", search_term: str = "", in_stock_only: bool = False):
+    """Read-only catalog lookup shared by browse_catalog and speculation
+
+    Returns the result cursor (with its first page already shown) and the reply.
+    """
+    cursor = ResultCursor(iter_products(catalog_filters(category, max_price, color, search_term, in_stock_only)))
+    page = cursor.next_page()
+
+    if not page:
+        return cursor, "I couldn't find any products matching your criteria. Try a different search or ask to see all products."
+
+    return cursor, describe_page(cursor, page, "Here are the products I found")
+
+
+def describe_page(cursor: ResultCursor, page: list, heading: str) -> str:
+    """Spoken listing for one page, numbered by position in the whole result"""
+    start = cursor.position - len(page) + 1
+    product_list = []
+    for i, product in enumerate(page, start):
+        stock_note = "" if INVENTORY.available(product["id"]) > 0 else " - out of stock"
+        product_list.append(f"{i}. {product['name']} - ₹{product['price']} ({product['color']} {product.get('size', '')}){stock_note}")
+
+    products_text = "\n".join(product_list)
+    more_note = f" I can also show you the next {cursor.page_size}." if cursor.has_more() else ""
+    return f"{heading}:\n{products_text}\n\nWould you like more details about any of these, or shall I help you place an order?{more_note}"
+
+
+def describe_last_order() -> str:
+    """Read-only last order summary shared by get_order_status and speculation"""
+    order = get_last_order()
+
+    if not order:
+        return "You haven't placed any orders yet. Would you like to browse our catalog?"
+
+    items_text = "\n".join([f"{item['quantity']}x {item['product_name']} - ₹{item['total_price']}"
+                           for item in order['items']])
+
+    return f"Your last order (ID: {order['id']}):\n{items_text}\n\nTotal: ₹{order['total']}\nStatus: {order['status']}\nPlaced: {order['created_at'][:19]}"
+
+
+def describe_recent_order(order: dict) -> str:
+    """Summary of an order from the customer's profile"""
+    items_text = "\n".join(order["items"])
+    return f"Your last order (ID: {order['id']}):\n{items_text}\n\nTotal: ₹{order['total']}\nStatus: {order['status']}\nPlaced: {order['created_at'][:19]}"
+
+
+def predict_browse(transcript: str):
+    """Guess browse_catalog arguments from a partial user utterance"""
+    text = transcript.lower()
+    if "mug" in text:
+        return {"category": "mug"}
+    if any(word in text for word in ["clothing", "shirt", "hoodie"]):
+        return {"category": "clothing"}
+    under = UNDER_PRICE.search(text)
+    if under:
+        return {"max_price": int(under.group(1).replace(",", ""))}
+    color = next((color for color in COLORS if color in text), None)
+    if color:
+        return {"color": color}
+    return None
+
+
+def predict_order_status(transcript: str):
+    """Guess a get_order_status call from a partial user utterance"""
+    text = transcript.lower()
+    if any(word in text for word in ["bought", "ordered", "last order", "order status", "my order"]):
+        return {}
+    return None
+
+
+def build_speculation() -> SpeculativeToolRunner:
+    """Speculative runner for the read-only shopping tools (never place_order)"""
+    return SpeculativeToolRunner([
+        SpeculativeTool(
+            "browse_catalog",
+            predict=predict_browse,
+            run=search_catalog,
+            key=lambda args: tuple(sorted(catalog_filters(**args).items())),
+        ),
+        SpeculativeTool("get_order_status", predict=predict_order_status, run=describe_last_order),
+    ])
+
 
 class EcommerceAgent(Agent):
     def __init__(self) -> None:
@@ -43,8 +161,9 @@ class EcommerceAgent(Agent):
             1. Greet customers and ask what they're looking for
             2. Use browse_catalog function to show relevant products
             3. Help customers select products and quantities
-            4. Use place_order function to create orders
-            5. Confirm order details and provide order ID
+            4. Use check_availability when asked about stock; it holds the item while they decide
+            5. Use place_order function to create orders
+            6. Confirm order details and provide order ID
             
             Key behaviors:
             - Always use functions to get real product data - DO NOT make up products
@@ -56,14 +175,29 @@ class EcommerceAgent(Agent):
             Example interactions:
             - "Show me coffee mugs" → call browse_catalog with mug category
             - "I want the blue mug" → identify product and help place order
+            - "Show me more" / "next five" → call show_more_products for the next page
+            - "I'll take the seventh one" → pass "seventh one" as the product reference
             - "What did I just buy?" → call get_last_order to show recent purchase""",
         )
         self.session_started = False
-        self.last_shown_products = []  # Track products shown to user
+        self.browse_cursor = None  # ResultCursor for the last catalog search
+        self.reservations = {}  # product_id -> stock hold from check_availability
         self.room = None
+        self.speculation = build_speculation()
+        self.customer_id = None  # Signed-in customer id, once known
+        self.profile = None  # Returning-customer profile from customer_profiles
+
+    async def attach_profile(self, customer_id: str, profile: dict):
+        """Remember who the caller is and give the LLM their history"""
+        self.customer_id = customer_id
+        self.profile = profile
+        context = profile_context(profile)
+        if context:
+            await self.update_instructions(self.instructions + context)
 
     @function_tool
-    async def browse_catalog(self, context: RunContext, category: str = "", max_price: int = 0, color: str = "", search_term: str = ""):
+    @trace_tool
+    async def browse_catalog(self, context: RunContext, category: str = "", max_price: int = 0, color: str = "", search_term: str = "", in_stock_only: bool = False):
         """Browse product catalog with filters
         
         Args:
@@ -71,90 +205,136 @@ class EcommerceAgent(Agent):
             max_price: Maximum price filter
             color: Color filter
             search_term: Search in product names
+            in_stock_only: Only show products that are currently available
         """
         self.room = context.room
         
-        filters = {}
-        if category:
-            filters["category"] = category
-        if max_price > 0:
-            filters["max_price"] = max_price
-        if color:
-            filters["color"] = color
-        if search_term:
-            filters["name_contains"] = search_term
-        
-        products = list_products(filters)
-        self.last_shown_products = products
+        args = {"category": category, "max_price": max_price, "color": color, "search_term": search_term, "in_stock_only": in_stock_only}
+        result = await self.speculation.take("browse_catalog", args)
+        if result is None:
+            result = search_catalog(**args)
         
-        if not products:
-            return "I couldn't find any products matching your criteria. Try a different search or ask to see all products."
-        
-        # Format product list
-        product_list = []
-        for i, product in enumerate(products[:5], 1):  # Show max 5 products
-            product_list.append(f"{i}. {product['name']} - ₹{product['price']} ({product['color']} {product.get('size', '')})")
-        
-        products_text = "\n".join(product_list)
-        return f"Here are the products I found:\n{products_text}\n\nWould you like more details about any of these, or shall I help you place an order?"
+        self.browse_cursor, reply = result
+        return reply
+
+    def active_cursor(self):
+        """The last search's cursor, unless it has expired"""
+        if self.browse_cursor is not None and self.browse_cursor.expired():
+            self.browse_cursor = None
+        return self.browse_cursor
 
     @function_tool
-    async def place_order(self, context: RunContext, product_reference: str, quantity: int = 1):
-        """Place an order for a product
-        
-        Args:
-            product_reference: Product name, ID, or reference like "first one", "blue mug"
-            quantity: Quantity to order
-        """
-        # Try to resolve product reference
-        product = None
-        
+    @trace_tool
+    async def show_more_products(self, context: RunContext):
+        """Show the next page of results from the last catalog search"""
+        cursor = self.active_cursor()
+        if cursor is None:
+            return "Let's start a new search. What kind of product are you looking for?"
+
+        page = cursor.next_page()
+        if not page:
+            return "That's everything that matched your search. Would you like to try a different search?"
+        return describe_page(cursor, page, "Here are more products")
+
+    def resolve_product(self, product_reference: str):
+        """Resolve a product ID or spoken reference like "first one", "blue mug" """
         # Check if it's a direct product ID
         product = get_product_by_id(product_reference)
         
-        # If not found, try to match from last shown products
-        if not product and self.last_shown_products:
+        # If not found, try to match from the last search's results
+        cursor = self.active_cursor()
+        if not product and cursor is not None:
             reference_lower = product_reference.lower()
             
-            # Handle ordinal references
-            if "first" in reference_lower or "1" in reference_lower:
-                product = self.last_shown_products[0] if len(self.last_shown_products) > 0 else None
-            elif "second" in reference_lower or "2" in reference_lower:
-                product = self.last_shown_products[1] if len(self.last_shown_products) > 1 else None
-            elif "third" in reference_lower or "3" in reference_lower:
-                product = self.last_shown_products[2] if len(self.last_shown_products) > 2 else None
+            # Handle ordinal references ("the seventh one", "number 7")
+            position = ordinal_position(reference_lower)
+            if position is not None:
+                product = cursor.item(position)
             
             # Handle color/name matching
             if not product:
-                for p in self.last_shown_products:
+                for p in cursor.shown:
                     if (reference_lower in p["name"].lower() or 
                         reference_lower in p["color"].lower()):
                         product = p
                         break
         
+        return product
+
+    @function_tool
+    @trace_tool
+    async def check_availability(self, context: RunContext, product_reference: str, quantity: int = 1):
+        """Check stock for a product and hold it while the customer decides
+
+        Args:
+            product_reference: Product name, ID, or reference like "first one", "blue mug"
+            quantity: Quantity the customer is interested in
+        """
+        product = self.resolve_product(product_reference)
         if not product:
             return f"I couldn't find the product '{product_reference}'. Could you be more specific or browse the catalog again?"
         
-        # Create order
+        # Replace any earlier hold on the same product
+        previous = self.reservations.pop(product["id"], None)
+        if previous:
+            release_reservation(previous)
+
+        reservation_id = reserve_product(product["id"], quantity)
+        if reservation_id is None:
+            available = INVENTORY.available(product["id"])
+            if available > 0:
+                return f"We only have {available} of the {product['name']} left. Would you like that many instead?"
+            return f"Sorry, the {product['name']} is out of stock right now. Would you like to see similar products?"
+
+        self.reservations[product["id"]] = reservation_id
+        return f"Good news, the {product['name']} is in stock. I've set aside {quantity} for you while you decide. Shall I place the order?"
+
+    @function_tool
+    @trace_tool
+    async def place_order(self, context: RunContext, product_reference: str, quantity: int = 1):
+        """Place an order for a product
+
+        Args:
+            product_reference: Product name, ID, or reference like "first one", "blue mug"
+            quantity: Quantity to order
+        """
+        product = self.resolve_product(product_reference)
+
+        if not product:
+            return f"I couldn't find the product '{product_reference}'. Could you be more specific or browse the catalog again?"
+
+        # Create order, using the stock held by check_availability if there is one
         line_items = [{"product_id": product["id"], "quantity": quantity}]
-        order = create_order(line_items)
+        reservation_id = self.reservations.pop(product["id"], None)
+        if reservation_id:
+            line_items[0]["reservation_id"] = reservation_id
+
+        try:
+            order = create_order(line_items)
+        except OutOfStockError as e:
+            if e.available > 0:
+                return f"Sorry, we only have {e.available} of the {product['name']} left. Would you like to order that many instead?"
+            return f"Sorry, the {product['name']} just sold out. Would you like to see similar products?"
+        self.speculation.invalidate("get_order_status")
+        if self.customer_id:
+            self.profile = await PROFILES.record_order(self.customer_id, order)
         
-        return f"Order placed successfully! Order ID: {order['id']}\n\nYou ordered:\n{quantity}x {product['name']} - ₹{product['price'] * quantity}\n\nTotal: ₹{order['total']}\n\nYour order is confirmed and will be processed shortly."
+        line = order["items"][0]
+        return f"Order placed successfully! Order ID: {order['id']}\n\nYou ordered:\n{line['quantity']}x {line['product_name']} - ₹{line['total_price']}\n\nTotal: ₹{order['total']}\n\nYour order is confirmed and will be processed shortly."
 
     @function_tool
+    @trace_tool
     async def get_order_status(self, context: RunContext):
         """Get the last order details"""
-        order = get_last_order()
-        
-        if not order:
-            return "You haven't placed any orders yet. Would you like to browse our catalog?"
-        
-        items_text = "\n".join([f"{item['quantity']}x {item['product_name']} - ₹{item['total_price']}" 
-                               for item in order['items']])
-        
-        return f"Your last order (ID: {order['id']}):\n{items_text}\n\nTotal: ₹{order['total']}\nStatus: {order['status']}\nPlaced: {order['created_at'][:19]}"
+        if self.profile and self.profile["orders"]:
+            return describe_recent_order(self.profile["orders"][-1])
+        result = await self.speculation.take("get_order_status", {})
+        if result is None:
+            result = describe_last_order()
+        return result
 
     @function_tool
+    @trace_tool
     async def handle_shopping(self, context: RunContext, user_input: str):
         """Handle general shopping conversation
         
@@ -179,16 +359,20 @@ class EcommerceAgent(Agent):
                 # Extract price
                 price = int(''.join(filter(str.isdigit, user_input)))
                 return await self.browse_catalog(context, max_price=price)
-            elif any(color in user_lower for color in ["black", "blue", "white", "gray"]):
-                color = next(color for color in ["black", "blue", "white", "gray"] if color in user_lower)
+            elif any(color in user_lower for color in COLORS):
+                color = next(color for color in COLORS if color in user_lower)
                 return await self.browse_catalog(context, color=color)
         
+        # Handle paging through the last search
+        if any(phrase in user_lower for phrase in ["more", "next", "other options"]):
+            return await self.show_more_products(context)
+
         # Handle order requests
         if any(word in user_lower for word in ["buy", "order", "purchase", "want", "take"]):
             # Try to extract product reference
-            if "first" in user_lower or "second" in user_lower or "third" in user_lower:
+            if ordinal_position(user_lower) is not None:
                 return await self.place_order(context, user_input)
-            elif any(color in user_lower for color in ["black", "blue", "white", "gray"]):
+            elif any(color in user_lower for color in COLORS):
                 return await self.place_order(context, user_input)
         
         # Handle status requests
@@ -199,7 +383,8 @@ class EcommerceAgent(Agent):
 
 
 def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["vad"] = load_vad()
+    import_plugins("shopping")
 
 
 async def entrypoint(ctx: JobContext):
@@ -211,20 +396,16 @@ async def entrypoint(ctx: JobContext):
     # Create agent instance
     agent = EcommerceAgent()
 
+    # Pick cheaper pipeline settings when the node is under load
+    profile = await asyncio.to_thread(GOVERNOR.select_profile)
+    frame_monitor = GOVERNOR.monitor_room(ctx.room.name, ctx.job.id)
+    ctx.add_shutdown_callback(frame_monitor.stop)
+
     # Set up a voice AI pipeline
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-matthew",
-            style="Conversation",
-            tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
-            text_pacing=True
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
-        preemptive_generation=True,
-    )
+    session = create_session("shopping", ctx.proc.userdata["vad"], profile)
+    warmup = asyncio.create_task(warm_session("shopping", session))
+    start_tracing(ctx, session)
+    start_room_profiler(ctx, agent)
 
     # Metrics collection
     usage_collector = metrics.UsageCollector()
@@ -234,24 +415,42 @@ async def entrypoint(ctx: JobContext):
         metrics.log_metrics(ev.metrics)
         usage_collector.collect(ev.metrics)
 
+    # Speculative tool execution from interim transcripts
+    @session.on("user_input_transcribed")
+    def _on_user_input_transcribed(ev: UserInputTranscribedEvent):
+        agent.speculation.on_transcript(ev.transcript, ev.is_final)
+
+    @session.on("user_state_changed")
+    def _on_user_state_changed(ev: UserStateChangedEvent):
+        if ev.new_state == "speaking":
+            stats = agent.speculation.end_turn()
+            if stats["hits"] or stats["misses"]:
+                logger.info(f"Speculation turn: {stats}")
+
     async def log_usage():
         summary = usage_collector.get_summary()
         logger.info(f"Usage: {summary}")
+        logger.info(f"Connection pool: {POOL.get_stats()}")
+        logger.info(f"Profiles: {PROFILES.get_stats()}")
+        logger.info(f"Speculation: {agent.speculation.get_summary()}")
 
     ctx.add_shutdown_callback(log_usage)
+    ctx.add_shutdown_callback(POOL.aclose)
 
     # Start the session
     await session.start(
         agent=agent,
         room=ctx.room,
-        room_input_options=RoomInputOptions(
-            noise_cancellation=noise_cancellation.BVC(),
-        ),
+        room_input_options=room_input_options("shopping", profile),
     )
 
     # Join the room and connect to the user
+    # Load the caller's profile in parallel with joining the room
+    start_profile_load(ctx, agent)
     await ctx.connect()
+    await warmup
 
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file
+    register_worker_plugins("shopping")
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm, load_fnc=current_load))
\ No newline at end of file
@@ -1,28 +1,60 @@
+import asyncio
 import logging
 import json
 import os
 from datetime import datetime
 from dotenv import load_dotenv
+from customer_profiles import PROFILES, profile_context, start_profile_load
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
     JobProcess,
     MetricsCollectedEvent,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     metrics,
-    tokenize,
     function_tool,
-    RunContext
+    RunContext,
+)
+from load_governor import GOVERNOR, current_load
+from connection_pool import POOL
+from tracing import TRACER, start_tracing, trace_tool
+from room_profiler import start_room_profiler
+from session_factory import (
+    create_session,
+    import_plugins,
+    load_vad,
+    register_worker_plugins,
+    room_input_options,
+    warm_session,
 )
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
 logger = logging.getLogger("sdr_agent")
 load_dotenv(".env.local")
 
+FAQ_FALLBACK = "That's a great question! Let me connect you with our technical team who can provide detailed information about that."
+
+
+def lookup_faq(faq_data, question):
+    """Read-only FAQ lookup for answer_from_faq"""
+    question_lower = question.lower()
+
+    # Check FAQ items
+    for faq_item in faq_data.get("faqs", []):
+        if any(word in question_lower for word in faq_item["question"].lower().split()):
+            return faq_item["answer"]
+
+    # Check other sections
+    if "about" in question_lower or "company" in question_lower:
+        return faq_data.get("about", "I don't have that information available.")
+    elif "product" in question_lower or "features" in question_lower:
+        return faq_data.get("product_overview", "I don't have that information available.")
+    elif "pricing" in question_lower or "cost" in question_lower:
+        return faq_data.get("pricing", "I don't have that information available.")
+
+    return None
+
+
 class SDRAgent(Agent):
     def __init__(self) -> None:
         super().__init__(
@@ -57,6 +89,17 @@ Greet warmly, ask what brought them here, and naturally collect information whil
         }
         self.conversation_log = []
         self.room = None
+        self.customer_id = None  # Signed-in customer id, once known
+
+    async def attach_profile(self, customer_id: str, profile: dict):
+        """Prefill lead fields captured on earlier calls so they aren't asked again"""
+        self.customer_id = customer_id
+        for field, value in profile["lead"].items():
+            if field in self.lead_data and not self.lead_data[field]:
+                self.lead_data[field] = value
+        context = profile_context(profile)
+        if context:
+            await self.update_instructions(self.instructions + context)
 
     def load_faq(self):
         """Load FAQ data from JSON file"""
@@ -78,44 +121,33 @@ Greet warmly, ask what brought them here, and naturally collect information whil
         return any(phrase in text.lower() for phrase in end_phrases)
 
     @function_tool
+    @trace_tool
     async def answer_from_faq(self, context: RunContext, question: str):
         """Answer questions using FAQ data"""
         self.room = context.room
         self.conversation_log.append(f"User asked: {question}")
         
-        question_lower = question.lower()
+        answer = lookup_faq(self.faq_data, question)
         
-        # Check FAQ items
-        for faq_item in self.faq_data.get("faqs", []):
-            if any(word in question_lower for word in faq_item["question"].lower().split()):
-                answer = faq_item["answer"]
-                self.conversation_log.append(f"Agent answered: {answer}")
-                return answer
+        if answer is None:
+            return FAQ_FALLBACK
         
-        # Check other sections
-        if "about" in question_lower or "company" in question_lower:
-            answer = self.faq_data.get("about", "I don't have that information available.")
-            self.conversation_log.append(f"Agent answered: {answer}")
-            return answer
-        elif "product" in question_lower or "features" in question_lower:
-            answer = self.faq_data.get("product_overview", "I don't have that information available.")
-            self.conversation_log.append(f"Agent answered: {answer}")
-            return answer
-        elif "pricing" in question_lower or "cost" in question_lower:
-            answer = self.faq_data.get("pricing", "I don't have that information available.")
-            self.conversation_log.append(f"Agent answered: {answer}")
-            return answer
-        
-        return "That's a great question! Let me connect you with our technical team who can provide detailed information about that."
+        self.conversation_log.append(f"Agent answered: {answer}")
+        return answer
 
     @function_tool
+    @trace_tool
     async def collect_lead_field(self, context: RunContext, field: str, value: str):
         """Collect lead information"""
         self.room = context.room
         self.lead_data[field] = value
         self.conversation_log.append(f"Collected {field}: {value}")
+        if self.customer_id:
+            await PROFILES.record_lead_fields(self.customer_id, {field: value})
         
-        logger.info(f"Collected lead field - {field}: {value}")
+        logger.debug("Collected lead field %s", field)
+        TRACER.event("lead.field_collected", field=field,
+                     missing=lambda: [k for k, v in self.lead_data.items() if not v])
         
         # Check if conversation is ending
         if self.is_end_of_call(value):
@@ -144,6 +176,7 @@ Greet warmly, ask what brought them here, and naturally collect information whil
         return "Thank you for that information! Is there anything else you'd like to know about our platform?"
 
     @function_tool
+    @trace_tool
     async def save_lead_json(self, context: RunContext):
         """Save lead data to JSON file"""
         try:
@@ -185,25 +218,23 @@ Greet warmly, ask what brought them here, and naturally collect information whil
             return "Thank you for your time! Our team will be in touch soon."
 
 def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["vad"] = load_vad()
+    import_plugins("sdr")
 
 async def entrypoint(ctx: JobContext):
     ctx.log_context_fields = {"room": ctx.room.name}
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-IN-neerja", 
-            style="Conversation",
-            tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
-            text_pacing=True
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
-        preemptive_generation=True,
-    )
+    # Pick cheaper pipeline settings when the node is under load
+    profile = await asyncio.to_thread(GOVERNOR.select_profile)
+    frame_monitor = GOVERNOR.monitor_room(ctx.room.name, ctx.job.id)
+    ctx.add_shutdown_callback(frame_monitor.stop)
+
+    session = create_session("sdr", ctx.proc.userdata["vad"], profile)
+    warmup = asyncio.create_task(warm_session("sdr", session))
+    start_tracing(ctx, session)
 
+    agent = SDRAgent()
+    start_room_profiler(ctx, agent)
     usage_collector = metrics.UsageCollector()
 
     @session.on("metrics_collected")
@@ -214,18 +245,23 @@ async def entrypoint(ctx: JobContext):
     async def log_usage():
         summary = usage_collector.get_summary()
         logger.info(f"Usage: {summary}")
+        logger.info(f"Connection pool: {POOL.get_stats()}")
+        logger.info(f"Profiles: {PROFILES.get_stats()}")
 
     ctx.add_shutdown_callback(log_usage)
+    ctx.add_shutdown_callback(POOL.aclose)
 
     await session.start(
-        agent=SDRAgent(),
+        agent=agent,
         room=ctx.room,
-        room_input_options=RoomInputOptions(
-            noise_cancellation=noise_cancellation.BVC(),
-        ),
+        room_input_options=room_input_options("sdr", profile),
     )
 
+    # Load the caller's profile in parallel with joining the room
+    start_profile_load(ctx, agent)
     await ctx.connect()
+    await warmup
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file
+    register_worker_plugins("sdr")
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm, load_fnc=current_load))
\ No newline at end of file
@@ -0,0 +1,125 @@
+import re
+import time
+from collections.abc import Iterable
+from itertools import islice
+from typing import Callable, Optional
+
+PAGE_SIZE = 5
+CURSOR_TTL_SECONDS = 600
+
+ORDINAL_WORDS = {
+    "first": 1,
+    "second": 2,
+    "third": 3,
+    "fourth": 4,
+    "fifth": 5,
+    "sixth": 6,
+    "seventh": 7,
+    "eighth": 8,
+    "ninth": 9,
+    "tenth": 10,
+    "eleventh": 11,
+    "twelfth": 12,
+    "thirteenth": 13,
+    "fourteenth": 14,
+    "fifteenth": 15,
+}
+NUMBER_WORDS = {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+}
+
+
+def ordinal_position(reference: str) -> Optional[int]:
+    """1-based position from "the seventh one", "number 7", "7th" or "item seven" """
+    text = reference.lower()
+    for word, position in ORDINAL_WORDS.items():
+        if re.search(rf"\b{word}\b", text):
+            return position
+    match = re.search(
+        r"\b(?:number|item|no\.?|#)\s*(\d+)\b|\b(\d+)(?:st|nd|rd|th)\b|^\s*(\d+)\s*$",
+        text,
+    )
+    if match:
+        return int(next(group for group in match.groups() if group))
+    match = re.search(r"\b(?:number|item)\s+(" + "|".join(NUMBER_WORDS) + r")\b", text)
+    if match:
+        return NUMBER_WORDS[match.group(1)]
+    return None
+
+
+class ResultCursor:
+    """Lazily pages through the results of one catalog query
+
+    ``results`` is consumed only as far as the pages (or positions) asked
+    for, and everything pulled so far is kept, so "show me more" and "the
+    seventh one" cost at most one page of work instead of re-running the
+    query.
+
+    Args:
+        results: Iterator over matching products, in display order
+        page_size: Products per page
+        ttl: Seconds of inactivity after which the cursor expires
+    """
+
+    def __init__(
+        self,
+        results: Iterable[dict],
+        page_size: int = PAGE_SIZE,
+        ttl: float = CURSOR_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._results = iter(results)
+        self.page_size = page_size
+        self.ttl = ttl
+        self._clock = clock
+        self._fetched: list[dict] = []
+        self._exhausted = False
+        self.position = 0  # Products shown so far
+        self.last_used = clock()
+
+    def _fetch_until(self, count: int) -> None:
+        missing = count - len(self._fetched)
+        if missing > 0 and not self._exhausted:
+            before = len(self._fetched)
+            self._fetched.extend(islice(self._results, missing))
+            if len(self._fetched) - before < missing:
+                self._exhausted = True
+
+    def _touch(self) -> None:
+        self.last_used = self._clock()
+
+    def expired(self) -> bool:
+        return self._clock() - self.last_used > self.ttl
+
+    def next_page(self) -> list[dict]:
+        """The next page_size products, or [] once the results run out"""
+        self._touch()
+        self._fetch_until(self.position + self.page_size)
+        page = self._fetched[self.position : self.position + self.page_size]
+        self.position += len(page)
+        return page
+
+    def item(self, position: int) -> Optional[dict]:
+        """Product at a 1-based position in the results, fetching up to it if needed"""
+        self._touch()
+        if position < 1:
+            return None
+        self._fetch_until(position)
+        return self._fetched[position - 1] if position <= len(self._fetched) else None
+
+    @property
+    def shown(self) -> list[dict]:
+        return self._fetched[: self.position]
+
+    def has_more(self) -> bool:
+        self._fetch_until(self.position + 1)
+        return len(self._fetched) > self.position
@@ -1,129 +1,152 @@
 import json
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
 import uuid
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Optional
 
-# Product catalog
-PRODUCTS = [
-    {
-        "id": "mug-001",
-        "name": "Stoneware Coffee Mug",
-        "description": "Handcrafted ceramic mug perfect for your morning coffee",
-        "price": 800,
-        "currency": "INR",
-        "category": "mug",
-        "color": "white",
-        "size": "350ml"
-    },
-    {
-        "id": "mug-002", 
-        "name": "Blue Ceramic Mug",
-        "description": "Beautiful blue glazed ceramic mug",
-        "price": 650,
-        "currency": "INR",
-        "category": "mug",
-        "color": "blue",
-        "size": "300ml"
-    },
-    {
-        "id": "tshirt-001",
-        "name": "Cotton T-Shirt",
-        "description": "Comfortable 100% cotton t-shirt",
-        "price": 1200,
-        "currency": "INR",
-        "category": "clothing",
-        "color": "black",
-        "size": "M"
-    },
-    {
-        "id": "hoodie-001",
-        "name": "Black Hoodie",
-        "description": "Warm and cozy black hoodie",
-        "price": 2500,
-        "currency": "INR",
-        "category": "clothing",
-        "color": "black",
-        "size": "L"
-    },
-    {
-        "id": "hoodie-002",
-        "name": "Gray Hoodie",
-        "description": "Comfortable gray pullover hoodie",
-        "price": 2200,
-        "currency": "INR",
-        "category": "clothing",
-        "color": "gray",
-        "size": "M"
-    }
-]
+from inventory import Inventory, OutOfStockError
+from pricing import PricingEngine, from_minor, to_minor
+from product_catalog import PRODUCTS
+
+PRODUCTS_BY_ID = {p["id"]: p for p in PRODUCTS}
+PRODUCT_POSITION = {p["id"]: i for i, p in enumerate(PRODUCTS)}
+
+# In-memory stock levels and checkout holds
+INVENTORY = Inventory({p["id"]: p.get("stock", 0) for p in PRODUCTS})
 
 # In-memory orders storage
 ORDERS = []
 
-def list_products(filters: Optional[Dict] = None) -> List[Dict]:
-    """List products with optional filtering"""
-    if not filters:
-        return PRODUCTS
-    
-    filtered = PRODUCTS
-    
-    if "category" in filters:
-        filtered = [p for p in filtered if p["category"] == filters["category"]]
-    
-    if "max_price" in filters:
-        filtered = [p for p in filtered if p["price"] <= filters["max_price"]]
+PRICING = PricingEngine(base_currency="INR")
+
+def iter_products(filters: Optional[dict] = None) -> Iterator[dict]:
+    """Lazily yield products matching the filters, in catalog order"""
+    filters = filters or {}
     
-    if "color" in filters:
-        filtered = [p for p in filtered if p["color"] == filters["color"]]
+    if filters.get("in_stock"):
+        in_stock = INVENTORY.in_stock_skus()
+        if len(in_stock) * 4 < len(PRODUCTS):
+            # Few items in stock: walk the in-stock index instead of the catalog
+            candidates = (PRODUCTS_BY_ID[sku] for sku in sorted(in_stock, key=PRODUCT_POSITION.get) if sku in PRODUCTS_BY_ID)
+        else:
+            # Mostly in stock: a lazy catalog scan stops as soon as the page is full
+            candidates = (p for p in PRODUCTS if p["id"] in in_stock)
+    else:
+        candidates = iter(PRODUCTS)
     
-    if "name_contains" in filters:
-        search_term = filters["name_contains"].lower()
-        filtered = [p for p in filtered if search_term in p["name"].lower()]
+    category = filters.get("category")
+    max_price = filters.get("max_price")
+    color = filters.get("color")
+    search_term = filters["name_contains"].lower() if "name_contains" in filters else None
     
-    return filtered
+    for p in candidates:
+        if category is not None and p["category"] != category:
+            continue
+        if max_price is not None and p["price"] > max_price:
+            continue
+        if color is not None and p["color"] != color:
+            continue
+        if search_term is not None and search_term not in p["name"].lower():
+            continue
+        yield p
 
-def get_product_by_id(product_id: str) -> Optional[Dict]:
+def list_products(filters: Optional[dict] = None) -> list[dict]:
+    """List products with optional filtering"""
+    if not filters:
+        return PRODUCTS
+    return list(iter_products(filters))
+
+def get_product_by_id(product_id: str) -> Optional[dict]:
     """Get a specific product by ID"""
-    for product in PRODUCTS:
-        if product["id"] == product_id:
-            return product
-    return None
+    return PRODUCTS_BY_ID.get(product_id)
+
+
+def reserve_product(product_id: str, quantity: int = 1) -> Optional[str]:
+    """Hold stock for a product while the customer confirms. Returns a reservation id or None"""
+    if product_id not in PRODUCTS_BY_ID:
+        return None
+    return INVENTORY.reserve(product_id, quantity)
+
 
-def create_order(line_items: List[Dict]) -> Dict:
+def release_reservation(reservation_id: str) -> None:
+    """Return held stock, e.g. when the customer changes their mind"""
+    INVENTORY.release(reservation_id)
+
+def create_order(line_items: list[dict]) -> dict:
     """Create an order from line items
     
     Args:
-        line_items: [{"product_id": "...", "quantity": 1}, ...]
+        line_items: [{"product_id": "...", "quantity": 1, "reservation_id": "..."}, ...]
+            reservation_id is optional; lines without a live hold reserve stock now
     
     Returns:
         Order dictionary
+
+    Raises:
+        OutOfStockError: If any line can't be fulfilled. No stock is consumed.
+        ValueError: If two lines name the same reservation_id
     """
+    supplied = [item["reservation_id"] for item in line_items if item.get("reservation_id")]
+    if len(set(supplied)) != len(supplied):
+        raise ValueError("a reservation can only pay for one order line")
+
     order_id = str(uuid.uuid4())[:8]
-    total = 0
     order_items = []
     
+    # Hold every line first, then sell them in one step, so a partially
+    # available cart consumes nothing
+    reservation_ids = []
+    acquired = []
     for item in line_items:
         product = get_product_by_id(item["product_id"])
-        if product:
-            quantity = item.get("quantity", 1)
-            item_total = product["price"] * quantity
-            total += item_total
-            
-            order_items.append({
-                "product_id": product["id"],
-                "product_name": product["name"],
-                "quantity": quantity,
-                "unit_price": product["price"],
-                "total_price": item_total,
-                "currency": product["currency"]
-            })
+        if not product:
+            continue
+        quantity = item.get("quantity", 1)
+        reservation_id = item.get("reservation_id")
+        held = INVENTORY.get_reservation(reservation_id) if reservation_id else None
+        if held is None or held.sku != product["id"] or held.quantity != quantity:
+            # Only a hold for exactly this line can pay for it; anything else
+            # goes back to stock and the line is reserved fresh
+            if held is not None:
+                INVENTORY.release(reservation_id)
+            reservation_id = INVENTORY.reserve(product["id"], quantity)
+            if reservation_id is None:
+                for held in acquired:
+                    INVENTORY.release(held)
+                raise OutOfStockError(product["id"], quantity, INVENTORY.available(product["id"]))
+            acquired.append(reservation_id)
+        reservation_ids.append(reservation_id)
+
+        order_items.append({
+            "product_id": product["id"],
+            "product_name": product["name"],
+            "quantity": quantity,
+            "unit_price": product["price"],
+            "unit_price_minor": to_minor(product["price"], product["currency"]),
+            "currency": product["currency"]
+        })
+
+    if not INVENTORY.confirm(*reservation_ids):
+        # A caller-supplied hold expired between the check and the sale
+        for held in acquired:
+            INVENTORY.release(held)
+        first = order_items[0]
+        raise OutOfStockError(first["product_id"], first["quantity"], INVENTORY.available(first["product_id"]))
     
+    # Amounts are computed in integer minor units (paise) and converted
+    # to the order currency when the cart mixes currencies
+    quote = PRICING.quote(order_items)
+    currency = quote["currency"]
+    for order_item, line_total in zip(order_items, quote["line_totals"]):
+        order_item["total_price"] = from_minor(line_total, currency)
+
     order = {
         "id": order_id,
         "items": order_items,
-        "total": total,
-        "currency": "INR",
+        "total": from_minor(quote["total"], currency),
+        "total_minor": quote["total"],
+        "currency": currency,
         "status": "CONFIRMED",
         "created_at": datetime.now().isoformat()
     }
@@ -132,11 +155,11 @@ def create_order(line_items: List[Dict]) -> Dict:
     save_orders_to_file()
     return order
 
-def get_last_order() -> Optional[Dict]:
+def get_last_order() -> Optional[dict]:
     """Get the most recent order"""
     return ORDERS[-1] if ORDERS else None
 
-def get_all_orders() -> List[Dict]:
+def get_all_orders() -> list[dict]:
     """Get all orders"""
     return ORDERS
 
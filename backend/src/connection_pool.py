@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Iterable
+from typing import Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger("connection_pool")
+
+POOL_KEEPALIVE_SECONDS = float(os.getenv("POOL_KEEPALIVE_SECONDS", "120"))
+POOL_WARM_TIMEOUT = float(os.getenv("POOL_WARM_TIMEOUT", "5"))
+
+
+def origin(url: str) -> str:
+    """scheme://host[:port] of a provider URL, with ws(s) mapped to http(s)"""
+    parts = urlsplit(url)
+    scheme = {"ws": "http", "wss": "https"}.get(parts.scheme, parts.scheme)
+    return f"{scheme}://{parts.netloc}"
+
+
+class ProviderConnectionPool:
+    """Keepalive HTTP/WebSocket connections shared by a job's STT, LLM and TTS clients
+
+    Plugins given ``http_session()`` open their REST calls and WebSocket
+    upgrades through one connector, so a connection opened by ``warm()``
+    (TCP + TLS handshake already done) is reused by the first stream
+    instead of paying the handshake when the user is waiting for audio.
+
+    Connections belong to the event loop they were opened on, so the pool
+    keeps one ClientSession per loop. LiveKit runs each job on its own loop:
+    with the process executor that is one session per job process, and
+    with the thread executor every job in the worker gets its own session
+    from the same pool. Each is warmed while its room is still connecting
+    and closed by its own job's ``aclose()``. The connection counters are
+    shared by every job in the process.
+
+    Args:
+        keepalive_timeout: Seconds an idle connection is kept open
+        limit_per_host: Maximum concurrent connections per provider host
+        dns_cache_ttl: Seconds resolved provider addresses are cached
+    """
+
+    def __init__(
+        self,
+        keepalive_timeout: float = POOL_KEEPALIVE_SECONDS,
+        limit_per_host: int = 50,
+        dns_cache_ttl: int = 300,
+        proxy: Optional[str] = None,
+    ) -> None:
+        self.keepalive_timeout = keepalive_timeout
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.proxy = proxy
+        self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.connect_ms = 0.0
+        self.warmed_hosts = 0
+        self.warm_ms = 0.0
+
+    def http_session(self) -> aiohttp.ClientSession:
+        """The running loop's ClientSession, created on first use"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_start.append(self._on_create_start)
+            trace.on_connection_create_end.append(self._on_create_end)
+            trace.on_connection_reuseconn.append(self._on_reuse)
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector, proxy=self.proxy, trace_configs=[trace]
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def _on_create_start(self, session, trace_ctx, params) -> None:
+        trace_ctx.started = time.perf_counter()
+
+    async def _on_create_end(self, session, trace_ctx, params) -> None:
+        self.new_connections += 1
+        self.connect_ms += (time.perf_counter() - trace_ctx.started) * 1000
+
+    async def _on_reuse(self, session, trace_ctx, params) -> None:
+        self.reused_connections += 1
+
+    async def warm_host(self, url: str, timeout: float = POOL_WARM_TIMEOUT) -> bool:
+        """Open a keepalive connection to a provider's host
+
+        Any HTTP response means the connection is up and back in the pool;
+        the status code doesn't matter.
+        """
+        try:
+            async with self.http_session().head(
+                origin(url), timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as resp:
+                await resp.read()
+            self.warmed_hosts += 1
+            return True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"Could not warm {url}: {e}")
+            return False
+
+    async def warm(self, urls: Iterable[str], components: Iterable = ()) -> None:
+        """Warm provider hosts, then pre-open the components' streams
+
+        ``components`` are STT/LLM/TTS instances; their ``prewarm()`` opens
+        streaming connections (e.g. the TTS WebSocket pool) through the
+        connections warmed here.
+        """
+        started = time.perf_counter()
+        hosts: list[str] = list(dict.fromkeys(origin(url) for url in urls))
+        await asyncio.gather(*(self.warm_host(host) for host in hosts))
+        for component in components:
+            prewarm = getattr(component, "prewarm", None)
+            if prewarm is not None:
+                prewarm()
+        self.warm_ms += (time.perf_counter() - started) * 1000
+
+    def get_stats(self) -> dict[str, float]:
+        opened = self.new_connections + self.reused_connections
+        return {
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / opened, 3)
+            if opened
+            else 0.0,
+            "avg_connect_ms": round(self.connect_ms / self.new_connections, 1)
+            if self.new_connections
+            else 0.0,
+            "warmed_hosts": self.warmed_hosts,
+            "warm_ms": round(self.warm_ms, 1),
+        }
+
+    async def aclose(self) -> None:
+        """Close the running loop's session; other jobs' sessions stay open"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+POOL = ProviderConnectionPool()
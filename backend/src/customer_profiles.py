@@ -0,0 +1,278 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Optional
+
+logger = logging.getLogger("customer_profiles")
+
+PROFILES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "profiles"
+)
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "256"))
+
+# How much history a profile keeps
+MAX_RECENT_ORDERS = 5
+MAX_WELLNESS_ENTRIES = 5
+LEAD_FIELDS = ["name", "company", "email", "role", "use_case", "team_size", "timeline"]
+
+# Participant attribute (or metadata key) the token server sets to the
+# signed-in customer's account id
+CUSTOMER_ID_KEY = "customer_id"
+
+
+def new_profile(identity: str) -> dict[str, Any]:
+    return {
+        "identity": identity,
+        "orders": [],
+        "wellness": [],
+        "lead": {},
+        "updated_at": "",
+        "version": 0,
+    }
+
+
+def compact_order(order: dict) -> dict:
+    """The parts of an order worth remembering for the next call"""
+    return {
+        "id": order["id"],
+        "items": [
+            f"{item['quantity']}x {item['product_name']}"
+            for item in order.get("items", [])
+        ],
+        "total": order.get("total"),
+        "currency": order.get("currency", "INR"),
+        "status": order.get("status", ""),
+        "created_at": order.get("created_at", ""),
+    }
+
+
+def compact_wellness_entry(entry: dict) -> dict:
+    return {
+        key: entry.get(key)
+        for key in ("mood", "energy", "goals", "summary", "timestamp")
+    }
+
+
+def profile_context(profile: Optional[dict]) -> str:
+    """Short text about a returning customer to append to an agent's instructions"""
+    if not profile:
+        return ""
+    lines = []
+    if profile["orders"]:
+        last = profile["orders"][-1]
+        lines.append(
+            f"Their last order ({last['id']}, {last['status']}) was {', '.join(last['items'])} "
+            f"for ₹{last['total']}, placed {last['created_at'][:10]}."
+        )
+    if profile["wellness"]:
+        recent = "; ".join(
+            f"{e['timestamp'][:10]}: {e['summary']}" for e in profile["wellness"][-3:]
+        )
+        lines.append(f"Recent check-ins: {recent}")
+    known = {field: value for field, value in profile["lead"].items() if value}
+    if known:
+        lines.append(
+            "Already known, don't ask again: "
+            + ", ".join(f"{k}={v}" for k, v in known.items())
+            + "."
+        )
+    if not lines:
+        return ""
+    return "\n\nThis is a returning customer. " + " ".join(lines)
+
+
+class ProfileStore:
+    """Per-customer profiles on disk behind a size-bounded LRU cache
+
+    Profiles are keyed on the customer's stable id (see ``customer_key``)
+    and stored one small JSON file each (named by a hash of the id), so
+    loading one never reads anyone else's history. Updates are
+    write-through: the cached profile and its file change together, so
+    evicting a profile loses nothing. File I/O runs in a worker thread to
+    keep the event loop free.
+
+    The cache is per process; it is shared across rooms when the worker
+    runs jobs as threads, and across tool calls within a room otherwise.
+
+    Args:
+        directory: Where profile files live
+        capacity: Most profiles kept in memory
+    """
+
+    def __init__(
+        self, directory: str = PROFILES_DIR, capacity: int = PROFILE_CACHE_SIZE
+    ) -> None:
+        self.directory = directory
+        self.capacity = capacity
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._written_versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load_ms: deque = deque(maxlen=256)
+
+    def _path(self, identity: str) -> str:
+        digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _read(self, identity: str) -> dict:
+        try:
+            with open(self._path(identity), encoding="utf-8") as f:
+                profile = json.load(f)
+            if profile.get("identity") == identity:
+                return profile
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read profile, starting fresh: {e}")
+        return new_profile(identity)
+
+    def _write(self, identity: str, version: int, data: str) -> None:
+        with self._write_lock:
+            # A newer snapshot may already be on disk if writes finished out of order
+            if self._written_versions.get(identity, -1) >= version:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(identity)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._written_versions[identity] = version
+
+    def _cached(self, identity: str) -> Optional[dict]:
+        with self._lock:
+            profile = self._cache.get(identity)
+            if profile is not None:
+                self._cache.move_to_end(identity)
+            return profile
+
+    def _insert(self, identity: str, profile: dict) -> dict:
+        with self._lock:
+            # Another load may have won the race; keep the first so updates aren't split
+            existing = self._cache.setdefault(identity, profile)
+            self._cache.move_to_end(identity)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+            return existing
+
+    async def get(self, identity: str) -> dict:
+        """A customer's profile, from the cache or loaded from disk"""
+        profile = self._cached(identity)
+        if profile is not None:
+            self.hits += 1
+            return profile
+
+        self.misses += 1
+        started = time.perf_counter()
+        profile = await asyncio.to_thread(self._read, identity)
+        self._load_ms.append((time.perf_counter() - started) * 1000)
+        return self._insert(identity, profile)
+
+    async def _update(self, identity: str, change) -> dict:
+        profile = await self.get(identity)
+        with self._lock:
+            change(profile)
+            profile["updated_at"] = datetime.now().isoformat()
+            profile["version"] += 1
+            version = profile["version"]
+            data = json.dumps(profile, ensure_ascii=False)
+        await asyncio.to_thread(self._write, identity, version, data)
+        return profile
+
+    async def record_order(self, identity: str, order: dict) -> dict:
+        def change(profile: dict) -> None:
+            profile["orders"] = (profile["orders"] + [compact_order(order)])[
+                -MAX_RECENT_ORDERS:
+            ]
+
+        return await self._update(identity, change)
+
+    async def record_wellness(self, identity: str, entry: dict) -> dict:
+        def change(profile: dict) -> None:
+            profile["wellness"] = (
+                profile["wellness"] + [compact_wellness_entry(entry)]
+            )[-MAX_WELLNESS_ENTRIES:]
+
+        return await self._update(identity, change)
+
+    async def record_lead_fields(self, identity: str, fields: dict[str, str]) -> dict:
+        def change(profile: dict) -> None:
+            profile["lead"].update(
+                {k: v for k, v in fields.items() if k in LEAD_FIELDS and v}
+            )
+
+        return await self._update(identity, change)
+
+    def get_stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        loads: list[float] = sorted(self._load_ms)
+        return {
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "avg_load_ms": round(sum(loads) / len(loads), 2) if loads else 0.0,
+            "p95_load_ms": round(loads[min(len(loads) - 1, int(len(loads) * 0.95))], 2)
+            if loads
+            else 0.0,
+        }
+
+
+PROFILES = ProfileStore()
+
+
+def customer_key(participant) -> Optional[str]:
+    """The signed-in customer behind a participant, or None for anonymous callers
+
+    Only the ``customer_id`` attribute or metadata field counts, and only
+    when it came from the access token: a participant allowed to update
+    their own metadata could claim anyone's id. The participant identity is
+    never used, because the frontend makes one up per call
+    (``voice_assistant_user_<0-9999>``) and strangers would share profiles.
+    """
+    if participant.permissions.can_update_metadata:
+        return None
+    customer_id = participant.attributes.get(CUSTOMER_ID_KEY)
+    if not customer_id and participant.metadata:
+        try:
+            metadata = json.loads(participant.metadata)
+        except json.JSONDecodeError:
+            metadata = None
+        if isinstance(metadata, dict):
+            customer_id = metadata.get(CUSTOMER_ID_KEY)
+    return str(customer_id) if customer_id else None
+
+
+def start_profile_load(ctx, agent) -> "asyncio.Task":
+    """Load the caller's profile while the room connects and hand it to the agent
+
+    Call just before ``ctx.connect()``. ``agent.attach_profile(customer_id,
+    profile)`` runs as soon as the first participant has joined and their
+    profile is loaded. Anonymous callers (no ``customer_key``) get no
+    profile, and nothing is recorded for them.
+    """
+
+    async def load() -> None:
+        participant = await ctx.wait_for_participant()
+        customer_id = customer_key(participant)
+        if customer_id is None:
+            logger.debug(f"{participant.identity} is anonymous, skipping profile")
+            return
+        profile = await PROFILES.get(customer_id)
+        await agent.attach_profile(customer_id, profile)
+
+    task = asyncio.create_task(load())
+
+    async def cancel() -> None:
+        task.cancel()
+
+    ctx.add_shutdown_callback(cancel)
+    return task
@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+import numpy as np
+from livekit.agents.inference_runner import _InferenceRunner
+from livekit.plugins.turn_detector.base import MAX_HISTORY_TOKENS
+from livekit.plugins.turn_detector.multilingual import (
+    MultilingualModel,
+    _EUORunnerMultilingual,
+    _remote_inference_url,
+)
+
+logger = logging.getLogger("inference_batching")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+EOU_BATCH_MAX_SIZE = int(os.getenv("EOU_BATCH_MAX_SIZE", "16"))
+EOU_BATCH_MAX_WAIT_MS = float(os.getenv("EOU_BATCH_MAX_WAIT_MS", "4"))
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collects items submitted from many threads into one batched call
+
+    The first caller into an empty queue becomes the batch leader: it waits
+    until ``max_batch`` items are queued or ``max_wait`` seconds pass, then
+    runs ``run_batch`` for everyone. Other callers just block on their
+    result, so no extra scheduler thread is needed.
+
+    Args:
+        run_batch: Takes a list of items and returns results in the same order
+        max_batch: Largest batch handed to run_batch
+        max_wait: Longest time (seconds) the first item waits for company
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[T]], list[R]],
+        max_batch: int = 16,
+        max_wait: float = 0.004,
+    ) -> None:
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._pending: list[T] = []
+        self._futures: list[Future[R]] = []
+        self._leader_waiting = False
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: T) -> R:
+        future: Future[R] = Future()
+        with self._cond:
+            self._pending.append(item)
+            self._futures.append(future)
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+            lead = not self._leader_waiting
+            if lead:
+                self._leader_waiting = True
+
+        if lead:
+            self._lead()
+        return future.result()
+
+    def _lead(self) -> None:
+        deadline = time.monotonic() + self.max_wait
+        with self._cond:
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            items = self._pending[: self.max_batch]
+            futures = self._futures[: self.max_batch]
+            del self._pending[: self.max_batch]
+            del self._futures[: self.max_batch]
+            # Whatever is left over starts the next batch with a new leader
+            self._leader_waiting = False
+            next_leader = bool(self._pending)
+            if next_leader:
+                self._leader_waiting = True
+            self.batches += 1
+            self.items += len(items)
+
+        if next_leader:
+            threading.Thread(target=self._lead, daemon=True).start()
+
+        try:
+            results = self.run_batch(items)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+        }
+
+
+class BatchedMultilingualRunner(_EUORunnerMultilingual):
+    """Multilingual end-of-turn runner that batches requests from all rooms
+
+    The worker already runs EOU inference for every job in one shared
+    inference process, calling ``run`` from a thread pool. This runner
+    tokenizes in the calling thread and hands the token ids to a
+    MicroBatcher, so concurrent predictions from different rooms share a
+    single ONNX call instead of paying per-call setup each.
+    """
+
+    INFERENCE_METHOD = "lk_end_of_utterance_multilingual_batched"
+
+    def initialize(self) -> None:
+        super().initialize()
+        self._batcher = MicroBatcher(
+            self._run_batch, EOU_BATCH_MAX_SIZE, EOU_BATCH_MAX_WAIT_MS / 1000
+        )
+        # None until the first batch tells us whether the model scores every position
+        self._per_position: Optional[bool] = None
+        self._batching = True
+
+    def run(self, data: bytes) -> Optional[bytes]:
+        data_json = json.loads(data)
+        chat_ctx = data_json.get("chat_ctx", None)
+
+        if not chat_ctx:
+            raise ValueError("chat_ctx is required on the inference input data")
+
+        start_time = time.perf_counter()
+        text = self._format_chat_ctx(chat_ctx)
+        inputs = self._tokenizer(
+            text,
+            add_special_tokens=False,
+            return_tensors="np",
+            max_length=MAX_HISTORY_TOKENS,
+            truncation=True,
+        )
+        input_ids = inputs["input_ids"][0].astype("int64")
+        if self._batching:
+            eou_probability = self._batcher.submit(input_ids)
+        else:
+            eou_probability = self._run_single(input_ids)
+        end_time = time.perf_counter()
+
+        result: dict[str, Any] = {
+            "eou_probability": float(eou_probability),
+            "duration": round(end_time - start_time, 3),
+            "input": text,
+        }
+        return json.dumps(result).encode()
+
+    def _run_single(self, input_ids: np.ndarray) -> float:
+        outputs = self._session.run(None, {"input_ids": input_ids[np.newaxis, :]})
+        return float(outputs[0].flatten()[-1])
+
+    def _run_batch(self, batch: list[np.ndarray]) -> list[float]:
+        if len(batch) == 1 or not self._batching:
+            return [self._run_single(ids) for ids in batch]
+
+        try:
+            if self._per_position is False:
+                return self._run_equal_length_groups(batch)
+            return self._run_padded(batch)
+        except Exception as e:
+            # e.g. a model exported with a fixed batch dimension of 1
+            logger.warning(
+                f"Batched EOU inference failed, falling back to single inference: {e}"
+            )
+            self._batching = False
+            return [self._run_single(ids) for ids in batch]
+
+    def _run_padded(self, batch: list[np.ndarray]) -> list[float]:
+        lengths = [len(ids) for ids in batch]
+        width = max(lengths)
+        padded = np.zeros((len(batch), width), dtype=np.int64)
+        for i, ids in enumerate(batch):
+            padded[i, : len(ids)] = ids
+
+        scores = self._session.run(None, {"input_ids": padded})[0].reshape(
+            len(batch), -1
+        )
+        if scores.shape[1] != width:
+            # Model only scores the last position: right padding would shift it,
+            # so only batch together inputs of identical length from now on
+            self._per_position = False
+            return self._run_equal_length_groups(batch)
+
+        # Causal attention: right padding never affects earlier positions
+        self._per_position = True
+        return [float(scores[i, length - 1]) for i, length in enumerate(lengths)]
+
+    def _run_equal_length_groups(self, batch: list[np.ndarray]) -> list[float]:
+        results: list[float] = [0.0] * len(batch)
+        groups: dict[int, list[int]] = {}
+        for i, ids in enumerate(batch):
+            groups.setdefault(len(ids), []).append(i)
+        for indices in groups.values():
+            stacked = np.stack([batch[i] for i in indices])
+            scores = self._session.run(None, {"input_ids": stacked})[0].reshape(
+                len(indices), -1
+            )
+            for row, i in enumerate(indices):
+                results[i] = float(scores[row, -1])
+        return results
+
+
+class BatchedMultilingualModel(MultilingualModel):
+    """Drop-in MultilingualModel whose predictions go through BatchedMultilingualRunner"""
+
+    def _inference_method(self) -> str:
+        if _remote_inference_url():
+            return super()._inference_method()
+        return BatchedMultilingualRunner.INFERENCE_METHOD
+
+
+if (
+    not _remote_inference_url()
+    and BatchedMultilingualRunner.INFERENCE_METHOD
+    not in _InferenceRunner.registered_runners
+):
+    _InferenceRunner.register_runner(BatchedMultilingualRunner)
@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+
+class OutOfStockError(Exception):
+    """Raised when an order line can't be fulfilled from available stock"""
+
+    def __init__(self, product_id: str, requested: int, available: int) -> None:
+        super().__init__(
+            f"{product_id}: requested {requested}, only {available} available"
+        )
+        self.product_id = product_id
+        self.requested = requested
+        self.available = available
+
+
+class Reservation:
+    __slots__ = ("expires_at", "id", "quantity", "sku")
+
+    def __init__(
+        self, reservation_id: str, sku: str, quantity: int, expires_at: float
+    ) -> None:
+        self.id = reservation_id
+        self.sku = sku
+        self.quantity = quantity
+        self.expires_at = expires_at
+
+
+class Inventory:
+    """Per-SKU stock with TTL reservations held during checkout
+
+    Reads (``available``, ``in_stock_skus``) don't take the lock: they read
+    plain ints and an immutable frozenset that writers swap atomically.
+    Sold-out requests are also rejected on that fast path, so when many
+    sessions race for the last unit only the real contenders serialize on
+    the lock. All mutations happen under one short critical section, so
+    stock can never go negative or be sold twice.
+
+    Args:
+        stock: Units on hand per SKU
+        reservation_ttl: Seconds a checkout hold lasts before the units return to stock
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        stock: dict[str, int],
+        reservation_ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.reservation_ttl = reservation_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._on_hand: dict[str, int] = dict(stock)
+        self._held: dict[str, int] = dict.fromkeys(stock, 0)
+        self._reservations: dict[str, Reservation] = {}
+        self._expiry: list[tuple[float, str]] = []
+        self._ids = itertools.count(1)
+        self._in_stock: frozenset[str] = frozenset(
+            sku for sku, units in stock.items() if units > 0
+        )
+
+    def available(self, sku: str) -> int:
+        """Units that can still be reserved (on hand minus active holds)"""
+        if self._expiry and self._expiry[0][0] <= self._clock():
+            with self._lock:
+                self._expire_locked()
+        return self._on_hand.get(sku, 0) - self._held.get(sku, 0)
+
+    def in_stock_skus(self) -> frozenset[str]:
+        """Index of SKUs with at least one reservable unit"""
+        if self._expiry and self._expiry[0][0] <= self._clock():
+            with self._lock:
+                self._expire_locked()
+        return self._in_stock
+
+    def reserve(self, sku: str, quantity: int = 1) -> Optional[str]:
+        """Hold units for a checkout. Returns a reservation id, or None if not enough stock"""
+        if quantity <= 0:
+            raise ValueError("quantity must be positive")
+        # Fast path: sold out, no need to contend for the lock
+        if self.available(sku) < quantity:
+            return None
+
+        with self._lock:
+            self._expire_locked()
+            if self._on_hand.get(sku, 0) - self._held.get(sku, 0) < quantity:
+                return None
+            reservation = Reservation(
+                f"res-{next(self._ids)}",
+                sku,
+                quantity,
+                self._clock() + self.reservation_ttl,
+            )
+            self._reservations[reservation.id] = reservation
+            heapq.heappush(self._expiry, (reservation.expires_at, reservation.id))
+            self._held[sku] += quantity
+            self._refresh_index_locked(sku)
+        return reservation.id
+
+    def release(self, reservation_id: str) -> None:
+        """Give held units back to stock (e.g. the customer changed their mind)"""
+        with self._lock:
+            reservation = self._reservations.pop(reservation_id, None)
+            if reservation:
+                self._held[reservation.sku] -= reservation.quantity
+                self._refresh_index_locked(reservation.sku)
+
+    def is_held(self, reservation_id: str) -> bool:
+        return reservation_id in self._reservations
+
+    def get_reservation(self, reservation_id: str) -> Optional[Reservation]:
+        """The live hold with this id, or None if it was sold, released or expired"""
+        return self._reservations.get(reservation_id)
+
+    def confirm(self, *reservation_ids: str) -> bool:
+        """Atomically turn holds into a sale, decrementing on-hand stock
+
+        All-or-nothing: returns False without selling anything if any hold
+        is unknown, has already expired back into stock, or is listed twice.
+        """
+        if len(set(reservation_ids)) != len(reservation_ids):
+            return False
+        with self._lock:
+            reservations = [self._reservations.get(rid) for rid in reservation_ids]
+            if not all(reservations):
+                return False
+            for reservation in reservations:
+                del self._reservations[reservation.id]
+                self._held[reservation.sku] -= reservation.quantity
+                self._on_hand[reservation.sku] -= reservation.quantity
+                self._refresh_index_locked(reservation.sku)
+        return True
+
+    def restock(self, sku: str, quantity: int) -> None:
+        with self._lock:
+            self._on_hand[sku] = self._on_hand.get(sku, 0) + quantity
+            self._held.setdefault(sku, 0)
+            self._refresh_index_locked(sku)
+
+    def _expire_locked(self) -> None:
+        now = self._clock()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, reservation_id = heapq.heappop(self._expiry)
+            reservation = self._reservations.pop(reservation_id, None)
+            if reservation:
+                self._held[reservation.sku] -= reservation.quantity
+                self._refresh_index_locked(reservation.sku)
+
+    def _refresh_index_locked(self, sku: str) -> None:
+        in_stock = self._on_hand.get(sku, 0) - self._held.get(sku, 0) > 0
+        if in_stock != (sku in self._in_stock):
+            self._in_stock = (
+                self._in_stock | {sku} if in_stock else self._in_stock - {sku}
+            )
@@ -0,0 +1,322 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from livekit.agents.utils.hw import get_cpu_monitor
+
+logger = logging.getLogger("load_governor")
+
+# Audio is processed in 20ms frames; a frame handled later than this budget is late
+FRAME_INTERVAL_MS = 20.0
+
+LOAD_REDUCED_THRESHOLD = float(os.getenv("LOAD_REDUCED_THRESHOLD", "0.6"))
+LOAD_MINIMAL_THRESHOLD = float(os.getenv("LOAD_MINIMAL_THRESHOLD", "0.8"))
+LOAD_STATE_DIR = os.getenv(
+    "LOAD_STATE_DIR", os.path.join(tempfile.gettempdir(), "voice-agent-load")
+)
+# Smoothed CPU published by the worker's sampler (not *.json, so not read as a room)
+CPU_STATE_FILE = "worker_cpu.state"
+
+
+class PipelineProfile:
+    """Per-session pipeline settings, from most to least expensive"""
+
+    def __init__(
+        self,
+        name: str,
+        multilingual_turn_detection: bool,
+        noise_cancellation: bool,
+        stream_context_len: int,
+        text_pacing: bool,
+    ) -> None:
+        self.name = name
+        self.multilingual_turn_detection = multilingual_turn_detection
+        self.noise_cancellation = noise_cancellation
+        self.stream_context_len = stream_context_len
+        self.text_pacing = text_pacing
+
+    def describe(self) -> str:
+        return (
+            f"{self.name} (turn detection: {'multilingual' if self.multilingual_turn_detection else 'vad'}, "
+            f"BVC: {'on' if self.noise_cancellation else 'off'}, "
+            f"tokenizer context: {self.stream_context_len})"
+        )
+
+
+FULL = PipelineProfile(
+    "full",
+    multilingual_turn_detection=True,
+    noise_cancellation=True,
+    stream_context_len=10,
+    text_pacing=True,
+)
+REDUCED = PipelineProfile(
+    "reduced",
+    multilingual_turn_detection=False,
+    noise_cancellation=True,
+    stream_context_len=10,
+    text_pacing=True,
+)
+MINIMAL = PipelineProfile(
+    "minimal",
+    multilingual_turn_detection=False,
+    noise_cancellation=False,
+    stream_context_len=4,
+    text_pacing=False,
+)
+
+
+class FrameDeadlineMonitor:
+    """Measures how late a job's event loop runs 20ms audio frame ticks
+
+    Every room's audio frames are handled on its job's event loop, so the
+    lag of a timer firing at the frame cadence is the lateness each frame
+    would see. Stats are published to LOAD_STATE_DIR as <job id>.json for
+    the worker's load_fnc to read; keying by job rather than process keeps
+    jobs that share a process (thread executor) from overwriting each other.
+    """
+
+    def __init__(
+        self,
+        room: str,
+        job_id: str,
+        state_dir: str = LOAD_STATE_DIR,
+        window: int = 250,
+    ) -> None:
+        self.room = room
+        self.job_id = job_id
+        self.state_dir = state_dir
+        self.lags_ms: deque = deque(maxlen=window)
+        self.frames = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+        with contextlib.suppress(OSError):
+            os.remove(self._state_path())
+        logger.info(f"Frame deadlines for {self.room}: {self.stats()}")
+
+    async def _run(self) -> None:
+        interval = FRAME_INTERVAL_MS / 1000
+        last_publish = 0.0
+        expected = time.perf_counter() + interval
+        while True:
+            await asyncio.sleep(max(expected - time.perf_counter(), 0))
+            now = time.perf_counter()
+            lag_ms = max((now - expected) * 1000, 0.0)
+            self.lags_ms.append(lag_ms)
+            self.frames += 1
+            expected = max(expected + interval, now)
+            if now - last_publish >= 0.5:
+                last_publish = now
+                self._publish()
+
+    def p99_lag_ms(self) -> float:
+        if not self.lags_ms:
+            return 0.0
+        ordered = sorted(self.lags_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def stats(self) -> dict[str, float]:
+        """Frame count, and late-frame ratio and p99 lag over the recent window"""
+        late = sum(1 for lag in self.lags_ms if lag > FRAME_INTERVAL_MS)
+        return {
+            "frames": self.frames,
+            "late_ratio": round(late / len(self.lags_ms), 4) if self.lags_ms else 0.0,
+            "p99_lag_ms": round(self.p99_lag_ms(), 2),
+        }
+
+    def _state_path(self) -> str:
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.job_id)
+        return os.path.join(self.state_dir, f"{safe_id}.json")
+
+    def _publish(self) -> None:
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = self._state_path() + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "room": self.room,
+                        "job": self.job_id,
+                        "updated": time.time(),
+                        **self.stats(),
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self._state_path())
+        except OSError as e:
+            logger.debug(f"Could not publish frame stats: {e}")
+
+
+class LoadGovernor:
+    """Node load from CPU and room frame deadlines, and the profile new sessions get
+
+    Load is the worst of: smoothed CPU usage, the worst room's p99 frame lag
+    relative to the frame budget, and the worst room's late-frame ratio
+    relative to ``late_ratio_budget``. It is used both as the worker's
+    ``load_fnc`` (so the dispatcher stops sending jobs) and to pick cheaper
+    pipeline settings for sessions that do start while the node is busy.
+
+    CPU is sampled by one background thread in the worker process, started
+    by ``current_load``, and published to the state dir. Jobs read that
+    reading instead of each running a sampler of their own; a job only
+    takes one short sample itself when nothing fresh is published.
+    """
+
+    def __init__(
+        self,
+        state_dir: str = LOAD_STATE_DIR,
+        reduced_threshold: float = LOAD_REDUCED_THRESHOLD,
+        minimal_threshold: float = LOAD_MINIMAL_THRESHOLD,
+        late_ratio_budget: float = 0.05,
+        stale_after: float = 5.0,
+    ) -> None:
+        self.state_dir = state_dir
+        self.reduced_threshold = reduced_threshold
+        self.minimal_threshold = minimal_threshold
+        self.late_ratio_budget = late_ratio_budget
+        self.stale_after = stale_after
+        self._cpu_samples: deque = deque(maxlen=5)
+        self._cpu_lock = threading.Lock()
+        self._cpu_thread: Optional[threading.Thread] = None
+        self._last_profile: Optional[PipelineProfile] = None
+
+    def _sampling(self) -> bool:
+        # is_alive() is False in a forked child, which has to read the file instead
+        return self._cpu_thread is not None and self._cpu_thread.is_alive()
+
+    def start_cpu_sampler(self) -> None:
+        """Sample CPU in the background and publish it; once per process"""
+        with self._cpu_lock:
+            if self._sampling():
+                return
+            monitor = get_cpu_monitor()
+            # Seed with one short sample so the first reading isn't empty
+            self._cpu_samples.append(monitor.cpu_percent(interval=0.1))
+
+            def sample() -> None:
+                while True:
+                    value = monitor.cpu_percent(interval=0.5)
+                    with self._cpu_lock:
+                        self._cpu_samples.append(value)
+                    self._publish_cpu(self._sampled_cpu())
+
+            self._cpu_thread = threading.Thread(
+                target=sample, daemon=True, name="load_governor_cpu"
+            )
+            self._cpu_thread.start()
+
+    def _sampled_cpu(self) -> float:
+        with self._cpu_lock:
+            return (
+                sum(self._cpu_samples) / len(self._cpu_samples)
+                if self._cpu_samples
+                else 0.0
+            )
+
+    def _cpu_path(self) -> str:
+        return os.path.join(self.state_dir, CPU_STATE_FILE)
+
+    def _publish_cpu(self, cpu: float) -> None:
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = f"{self._cpu_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"cpu": cpu, "updated": time.time()}, f)
+            os.replace(tmp_path, self._cpu_path())
+        except OSError as e:
+            logger.debug(f"Could not publish CPU load: {e}")
+
+    def _published_cpu(self) -> Optional[float]:
+        try:
+            with open(self._cpu_path(), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - entry.get("updated", 0) > self.stale_after:
+            return None
+        return entry.get("cpu")
+
+    def cpu_load(self) -> float:
+        """Smoothed CPU usage: this process's sampler, the worker's, or one short sample"""
+        if self._sampling():
+            return self._sampled_cpu()
+        published = self._published_cpu()
+        if published is not None:
+            return published
+        return get_cpu_monitor().cpu_percent(interval=0.1)
+
+    def room_stats(self) -> list[dict]:
+        """Fresh frame stats published by running rooms"""
+        if not os.path.isdir(self.state_dir):
+            return []
+        now = time.time()
+        stats = []
+        for filename in os.listdir(self.state_dir):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(
+                    os.path.join(self.state_dir, filename), encoding="utf-8"
+                ) as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if now - entry.get("updated", 0) <= self.stale_after:
+                stats.append(entry)
+        return stats
+
+    def load(self) -> float:
+        rooms = self.room_stats()
+        worst_lag = max((room["p99_lag_ms"] for room in rooms), default=0.0)
+        worst_late = max((room["late_ratio"] for room in rooms), default=0.0)
+        load = max(
+            self.cpu_load(),
+            worst_lag / FRAME_INTERVAL_MS,
+            worst_late / self.late_ratio_budget,
+        )
+        return min(load, 1.0)
+
+    def select_profile(self) -> PipelineProfile:
+        """Pick the pipeline profile for a new session and log any switch"""
+        load = self.load()
+        if load >= self.minimal_threshold:
+            profile = MINIMAL
+        elif load >= self.reduced_threshold:
+            profile = REDUCED
+        else:
+            profile = FULL
+
+        previous = self._last_profile.name if self._last_profile else "full"
+        if profile.name != previous:
+            logger.warning(
+                f"Load {load:.2f}: switching new sessions from {previous} to {profile.describe()}"
+            )
+        self._last_profile = profile
+        return profile
+
+    def monitor_room(self, room: str, job_id: str) -> FrameDeadlineMonitor:
+        monitor = FrameDeadlineMonitor(room, job_id, self.state_dir)
+        monitor.start()
+        return monitor
+
+
+GOVERNOR = LoadGovernor()
+
+
+def current_load() -> float:
+    """load_fnc for WorkerOptions; runs in the worker process, which owns the CPU sampler"""
+    GOVERNOR.start_cpu_sampler()
+    return GOVERNOR.load()
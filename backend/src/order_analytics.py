@@ -0,0 +1,390 @@
+import argparse
+import codecs
+import json
+import logging
+import os
+from collections.abc import Iterator
+from itertools import islice
+from typing import Optional
+
+import numpy as np
+
+from pricing import PricingEngine, flatten_orders, from_minor
+from product_catalog import CATEGORY_BY_PRODUCT
+
+logger = logging.getLogger("order_analytics")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+ORDERS_FILE = os.path.join(DATA_DIR, "ecommerce_orders.json")
+CACHE_FILE = os.path.join(DATA_DIR, "order_analytics_cache.json")
+CACHE_VERSION = 1
+
+DIMENSIONS = ("product", "category", "hour", "currency")
+CHUNK_SIZE = 10_000  # Orders aggregated per NumPy pass
+READ_SIZE = 1 << 20  # Bytes read from the orders file at a time
+SEPARATORS = " \t\r\n,["
+
+
+def _byte_len(text: str, start: int, end: int) -> int:
+    segment = text[start:end]
+    return len(segment) if segment.isascii() else len(segment.encode("utf-8"))
+
+
+def stream_orders(
+    path: str = ORDERS_FILE, start: int = 0, read_size: int = READ_SIZE
+) -> Iterator[tuple[int, dict]]:
+    """Stream orders from a JSON array (or JSON Lines) file without loading it whole
+
+    Yields (offset, order), where offset is the byte position the order
+    starts at; pass it back as ``start`` to resume from that order.
+
+    Raises:
+        ValueError: If the file holds something other than complete order objects
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        f.seek(start)
+        text, pos = "", 0
+        base = start  # Byte offset of text[0]
+        counted, counted_bytes = 0, 0  # text[:counted] is counted_bytes long
+        eof = False
+        while True:
+            while pos < len(text) and text[pos] in SEPARATORS:
+                pos += 1
+            if pos < len(text) and text[pos] == "]":
+                return
+            if pos < len(text):
+                try:
+                    order, end = decoder.raw_decode(text, pos)
+                except json.JSONDecodeError:
+                    order, end = None, -1
+                if end >= 0:
+                    counted_bytes += _byte_len(text, counted, pos)
+                    counted = pos
+                    if not isinstance(order, dict):
+                        raise ValueError(
+                            f"Expected an order object at byte {base + counted_bytes}"
+                        )
+                    yield base + counted_bytes, order
+                    pos = end
+                    continue
+            if eof:
+                if pos < len(text):
+                    raise ValueError(
+                        f"Truncated order data at byte {base + counted_bytes + _byte_len(text, counted, pos)}"
+                    )
+                return
+
+            # Need more text: drop what's been consumed and read the next block
+            base += counted_bytes + _byte_len(text, counted, pos)
+            data = f.read(read_size)
+            eof = not data
+            text = text[pos:] + utf8.decode(data, final=eof)
+            pos, counted, counted_bytes = 0, 0, 0
+
+
+class OrderAnalytics:
+    """Group-by reports over stored orders with bounded memory
+
+    Orders are streamed from the orders file in chunks of ``chunk_size``.
+    Each chunk is flattened to line arrays and grouped with NumPy into
+    per-day partial aggregates (orders, units and revenue for every
+    product, category, hour of day and currency). Memory is one chunk
+    plus the partials, however large the file grows.
+
+    The partials and the position of the last order read are cached, so
+    the next ``refresh()`` reads only orders added since, and a report is
+    a merge of the days it covers. Revenue is list price in base-currency
+    minor units, as in ``pricing.revenue_report``.
+
+    Args:
+        path: Orders file (JSON array as written by commerce_backend, or JSON Lines)
+        cache_path: Where partial aggregates are kept between runs; None to disable
+        chunk_size: Orders aggregated per pass
+        engine: Pricing engine used to convert line revenue to its base currency
+    """
+
+    def __init__(
+        self,
+        path: str = ORDERS_FILE,
+        cache_path: Optional[str] = CACHE_FILE,
+        chunk_size: int = CHUNK_SIZE,
+        engine: Optional[PricingEngine] = None,
+    ) -> None:
+        self.path = path
+        self.cache_path = cache_path
+        self.chunk_size = chunk_size
+        self.engine = engine or PricingEngine(base_currency="INR")
+        self.reset()
+        if cache_path:
+            self._load_cache()
+
+    def reset(self) -> None:
+        # day -> dimension -> key -> [orders, units, revenue_minor]
+        self.days: dict[str, dict[str, dict[str, list[int]]]] = {}
+        self.orders = 0
+        self.resume_offset = 0
+        self.last_id: Optional[str] = None
+
+    def _load_cache(self) -> None:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable analytics cache: {e}")
+            return
+        if (
+            cache.get("version") != CACHE_VERSION
+            or cache.get("source") != os.path.abspath(self.path)
+            or cache.get("base_currency") != self.engine.base_currency
+        ):
+            return
+        self.days = cache["days"]
+        self.orders = cache["orders"]
+        self.resume_offset = cache["resume_offset"]
+        self.last_id = cache["last_id"]
+
+    def save(self) -> None:
+        if not self.cache_path:
+            return
+        cache = {
+            "version": CACHE_VERSION,
+            "source": os.path.abspath(self.path),
+            "base_currency": self.engine.base_currency,
+            "orders": self.orders,
+            "resume_offset": self.resume_offset,
+            "last_id": self.last_id,
+            "days": self.days,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _new_orders(self) -> Iterator[tuple[int, dict]]:
+        """Orders after the last one already aggregated, rebuilding if the file was rewritten"""
+        if self.last_id is None:
+            return stream_orders(self.path)
+        stream = stream_orders(self.path, self.resume_offset)
+        try:
+            _, last = next(stream)
+            if last.get("id") == self.last_id:
+                return stream
+        except (StopIteration, ValueError):
+            pass
+        logger.info("Orders file no longer matches the analytics cache, rebuilding")
+        self.reset()
+        return stream_orders(self.path)
+
+    def refresh(self) -> int:
+        """Aggregate orders stored since the last refresh and return how many there were"""
+        if not os.path.exists(self.path):
+            return 0
+        stream = self._new_orders()
+        added = 0
+        try:
+            while True:
+                chunk = list(islice(stream, self.chunk_size))
+                if not chunk:
+                    break
+                self._add_chunk([order for _, order in chunk])
+                self.resume_offset, last = chunk[-1]
+                self.last_id = last.get("id")
+                self.orders += len(chunk)
+                added += len(chunk)
+        except ValueError as e:
+            # Usually the file is mid-write; the rest is picked up next time
+            logger.warning(f"Stopped reading orders early: {e}")
+        return added
+
+    def _add_chunk(self, orders: list[dict]) -> None:
+        order_index, product_ids, unit_minor, quantities, currencies, _ = (
+            flatten_orders(orders)
+        )
+        if not len(order_index):
+            return
+        revenue = self.engine.line_totals(unit_minor, quantities, currencies)
+
+        stamps = [order.get("created_at") or "" for order in orders]
+        day_names, order_days = np.unique(
+            [s[:10] or "unknown" for s in stamps], return_inverse=True
+        )
+        hours = np.array([s[11:13] or "unknown" for s in stamps])
+        products, product_codes = np.unique(product_ids, return_inverse=True)
+        categories = np.array(
+            [CATEGORY_BY_PRODUCT.get(p, "unknown") for p in products.tolist()]
+        )
+
+        keys = {
+            "product": product_ids,
+            "category": categories[product_codes],
+            "hour": hours[order_index],
+            "currency": currencies,
+        }
+        line_days = order_days.reshape(-1)[order_index]
+        for dimension, line_keys in keys.items():
+            self._add_groups(
+                dimension,
+                day_names.tolist(),
+                line_days,
+                line_keys,
+                order_index,
+                quantities,
+                revenue,
+            )
+
+    def _add_groups(
+        self,
+        dimension: str,
+        day_names: list[str],
+        line_days: np.ndarray,
+        line_keys: np.ndarray,
+        order_index: np.ndarray,
+        quantities: np.ndarray,
+        revenue: np.ndarray,
+    ) -> None:
+        key_names, key_codes = np.unique(line_keys, return_inverse=True)
+        n_keys = len(key_names)
+        n_groups = len(day_names) * n_keys
+        groups = line_days * n_keys + key_codes.reshape(-1)
+
+        units = np.bincount(groups, weights=quantities, minlength=n_groups)
+        amounts = np.bincount(groups, weights=revenue, minlength=n_groups)
+        # An order counts once per group, however many of its lines fall in it
+        order_groups = np.unique(order_index * n_groups + groups) % n_groups
+        counts = np.bincount(order_groups, minlength=n_groups)
+
+        # Python floats, so round() gives ints on every NumPy version
+        key_names, units, amounts = key_names.tolist(), units.tolist(), amounts.tolist()
+        for group in np.flatnonzero(counts).tolist():
+            day, key = day_names[group // n_keys], key_names[group % n_keys]
+            stats = (
+                self.days.setdefault(day, {})
+                .setdefault(dimension, {})
+                .setdefault(key, [0, 0, 0])
+            )
+            stats[0] += int(counts[group])
+            stats[1] += round(units[group])
+            stats[2] += round(amounts[group])
+
+    def report(
+        self,
+        by: str = "product",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        top: Optional[int] = None,
+    ) -> list[dict]:
+        """Orders, units and revenue per key of one dimension
+
+        Args:
+            by: One of DIMENSIONS
+            start: First day included (YYYY-MM-DD)
+            end: Last day included (YYYY-MM-DD)
+            top: Keep only the highest-revenue rows
+
+        Returns:
+            [{by: key, "orders": n, "units": n, "revenue_minor": n}, ...], by
+            revenue (or by hour of day for by="hour")
+        """
+        if by not in DIMENSIONS:
+            raise ValueError(
+                f"Unknown dimension {by!r}, expected one of {', '.join(DIMENSIONS)}"
+            )
+        totals: dict[str, list[int]] = {}
+        for day, dimensions in self.days.items():
+            if (start and day < start) or (end and day > end):
+                continue
+            for key, stats in dimensions.get(by, {}).items():
+                merged = totals.setdefault(key, [0, 0, 0])
+                for i in range(3):
+                    merged[i] += stats[i]
+
+        rows = [
+            {by: key, "orders": s[0], "units": s[1], "revenue_minor": s[2]}
+            for key, s in totals.items()
+        ]
+        rows.sort(key=lambda row: -row["revenue_minor"])
+        if top:
+            rows = rows[:top]
+        if by == "hour":
+            rows.sort(key=lambda row: row["hour"])
+        return rows
+
+
+def order_report(
+    by: str = "product",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    top: Optional[int] = None,
+    path: str = ORDERS_FILE,
+    cache_path: Optional[str] = CACHE_FILE,
+) -> list[dict]:
+    """Up-to-date report over the stored orders, reusing and updating the cache"""
+    analytics = OrderAnalytics(path, cache_path)
+    if analytics.refresh():
+        analytics.save()
+    return analytics.report(by, start, end, top)
+
+
+def format_report(rows: list[dict], by: str, currency: str = "INR") -> str:
+    lines = [f"{by:<16} {'orders':>10} {'units':>10} {'revenue':>16}"]
+    for row in rows:
+        revenue = from_minor(row["revenue_minor"], currency)
+        lines.append(
+            f"{row[by]:<16} {row['orders']:>10,} {row['units']:>10,} {revenue:>16,}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Revenue and order counts from stored orders"
+    )
+    parser.add_argument(
+        "--by",
+        choices=DIMENSIONS,
+        action="append",
+        help="Dimension to group by (repeatable, default all)",
+    )
+    parser.add_argument("--from", dest="start", help="First day included, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", help="Last day included, YYYY-MM-DD")
+    parser.add_argument("--top", type=int, help="Only the N highest-revenue rows")
+    parser.add_argument("--orders-file", default=ORDERS_FILE)
+    parser.add_argument("--cache-file", default=CACHE_FILE)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Aggregate from scratch and don't update the cache",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print JSON instead of tables"
+    )
+    args = parser.parse_args(argv)
+
+    analytics = OrderAnalytics(
+        args.orders_file, None if args.no_cache else args.cache_file
+    )
+    added = analytics.refresh()
+    if added:
+        analytics.save()
+    logger.info(f"Aggregated {added} new orders ({analytics.orders} total)")
+
+    reports = {
+        by: analytics.report(by, args.start, args.end, args.top)
+        for by in args.by or DIMENSIONS
+    }
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+    for by, rows in reports.items():
+        print(format_report(rows, by, analytics.engine.base_currency))
+        print()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -1,29 +1,235 @@
+import atexit
+import heapq
 import json
 import os
-from datetime import datetime
-
-
-def save_order_to_json(order: dict) -> str:
-    """Save order to JSON file with timestamp"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"order_{timestamp}.json"
-    
-    orders_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "orders")
-    os.makedirs(orders_dir, exist_ok=True)
-    
-    filepath = os.path.join(orders_dir, filename)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(order, f, indent=2, ensure_ascii=False)
-    
-    return filepath
-
-
-def is_order_complete(order: dict) -> bool:
+import threading
+import time
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import Optional, Union
+
+from slot_filling import Slot, SlotSchema, SlotState, compute_price
+
+ORDERS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "orders")
+
+# Barista menu prices (INR) per slot value; a drink costs the sum of its parts
+COFFEE_MENU = {
+    "drinkType": {
+        "espresso": 120,
+        "americano": 140,
+        "latte": 180,
+        "cappuccino": 180,
+        "flat white": 190,
+        "mocha": 200,
+        "cold brew": 210,
+    },
+    "size": {"small": 0, "medium": 30, "large": 60},
+    "milk": {"whole milk": 0, "skim milk": 0, "no milk": 0, "oat milk": 40, "almond milk": 40, "soy milk": 30},
+    "extras": {"extra shot": 50, "vanilla": 30, "caramel": 30, "hazelnut": 30, "whipped cream": 20},
+}
+
+COFFEE_ORDER_SCHEMA = SlotSchema([
+    Slot("drinkType", "What would you like to drink?", allowed=COFFEE_MENU["drinkType"],
+         aliases={"flatwhite": "flat white", "coldbrew": "cold brew"}),
+    Slot("size", "What size would you like: small, medium or large?", allowed=COFFEE_MENU["size"],
+         aliases={"regular": "medium", "tall": "small", "grande": "medium", "venti": "large"}),
+    Slot("milk", "What kind of milk would you like?", allowed=COFFEE_MENU["milk"],
+         aliases={"whole": "whole milk", "skim": "skim milk", "oat": "oat milk", "almond": "almond milk",
+                  "soy": "soy milk", "none": "no milk", "black": "no milk"}),
+    Slot("extras", "Any extras, like a shot or syrup?", allowed=COFFEE_MENU["extras"],
+         aliases={"shot": "extra shot", "whipped": "whipped cream"}, required=False, multi=True),
+    Slot("name", "And what name should I put on the order?"),
+])
+
+
+def new_coffee_order() -> SlotState:
+    """Empty barista order tracked by COFFEE_ORDER_SCHEMA"""
+    return COFFEE_ORDER_SCHEMA.new_state()
+
+
+def price_coffee_order(order: SlotState) -> int:
+    """Order total in INR from COFFEE_MENU"""
+    return compute_price(order, COFFEE_MENU)
+
+
+class OrderIdGenerator:
+    """Unique, monotonically increasing order ids
+
+    Ids look like ``20250103143052123-4821-000007``: millisecond timestamp,
+    process id and a per-process sequence, so they sort by creation time and
+    never collide between orders in the same second or across workers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._seq = 0
+
+    def next_id(self) -> str:
+        with self._lock:
+            now_ms = int(time.time() * 1000)
+            # Never go backwards, even if the wall clock does
+            if now_ms <= self._last_ms:
+                now_ms = self._last_ms
+            else:
+                self._last_ms = now_ms
+            self._seq += 1
+            seq = self._seq
+        stamp = datetime.fromtimestamp(now_ms / 1000).strftime("%Y%m%d%H%M%S")
+        return f"{stamp}{now_ms % 1000:03d}-{os.getpid()}-{seq:06d}"
+
+
+def order_day(order_id: str) -> str:
+    """YYYYMMDD day an order id was created on (today for ids we didn't generate)"""
+    day = order_id[:8]
+    if len(day) == 8 and day.isdigit():
+        return day
+    return datetime.now().strftime("%Y%m%d")
+
+
+class OrderSink:
+    """Buffered writer appending orders to daily rotated JSONL segments
+
+    Orders are buffered in memory and written in one batch when either
+    ``max_batch`` orders are pending or ``max_delay`` seconds have passed
+    since the first pending order. Each process writes its own segment per
+    day (``orders-YYYYMMDD-<pid>.jsonl``) so concurrent workers never
+    interleave partial lines.
+    """
+
+    def __init__(self, directory: str = ORDERS_DIR, max_batch: int = 500, max_delay: float = 1.0) -> None:
+        self.directory = directory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.ids = OrderIdGenerator()
+        self._lock = threading.Lock()
+        self._buffer: list[tuple[str, str]] = []  # (day, json line)
+        self._timer: Optional[threading.Timer] = None
+
+    def segment_path(self, day: str) -> str:
+        return os.path.join(self.directory, f"orders-{day}-{os.getpid()}.jsonl")
+
+    def write(self, order: dict) -> str:
+        """Queue an order, assigning an id if it has none. Returns the order id
+
+        The caller's dict is left as it is; the id goes on a copy.
+        """
+        order_id = order.get("id") or self.ids.next_id()
+        line = json.dumps({**order, "id": order_id}, ensure_ascii=False)
+
+        with self._lock:
+            self._buffer.append((order_day(order_id), line))
+            if len(self._buffer) >= self.max_batch:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return order_id
+
+    def flush(self) -> None:
+        """Write all pending orders to their segments"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+
+        by_day: dict[str, list[str]] = {}
+        for day, line in self._buffer:
+            by_day.setdefault(day, []).append(line)
+        self._buffer = []
+
+        os.makedirs(self.directory, exist_ok=True)
+        for day, lines in by_day.items():
+            with open(self.segment_path(day), "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _segment_day(filename: str) -> Optional[str]:
+    # orders-YYYYMMDD-<pid>.jsonl
+    if not (filename.startswith("orders-") and filename.endswith(".jsonl")):
+        return None
+    return filename[len("orders-"):len("orders-") + 8]
+
+
+def _read_segment(path: str) -> Iterator[tuple[str, dict]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                order = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn last line from a crash mid-write
+                continue
+            yield order.get("id", ""), order
+
+
+def iter_orders(start: Optional[date] = None, end: Optional[date] = None, directory: str = ORDERS_DIR) -> Iterator[dict]:
+    """Stream stored orders created between start and end (inclusive), oldest first
+
+    Only the segments for the requested days are opened, and each day is
+    merged across worker segments line by line, so memory stays bounded by
+    the number of segments rather than the number of orders.
+    """
+    if not os.path.isdir(directory):
+        return
+
+    first = start.strftime("%Y%m%d") if start else "00000000"
+    last = end.strftime("%Y%m%d") if end else "99999999"
+
+    segments_by_day: dict[str, list[str]] = {}
+    for filename in os.listdir(directory):
+        day = _segment_day(filename)
+        if day and first <= day <= last:
+            segments_by_day.setdefault(day, []).append(os.path.join(directory, filename))
+
+    for day in sorted(segments_by_day):
+        streams = [_read_segment(path) for path in segments_by_day[day]]
+        for _, order in heapq.merge(*streams, key=lambda item: item[0]):
+            yield order
+
+
+_default_sink: Optional[OrderSink] = None
+
+
+def get_order_sink() -> OrderSink:
+    """Process-wide order sink, flushed automatically on exit"""
+    global _default_sink
+    if _default_sink is None:
+        _default_sink = OrderSink()
+        atexit.register(_default_sink.close)
+    return _default_sink
+
+
+def save_order_to_json(order: Union[dict, SlotState]) -> str:
+    """Queue an order for today's JSONL segment. Returns the order id
+
+    The write is batched: the order reaches its segment within the sink's
+    max_delay (1s), or at exit. Use ``get_order_sink().flush()`` when it
+    must be on disk now.
+    """
+    if isinstance(order, SlotState):
+        order = order.to_dict()
+    return get_order_sink().write(order)
+
+
+def is_order_complete(order: Union[dict, SlotState]) -> bool:
     """Check if all required order fields are filled"""
+    if isinstance(order, SlotState):
+        return order.is_complete()
     return all([
         order.get("drinkType", "").strip(),
         order.get("size", "").strip(),
         order.get("milk", "").strip(),
         order.get("name", "").strip()
-    ])
\ No newline at end of file
+    ])
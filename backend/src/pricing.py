@@ -0,0 +1,269 @@
+from collections.abc import Iterable, Sequence
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
+
+import numpy as np
+
+# Minor units per major unit (paise per rupee, cents per dollar...)
+MINOR_UNITS = {"INR": 100, "USD": 100, "EUR": 100, "GBP": 100, "JPY": 1}
+
+# Reference rates: how many INR one major unit of each currency is worth.
+# Override per engine with PricingEngine(rates=...) when live rates are available.
+DEFAULT_RATES = {"INR": 1.0, "USD": 83.0, "EUR": 90.0, "GBP": 105.0, "JPY": 0.56}
+
+BASIS_POINTS = 10_000
+
+
+def to_minor(amount, currency: str = "INR") -> int:
+    """Convert a major-unit amount (e.g. 12.50 rupees) to integer minor units"""
+    if isinstance(amount, int):
+        return amount * MINOR_UNITS.get(currency, 100)
+    scaled = Decimal(str(amount)) * MINOR_UNITS.get(currency, 100)
+    return int(scaled.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_minor(amount_minor: int, currency: str = "INR"):
+    """Convert integer minor units back to a major-unit number for display"""
+    units = MINOR_UNITS.get(currency, 100)
+    if amount_minor % units == 0:
+        return amount_minor // units
+    return amount_minor / units
+
+
+def _apply_bp(amount_minor, bp: int):
+    """amount * bp / 10000 rounded half up, for ints or int64 arrays"""
+    return (amount_minor * bp + BASIS_POINTS // 2) // BASIS_POINTS
+
+
+class PricingEngine:
+    """Integer minor-unit pricing with currency conversion, discounts and tax
+
+    Scalar quotes are used for voice orders; the array methods price large
+    carts and bulk order imports in a handful of NumPy operations.
+
+    Args:
+        base_currency: Currency mixed-currency carts and reports are totalled in
+        rates: INR value of one major unit of each currency (see DEFAULT_RATES)
+        tax_bp: Tax rate in basis points applied after discounts (1800 = 18% GST)
+    """
+
+    def __init__(
+        self,
+        base_currency: str = "INR",
+        rates: Optional[dict[str, float]] = None,
+        tax_bp: int = 0,
+    ) -> None:
+        self.base_currency = base_currency
+        self.rates = dict(rates or DEFAULT_RATES)
+        self.tax_bp = tax_bp
+        self._rate_cache: dict[tuple[str, str], float] = {}
+        self._vector_cache: dict[tuple[tuple[str, ...], str], np.ndarray] = {}
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Multiplier converting minor units of one currency to another (cached)"""
+        key = (from_currency, to_currency)
+        cached = self._rate_cache.get(key)
+        if cached is None:
+            if from_currency not in self.rates or to_currency not in self.rates:
+                raise ValueError(
+                    f"No conversion rate for {from_currency} -> {to_currency}"
+                )
+            major_rate = self.rates[from_currency] / self.rates[to_currency]
+            cached = (
+                major_rate
+                * MINOR_UNITS.get(to_currency, 100)
+                / MINOR_UNITS.get(from_currency, 100)
+            )
+            self._rate_cache[key] = cached
+        return cached
+
+    def convert(self, amount_minor: int, from_currency: str, to_currency: str) -> int:
+        if from_currency == to_currency:
+            return amount_minor
+        return round(amount_minor * self.rate(from_currency, to_currency))
+
+    def _rate_vector(self, currencies: Sequence[str], to_currency: str) -> np.ndarray:
+        key = (tuple(currencies), to_currency)
+        vector = self._vector_cache.get(key)
+        if vector is None:
+            vector = np.array(
+                [self.rate(c, to_currency) for c in currencies], dtype=np.float64
+            )
+            self._vector_cache[key] = vector
+        return vector
+
+    def line_totals(
+        self, unit_minor, quantities, currencies, to_currency: Optional[str] = None
+    ) -> np.ndarray:
+        """Vectorized line totals in minor units of to_currency
+
+        Args:
+            unit_minor: Unit prices in minor units of each line's own currency
+            quantities: Quantity per line
+            currencies: Currency code per line
+        """
+        to_currency = to_currency or self.base_currency
+        amounts = np.asarray(unit_minor, dtype=np.int64) * np.asarray(
+            quantities, dtype=np.int64
+        )
+        codes, inverse = np.unique(np.asarray(currencies), return_inverse=True)
+        if len(codes) == 1 and codes[0] == to_currency:
+            return amounts
+        rates = self._rate_vector(codes.tolist(), to_currency)[inverse]
+        return np.rint(amounts * rates).astype(np.int64)
+
+    def settle(self, subtotal_minor, discount_bp: int = 0):
+        """Apply a percentage discount then tax. Works on ints or int64 arrays
+
+        Returns:
+            (discount, tax, total) in minor units
+        """
+        discount = _apply_bp(subtotal_minor, discount_bp)
+        tax = _apply_bp(subtotal_minor - discount, self.tax_bp)
+        return discount, tax, subtotal_minor - discount + tax
+
+    def quote(
+        self, lines: list[dict], discount_bp: int = 0, fixed_discount_minor: int = 0
+    ) -> dict:
+        """Price one cart
+
+        Args:
+            lines: [{"unit_price_minor": 80000, "quantity": 1, "currency": "INR"}, ...]
+            discount_bp: Percentage discount in basis points (1000 = 10%)
+            fixed_discount_minor: Flat discount in minor units, applied before the percentage
+
+        Returns:
+            Dict with currency, line_totals, subtotal, discount, tax and total (minor units)
+        """
+        currencies = {line["currency"] for line in lines}
+        currency = currencies.pop() if len(currencies) == 1 else self.base_currency
+
+        totals = self.line_totals(
+            [line["unit_price_minor"] for line in lines],
+            [line.get("quantity", 1) for line in lines],
+            [line["currency"] for line in lines],
+            currency,
+        )
+        subtotal = int(totals.sum())
+        discounted = max(subtotal - fixed_discount_minor, 0)
+        discount, tax, total = self.settle(discounted, discount_bp)
+        return {
+            "currency": currency,
+            "line_totals": [int(t) for t in totals],
+            "subtotal": subtotal,
+            "discount": int(discount) + (subtotal - discounted),
+            "tax": int(tax),
+            "total": int(total),
+        }
+
+    def order_totals(
+        self,
+        order_index,
+        unit_minor,
+        quantities,
+        currencies,
+        n_orders: int,
+        discount_bp=0,
+    ) -> np.ndarray:
+        """Vectorized totals for many orders at once, in base currency minor units
+
+        Lines from every order are passed as flat arrays, with order_index
+        giving the order each line belongs to. discount_bp may be a scalar
+        or one value per order.
+        """
+        lines = self.line_totals(unit_minor, quantities, currencies)
+        subtotals = np.bincount(
+            np.asarray(order_index), weights=lines, minlength=n_orders
+        )
+        subtotals = np.rint(subtotals).astype(np.int64)
+        _, _, totals = self.settle(subtotals, np.asarray(discount_bp, dtype=np.int64))
+        return totals
+
+
+def flatten_orders(orders: Iterable[dict]):
+    """Flatten stored orders into the parallel arrays used by the bulk methods
+
+    Returns:
+        (order_index, product_ids, unit_minor, quantities, currencies, n_orders)
+    """
+    order_index: list[int] = []
+    product_ids: list[str] = []
+    unit_minor: list[int] = []
+    quantities: list[int] = []
+    currencies: list[str] = []
+    n_orders = 0
+    for i, order in enumerate(orders):
+        n_orders = i + 1
+        for item in order.get("items", []):
+            currency = item.get("currency", "INR")
+            order_index.append(i)
+            product_ids.append(item["product_id"])
+            unit_minor.append(
+                item["unit_price_minor"]
+                if "unit_price_minor" in item
+                else to_minor(item["unit_price"], currency)
+            )
+            quantities.append(item.get("quantity", 1))
+            currencies.append(currency)
+    return (
+        np.asarray(order_index, dtype=np.int64),
+        np.asarray(product_ids),
+        np.asarray(unit_minor, dtype=np.int64),
+        np.asarray(quantities, dtype=np.int64),
+        np.asarray(currencies),
+        n_orders,
+    )
+
+
+def reprice_orders(
+    engine: PricingEngine, orders: list[dict], catalog: dict[str, dict]
+) -> np.ndarray:
+    """Totals (base currency minor units) every order would have at current catalog prices
+
+    Products no longer in the catalog keep the price they were sold at.
+    """
+    order_index, product_ids, unit_minor, quantities, currencies, n_orders = (
+        flatten_orders(orders)
+    )
+    if not n_orders:
+        return np.zeros(0, dtype=np.int64)
+
+    # Map each distinct product once, then broadcast back to every line
+    codes, inverse = np.unique(product_ids, return_inverse=True)
+    current = np.array(
+        [
+            to_minor(catalog[c]["price"], catalog[c].get("currency", "INR"))
+            if c in catalog
+            else -1
+            for c in codes.tolist()
+        ],
+        dtype=np.int64,
+    )[inverse]
+    current_currency = np.array(
+        [
+            catalog[c].get("currency", "INR") if c in catalog else ""
+            for c in codes.tolist()
+        ]
+    )[inverse]
+    known = current >= 0
+    unit_minor = np.where(known, current, unit_minor)
+    currencies = np.where(known, current_currency, currencies)
+    return engine.order_totals(
+        order_index, unit_minor, quantities, currencies, n_orders
+    )
+
+
+def revenue_report(
+    engine: PricingEngine, orders: Iterable[dict], by: str = "product_id"
+) -> dict[str, int]:
+    """Revenue per product (or per currency with by="currency") in base currency minor units"""
+    _, product_ids, unit_minor, quantities, currencies, n_orders = flatten_orders(
+        orders
+    )
+    if not n_orders:
+        return {}
+    keys = currencies if by == "currency" else product_ids
+    lines = engine.line_totals(unit_minor, quantities, currencies)
+    codes, inverse = np.unique(keys, return_inverse=True)
+    sums = np.bincount(inverse, weights=lines, minlength=len(codes))
+    return {code: round(total) for code, total in zip(codes.tolist(), sums.tolist())}
@@ -0,0 +1,61 @@
+# Product catalog, kept apart from commerce_backend so reporting can use it
+# without loading the order store
+PRODUCTS = [
+    {
+        "id": "mug-001",
+        "name": "Stoneware Coffee Mug",
+        "description": "Handcrafted ceramic mug perfect for your morning coffee",
+        "price": 800,
+        "currency": "INR",
+        "category": "mug",
+        "color": "white",
+        "size": "350ml",
+        "stock": 25,
+    },
+    {
+        "id": "mug-002",
+        "name": "Blue Ceramic Mug",
+        "description": "Beautiful blue glazed ceramic mug",
+        "price": 650,
+        "currency": "INR",
+        "category": "mug",
+        "color": "blue",
+        "size": "300ml",
+        "stock": 12,
+    },
+    {
+        "id": "tshirt-001",
+        "name": "Cotton T-Shirt",
+        "description": "Comfortable 100% cotton t-shirt",
+        "price": 1200,
+        "currency": "INR",
+        "category": "clothing",
+        "color": "black",
+        "size": "M",
+        "stock": 40,
+    },
+    {
+        "id": "hoodie-001",
+        "name": "Black Hoodie",
+        "description": "Warm and cozy black hoodie",
+        "price": 2500,
+        "currency": "INR",
+        "category": "clothing",
+        "color": "black",
+        "size": "L",
+        "stock": 8,
+    },
+    {
+        "id": "hoodie-002",
+        "name": "Gray Hoodie",
+        "description": "Comfortable gray pullover hoodie",
+        "price": 2200,
+        "currency": "INR",
+        "category": "clothing",
+        "color": "gray",
+        "size": "M",
+        "stock": 0,
+    },
+]
+
+CATEGORY_BY_PRODUCT = {p["id"]: p["category"] for p in PRODUCTS}
@@ -0,0 +1,300 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Optional
+
+from livekit.agents import JobExecutorType
+
+logger = logging.getLogger("room_profiler")
+
+# Comma-separated room names to profile, or * for every room this worker runs
+PROFILE_ROOMS = os.getenv("PROFILE_ROOMS", "")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "output", "profiles"),
+)
+# Room metadata key that turns profiling on or off at runtime, e.g. {"profile": true}
+METADATA_FLAG = "profile"
+MAX_DEPTH = 64
+
+# Pipeline stage of a sample: the innermost frame whose file path contains one of these
+STAGES: list[tuple[str, tuple[str, ...]]] = [
+    (
+        "persistence",
+        (
+            "/json/",
+            "_storage.py",
+            "customer_profiles.py",
+            "commerce_backend.py",
+            "order_analytics.py",
+        ),
+    ),
+    ("stt", ("/stt/", "plugins/deepgram", "plugins/assemblyai")),
+    ("tts", ("/tts/", "plugins/murf", "adaptive_chunking.py", "/tokenize/")),
+    ("tool", ("/llm/tool_context.py",)),
+    ("llm", ("/llm/llm.py", "/llm/chat_context.py", "plugins/google")),
+    ("vad", ("plugins/silero", "/vad.py")),
+    ("turn_detection", ("turn_detector", "inference_batching.py")),
+    ("audio", ("noise_cancellation", "/rtc/")),
+]
+# Innermost Python frames of a thread that is waiting rather than working
+IDLE_FUNCTIONS = frozenset({"select", "poll", "wait"})
+
+# Thread running each job's event loop -> job id, for tagging samples when
+# jobs share a process (thread executor)
+_JOB_THREADS: dict[int, str] = {}
+
+
+def profiling_requested(
+    room_name: str, metadata: Optional[str] = None, rooms: str = PROFILE_ROOMS
+) -> bool:
+    """Whether a room should be profiled, from PROFILE_ROOMS or its metadata flag"""
+    try:
+        flags = json.loads(metadata) if metadata else {}
+    except json.JSONDecodeError:
+        flags = {}
+    if isinstance(flags, dict) and METADATA_FLAG in flags:
+        return bool(flags[METADATA_FLAG])
+    selected = {name.strip() for name in rooms.split(",") if name.strip()}
+    return "*" in selected or room_name in selected
+
+
+class SamplingProfiler:
+    """Statistical profiler for a job's process
+
+    Started on the main thread of a process that runs a single job (the
+    process executor, LiveKit's default), a CPU-time interval timer
+    (SIGPROF) interrupts the event loop every ``interval`` seconds of CPU
+    use and the interrupted stack is counted in collapsed-stack form. The
+    profiled code runs unmodified; the cost is one stack walk per sample.
+
+    ITIMER_PROF counts CPU used by every thread in the process, but Python
+    runs the handler on the main thread, so each sample is the main
+    thread's stack. CPU burned elsewhere (``asyncio.to_thread`` work,
+    plugin and audio threads, the inference runner) is credited to
+    whatever the event loop happens to be doing, or dropped as idle when
+    the loop is waiting in ``select``. Treat stage and tool shares as the
+    event loop's view; ``include_idle`` keeps those samples visible.
+
+    Otherwise (no SIGPROF, started off the main thread, or
+    ``shared_process``) a background thread samples every other thread
+    instead. That can only see a thread when it releases the GIL, which is
+    mostly while it waits on I/O, so it is a rougher picture. With the
+    thread executor every job in the worker shares the process: samples
+    cover all of their threads and each stack is prefixed with
+    ``job:<id>`` for the job whose event loop it is (``job:-`` for shared
+    threads), so they are not a per-room profile.
+
+    Samples are also tagged with the pipeline stage (see STAGES) and with
+    the agent tool on the stack, if any, so a flamegraph of a laggy room
+    can be split by tool and stage first.
+
+    Args:
+        interval: Seconds between samples
+        tools: Names of the agent's tool methods, used for the tool tag
+        include_idle: Also keep samples of an event loop waiting for I/O
+        shared_process: Jobs share this process, so never use SIGPROF and
+            tag samples with their job
+    """
+
+    def __init__(
+        self,
+        interval: float = PROFILE_INTERVAL_MS / 1000,
+        tools: Iterable[str] = (),
+        include_idle: bool = False,
+        shared_process: bool = False,
+    ) -> None:
+        self.interval = interval
+        self.tools = frozenset(tools)
+        self.include_idle = include_idle
+        self.shared_process = shared_process
+        self.samples: Counter = Counter()
+        self.stages: Counter = Counter()
+        self.tool_samples: Counter = Counter()
+        self.job_samples: Counter = Counter()
+        self.sample_count = 0
+        self.sample_time = 0.0
+        self._labels: dict[object, tuple[str, Optional[str]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._previous_handler = None
+        self.running = False
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        if (
+            not self.shared_process
+            and hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        ):
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="room-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        if self._thread is None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _on_signal(self, signum, frame) -> None:
+        started = time.perf_counter()
+        if frame is not None:
+            self._sample(frame)
+        self.sample_time += time.perf_counter() - started
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            started = time.perf_counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    job = (
+                        _JOB_THREADS.get(thread_id, "-")
+                        if self.shared_process
+                        else None
+                    )
+                    self._sample(frame, job)
+            self.sample_time += time.perf_counter() - started
+
+    def _label(self, code) -> tuple[str, Optional[str]]:
+        """Frame name and pipeline stage for a code object (cached)"""
+        cached = self._labels.get(code)
+        if cached is None:
+            filename = code.co_filename.replace("\\", "/")
+            module = os.path.splitext(os.path.basename(filename))[0]
+            stage = next(
+                (name for name, parts in STAGES if any(p in filename for p in parts)),
+                None,
+            )
+            cached = (f"{module}:{getattr(code, 'co_qualname', code.co_name)}", stage)
+            self._labels[code] = cached
+        return cached
+
+    def _sample(self, frame, job: Optional[str] = None) -> None:
+        innermost = frame.f_code.co_name
+        if not self.include_idle and innermost in IDLE_FUNCTIONS:
+            return
+        names: list[str] = []
+        stage = tool = None
+        while frame is not None and len(names) < MAX_DEPTH:
+            code = frame.f_code
+            name, frame_stage = self._label(code)
+            names.append(name)
+            if stage is None and frame_stage is not None:
+                stage = frame_stage
+            if tool is None and code.co_name in self.tools:
+                tool = code.co_name
+            frame = frame.f_back
+        if stage is None:
+            stage = (
+                "idle" if innermost in IDLE_FUNCTIONS else ("tool" if tool else "agent")
+            )
+        names.reverse()
+        tags = [f"stage:{stage}", f"tool:{tool or '-'}"]
+        if job is not None:
+            tags.insert(0, f"job:{job}")
+            self.job_samples[job] += 1
+        self.samples[";".join([*tags, *names])] += 1
+        self.stages[stage] += 1
+        if tool:
+            self.tool_samples[tool] += 1
+        self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format, as read by flamegraph.pl and speedscope"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+    def write(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+
+    def get_stats(self) -> dict[str, object]:
+        stats: dict[str, object] = {
+            "samples": self.sample_count,
+            "stages": dict(self.stages.most_common()),
+            "tools": dict(self.tool_samples.most_common()),
+            "avg_sample_us": round(self.sample_time / self.sample_count * 1e6, 1)
+            if self.sample_count
+            else 0.0,
+        }
+        if self.shared_process:
+            stats["jobs"] = dict(self.job_samples.most_common())
+        return stats
+
+
+def start_room_profiler(ctx, agent=None) -> SamplingProfiler:
+    """Profile this job while PROFILE_ROOMS or the room's metadata asks for it
+
+    Changes to the room's ``profile`` metadata flag start and stop the
+    profiler at runtime. On shutdown, anything sampled is written to
+    PROFILE_DIR as <room>-<time>.collapsed, or <room>-<time>.all-jobs.collapsed
+    when the worker runs jobs as threads and the samples are tagged by job.
+    """
+    room_name = ctx.room.name
+    job_id = ctx.job.id
+    shared_process = ctx.proc.executor_type != JobExecutorType.PROCESS
+    tools = [getattr(tool, "__name__", "") for tool in getattr(agent, "tools", [])]
+    profiler = SamplingProfiler(
+        tools=[name for name in tools if name], shared_process=shared_process
+    )
+    loop_thread = threading.get_ident()
+    _JOB_THREADS[loop_thread] = job_id
+
+    def apply(metadata: Optional[str]) -> None:
+        if profiling_requested(room_name, metadata):
+            if not profiler.running:
+                logger.info(
+                    f"Profiling room {room_name} every {profiler.interval * 1000:.0f}ms"
+                )
+            profiler.start()
+        elif profiler.running:
+            profiler.stop()
+            logger.info(f"Stopped profiling room {room_name}")
+
+    apply(ctx.job.room.metadata)
+
+    @ctx.room.on("room_metadata_changed")
+    def _on_metadata_changed(old_metadata: str, metadata: str) -> None:
+        apply(metadata)
+
+    async def finish() -> None:
+        profiler.stop()
+        _JOB_THREADS.pop(loop_thread, None)
+        if not profiler.sample_count:
+            return
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        safe_name = re.sub(r"[^\w.-]", "_", room_name) or "room"
+        suffix = "all-jobs.collapsed" if shared_process else "collapsed"
+        path = os.path.join(PROFILE_DIR, f"{safe_name}-{stamp}.{suffix}")
+        await asyncio.to_thread(profiler.write, path)
+        logger.info(f"Profile written to {path}: {profiler.get_stats()}")
+
+    ctx.add_shutdown_callback(finish)
+    return profiler
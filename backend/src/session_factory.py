@@ -0,0 +1,230 @@
+import importlib
+import sys
+from typing import Any
+
+from livekit.agents import AgentSession, RoomInputOptions, tokenize
+
+from adaptive_chunking import AdaptiveSentenceTokenizer
+from connection_pool import POOL
+from load_governor import FULL, PipelineProfile
+
+# Per-persona pipeline configuration. Provider plugins are imported only when
+# a persona that uses them is prewarmed, so the worker process and personas
+# that don't need a provider never pay for importing it.
+PERSONAS: dict[str, dict[str, Any]] = {
+    "shopping": {
+        "stt": {
+            "provider": "deepgram",
+            "model": "nova-3",
+            "base_url": "https://api.deepgram.com/v1/listen",
+        },
+        "llm": {"provider": "google", "model": "gemini-2.5-flash"},
+        "tts": {
+            "provider": "murf",
+            "voice": "en-US-matthew",
+            "style": "Conversation",
+            "base_url": "https://global.api.murf.ai",
+            "chunking": "adaptive",
+            "min_sentence_len": 2,
+            "text_pacing": True,
+        },
+        "turn_detection": "multilingual",
+        "noise_cancellation": "bvc",
+        "preemptive_generation": True,
+    },
+    "sdr": {
+        "stt": {
+            "provider": "deepgram",
+            "model": "nova-3",
+            "base_url": "https://api.deepgram.com/v1/listen",
+        },
+        "llm": {"provider": "google", "model": "gemini-2.5-flash"},
+        "tts": {
+            "provider": "murf",
+            "voice": "en-IN-neerja",
+            "style": "Conversation",
+            "base_url": "https://global.api.murf.ai",
+            "chunking": "adaptive",
+            "min_sentence_len": 2,
+            "text_pacing": True,
+        },
+        "turn_detection": "multilingual",
+        "noise_cancellation": "bvc",
+        "preemptive_generation": True,
+    },
+    "wellness": {
+        "stt": {
+            "provider": "deepgram",
+            "model": "nova-3",
+            "base_url": "https://api.deepgram.com/v1/listen",
+        },
+        "llm": {"provider": "google", "model": "gemini-2.5-flash"},
+        "tts": {
+            "provider": "murf",
+            "voice": "en-US-matthew",
+            "style": "Conversation",
+            "base_url": "https://global.api.murf.ai",
+            "chunking": "adaptive",
+            "min_sentence_len": 2,
+            "text_pacing": True,
+        },
+        "turn_detection": "multilingual",
+        "noise_cancellation": "bvc",
+        "preemptive_generation": True,
+    },
+}
+
+# Module that provides each provider / feature
+PLUGIN_MODULES = {
+    "deepgram": "livekit.plugins.deepgram",
+    "google": "livekit.plugins.google",
+    "murf": "livekit.plugins.murf",
+    "silero": "livekit.plugins.silero",
+    "bvc": "livekit.plugins.noise_cancellation",
+    "multilingual": "inference_batching",
+}
+
+
+def _plugin(name: str):
+    return importlib.import_module(PLUGIN_MODULES[name])
+
+
+def persona_plugins(persona: str) -> list:
+    """Plugin names a persona's full pipeline needs"""
+    config = PERSONAS[persona]
+    names = [
+        config["stt"]["provider"],
+        config["llm"]["provider"],
+        config["tts"]["provider"],
+        "silero",
+    ]
+    if config.get("turn_detection") in PLUGIN_MODULES:
+        names.append(config["turn_detection"])
+    if config.get("noise_cancellation") in PLUGIN_MODULES:
+        names.append(config["noise_cancellation"])
+    return names
+
+
+def import_plugins(persona: str) -> None:
+    """Import (and so register) every plugin the persona uses
+
+    LiveKit plugins must register on the main thread, so call this from
+    prewarm or the worker's __main__ block rather than from a session.
+    """
+    for name in persona_plugins(persona):
+        _plugin(name)
+
+
+def register_worker_plugins(persona: str) -> None:
+    """Main-process setup before cli.run_app
+
+    The worker process only needs the turn detector (its inference runner
+    must be registered before the shared inference process starts). The
+    download-files command needs every plugin so it can fetch their models.
+    """
+    if "download-files" in sys.argv:
+        import_plugins(persona)
+    elif PERSONAS[persona].get("turn_detection") == "multilingual":
+        _plugin("multilingual")
+
+
+def load_vad():
+    """Silero VAD for prewarm"""
+    return _plugin("silero").VAD.load()
+
+
+def _build_stt(config: dict[str, Any]):
+    if config["provider"] == "deepgram":
+        return _plugin("deepgram").STT(
+            model=config["model"],
+            base_url=config["base_url"],
+            http_session=POOL.http_session(),
+        )
+    raise ValueError(f"Unknown STT provider: {config['provider']}")
+
+
+def _build_llm(config: dict[str, Any]):
+    if config["provider"] == "google":
+        return _plugin("google").LLM(model=config["model"])
+    raise ValueError(f"Unknown LLM provider: {config['provider']}")
+
+
+def _build_tokenizer(
+    config: dict[str, Any], profile: PipelineProfile
+) -> tokenize.SentenceTokenizer:
+    """Short first chunk then growing chunks ("adaptive"), or plain sentences
+
+    Both honour the load profile's stream context and the persona's
+    min_sentence_len (for adaptive chunks, a floor on the first chunk).
+    """
+    min_sentence_len = config.get("min_sentence_len", 2)
+    if config.get("chunking") == "adaptive":
+        return AdaptiveSentenceTokenizer(
+            first_min_len=max(8, min_sentence_len),
+            context_len=profile.stream_context_len,
+        )
+    return tokenize.basic.SentenceTokenizer(
+        min_sentence_len=min_sentence_len,
+        stream_context_len=profile.stream_context_len,
+    )
+
+
+def _build_tts(config: dict[str, Any], profile: PipelineProfile):
+    if config["provider"] == "murf":
+        return _plugin("murf").TTS(
+            voice=config["voice"],
+            style=config["style"],
+            base_url=config["base_url"],
+            http_session=POOL.http_session(),
+            tokenizer=_build_tokenizer(config, profile),
+            text_pacing=config.get("text_pacing", True) and profile.text_pacing,
+        )
+    raise ValueError(f"Unknown TTS provider: {config['provider']}")
+
+
+def _build_turn_detection(config: dict[str, Any], profile: PipelineProfile):
+    mode = config.get("turn_detection", "vad")
+    if mode == "multilingual" and profile.multilingual_turn_detection:
+        return _plugin("multilingual").BatchedMultilingualModel()
+    return "vad" if mode == "multilingual" else mode
+
+
+def create_session(persona: str, vad, profile: PipelineProfile = FULL) -> AgentSession:
+    """Build the AgentSession for a persona from PERSONAS and the load profile"""
+    config = PERSONAS[persona]
+    return AgentSession(
+        stt=_build_stt(config["stt"]),
+        llm=_build_llm(config["llm"]),
+        tts=_build_tts(config["tts"], profile),
+        turn_detection=_build_turn_detection(config, profile),
+        vad=vad,
+        preemptive_generation=config.get("preemptive_generation", True),
+    )
+
+
+async def warm_session(persona: str, session: AgentSession) -> None:
+    """Open provider connections and the TTS stream while the room connects
+
+    Run as a task right after create_session, before ctx.connect, so the
+    handshakes overlap room setup instead of the first reply.
+    """
+    config = PERSONAS[persona]
+    urls = [
+        config[kind]["base_url"]
+        for kind in ("stt", "tts")
+        if "base_url" in config[kind]
+    ]
+    await POOL.warm(urls, components=[session.tts])
+
+
+def room_input_options(
+    persona: str, profile: PipelineProfile = FULL
+) -> RoomInputOptions:
+    """Room input options for a persona, with BVC only when the profile allows it"""
+    noise_cancellation = None
+    if (
+        PERSONAS[persona].get("noise_cancellation") == "bvc"
+        and profile.noise_cancellation
+    ):
+        noise_cancellation = _plugin("bvc").BVC()
+    return RoomInputOptions(noise_cancellation=noise_cancellation)
@@ -0,0 +1,159 @@
+from collections.abc import Sequence
+from typing import Any, Optional
+
+
+class Slot:
+    """One field to collect during a conversation
+
+    Args:
+        name: Key used in the resulting order/lead dict
+        question: What the agent asks when this slot is next
+        allowed: Canonical values accepted for the slot (None means free text)
+        aliases: Spoken variants mapped to a canonical value, e.g. {"oat": "oat milk"}
+        required: Whether the slot must be filled for the state to be complete
+        multi: Whether the slot holds a list (e.g. extras) instead of one value
+    """
+
+    __slots__ = ("aliases", "allowed", "multi", "name", "question", "required")
+
+    def __init__(
+        self,
+        name: str,
+        question: str,
+        allowed: Optional[Sequence[str]] = None,
+        aliases: Optional[dict[str, str]] = None,
+        required: bool = True,
+        multi: bool = False,
+    ) -> None:
+        self.name = name
+        self.question = question
+        self.allowed = frozenset(v.lower() for v in allowed) if allowed else None
+        self.aliases = {k.lower(): v.lower() for k, v in (aliases or {}).items()}
+        self.required = required
+        self.multi = multi
+
+    def normalize(self, value: str) -> str:
+        """Canonical form of a spoken value, "" if blank. Raises ValueError if not allowed"""
+        cleaned = " ".join(str(value).split())
+        if not cleaned or self.allowed is None:
+            return cleaned
+        lowered = cleaned.lower()
+        lowered = self.aliases.get(lowered, lowered)
+        if lowered not in self.allowed:
+            raise ValueError(f"'{value}' is not a valid {self.name}")
+        return lowered
+
+
+class SlotSchema:
+    """Declarative, ordered set of slots shared by every state of one persona
+
+    Slot order is the question order: the next question is always the
+    first required slot that is still empty.
+    """
+
+    def __init__(self, slots: list[Slot]) -> None:
+        self.slots = slots
+        self.bits = {slot.name: 1 << i for i, slot in enumerate(slots)}
+        self.by_name = {slot.name: slot for slot in slots}
+        self.required_mask = 0
+        for slot in slots:
+            if slot.required:
+                self.required_mask |= self.bits[slot.name]
+
+    def new_state(self) -> "SlotState":
+        return SlotState(self)
+
+
+class SlotState:
+    """Filled values for one conversation, tracked with a bitmask
+
+    Every update and the completeness / next-question checks are O(1),
+    so thousands of concurrent orders cost nothing beyond their dicts.
+    """
+
+    __slots__ = ("filled", "schema", "values")
+
+    def __init__(self, schema: SlotSchema) -> None:
+        self.schema = schema
+        self.values: dict[str, Any] = {}
+        self.filled = 0
+
+    def set(self, name: str, value: str) -> str:
+        """Fill a slot (appending for multi slots). Returns the canonical value"""
+        slot = self.schema.by_name[name]
+        canonical = slot.normalize(value)
+        if not canonical:
+            return self.clear(name)
+
+        if slot.multi:
+            items = self.values.setdefault(name, [])
+            if canonical not in items:
+                items.append(canonical)
+        else:
+            self.values[name] = canonical
+        self.filled |= self.schema.bits[name]
+        return canonical
+
+    def clear(self, name: str) -> str:
+        self.values.pop(name, None)
+        self.filled &= ~self.schema.bits[name]
+        return ""
+
+    def remove(self, name: str, value: str) -> str:
+        """Drop one entry from a multi slot (e.g. "no vanilla"). Returns the canonical value"""
+        slot = self.schema.by_name[name]
+        if not slot.multi:
+            raise ValueError(f"{name} holds a single value; use clear()")
+        canonical = slot.normalize(value)
+        items = self.values.get(name, [])
+        if canonical in items:
+            items.remove(canonical)
+        if not items:
+            self.clear(name)
+        return canonical
+
+    def is_filled(self, name: str) -> bool:
+        return bool(self.filled & self.schema.bits[name])
+
+    def is_complete(self) -> bool:
+        return self.filled & self.schema.required_mask == self.schema.required_mask
+
+    def next_slot(self) -> Optional[Slot]:
+        """First required slot still missing, or None when complete"""
+        missing = self.schema.required_mask & ~self.filled
+        if not missing:
+            return None
+        # Isolate the lowest set bit and turn it back into a slot index
+        return self.schema.slots[(missing & -missing).bit_length() - 1]
+
+    def next_question(self) -> Optional[str]:
+        slot = self.next_slot()
+        return slot.question if slot else None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict with every slot, empty ones as "" or []"""
+        return {
+            slot.name: list(self.values.get(slot.name, []))
+            if slot.multi
+            else self.values.get(slot.name, "")
+            for slot in self.schema.slots
+        }
+
+
+def compute_price(state: SlotState, menu: dict[str, dict[str, int]]) -> int:
+    """Sum menu prices for every filled slot value
+
+    ``menu`` maps slot name -> canonical value -> price in whole currency
+    units, e.g. {"size": {"large": 60}, "extras": {"vanilla": 30}}.
+    Values missing from the menu are free.
+    """
+    total = 0
+    for name, value in state.values.items():
+        prices = menu.get(name)
+        if not prices:
+            continue
+        if isinstance(value, list):
+            total += sum(prices.get(item, 0) for item in value)
+        else:
+            total += prices.get(value, 0)
+    return total
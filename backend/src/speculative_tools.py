@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("speculative_tools")
+
+# Only read-only tools may be registered here. Anything that writes
+# (create_order, save_lead_json, collect_lead_field...) must never be speculated.
+
+
+def _default_key(args: dict[str, Any]) -> tuple:
+    """Build a cache key from tool arguments"""
+    return tuple(sorted((k, str(v).strip().lower()) for k, v in args.items()))
+
+
+class SpeculativeTool:
+    """A read-only tool that can be run ahead of the LLM's actual call
+
+    Args:
+        name: Tool name, matching the @function_tool method
+        predict: Maps an interim transcript to predicted tool arguments, or None
+        run: Side-effect-free function computing the tool result from arguments
+        key: Maps arguments to a cache key (defaults to normalized argument values)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        predict: Callable[[str], Optional[dict[str, Any]]],
+        run: Callable[..., Any],
+        key: Optional[Callable[[dict[str, Any]], tuple]] = None,
+    ) -> None:
+        self.name = name
+        self.predict = predict
+        self.run = run
+        self.key = key or _default_key
+
+
+class _Speculation:
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.duration_ms = 0.0
+
+
+class SpeculativeToolRunner:
+    """Runs predicted read-only tool calls from interim STT transcripts
+
+    Usage from a tool:
+        result = await runner.take("get_order_status", {})
+        if result is None:
+            result = compute_normally()
+    """
+
+    def __init__(self, tools: list[SpeculativeTool], max_pending: int = 8) -> None:
+        self.tools = {tool.name: tool for tool in tools}
+        self.max_pending = max_pending
+        self._cache: dict[tuple[str, tuple], _Speculation] = {}
+        self._turn = {"hits": 0, "misses": 0, "saved_ms": 0.0}
+        self._total = {"hits": 0, "misses": 0, "saved_ms": 0.0, "turns": 0}
+        self._turn_open = False
+
+    def on_transcript(self, transcript: str, is_final: bool = False) -> None:
+        """Feed an interim or final user transcript to start predicted tool runs"""
+        self._turn_open = True
+        text = transcript.strip()
+        if not text:
+            return
+
+        for tool in self.tools.values():
+            try:
+                args = tool.predict(text)
+            except Exception as e:
+                logger.debug(f"Prediction failed for {tool.name}: {e}")
+                continue
+            if args is None:
+                continue
+            cache_key = (tool.name, tool.key(args))
+            if cache_key in self._cache:
+                continue
+            if len(self._cache) >= self.max_pending:
+                self._evict_oldest()
+            self._cache[cache_key] = self._start(tool, args)
+
+    def _start(self, tool: SpeculativeTool, args: dict[str, Any]) -> _Speculation:
+        async def _run():
+            started = time.perf_counter()
+            result = await asyncio.to_thread(tool.run, **args)
+            spec.duration_ms = (time.perf_counter() - started) * 1000
+            return result
+
+        spec = _Speculation(asyncio.ensure_future(_run()))
+        return spec
+
+    def _evict_oldest(self) -> None:
+        oldest_key = next(iter(self._cache))
+        spec = self._cache.pop(oldest_key)
+        spec.task.cancel()
+
+    async def take(self, name: str, args: dict[str, Any]) -> Optional[Any]:
+        """Return the speculated result for a matching call, or None on a miss"""
+        tool = self.tools.get(name)
+        if tool is None:
+            return None
+
+        spec = self._cache.pop((name, tool.key(args)), None)
+        if spec is None or spec.task.cancelled():
+            self._record(hit=False)
+            return None
+
+        waited = time.perf_counter()
+        try:
+            result = await spec.task
+        except Exception as e:
+            logger.debug(f"Speculative {name} failed, falling back: {e}")
+            self._record(hit=False)
+            return None
+
+        if result is None:
+            # Nothing to reuse: the caller computes the result itself
+            self._record(hit=False)
+            return None
+
+        waited_ms = (time.perf_counter() - waited) * 1000
+        self._record(hit=True, saved_ms=max(spec.duration_ms - waited_ms, 0.0))
+        return result
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop cached results, e.g. after a write changes what a read would return"""
+        for cache_key in list(self._cache):
+            if name is None or cache_key[0] == name:
+                self._cache.pop(cache_key).task.cancel()
+
+    def _record(self, hit: bool, saved_ms: float = 0.0) -> None:
+        field = "hits" if hit else "misses"
+        self._turn[field] += 1
+        self._turn["saved_ms"] += saved_ms
+        self._total[field] += 1
+        self._total["saved_ms"] += saved_ms
+
+    def end_turn(self) -> dict[str, float]:
+        """Close the current user turn and return its speculation stats"""
+        stats = dict(self._turn)
+        calls = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / calls if calls else 0.0
+        if self._turn_open:
+            self._total["turns"] += 1
+        self._turn = {"hits": 0, "misses": 0, "saved_ms": 0.0}
+        self._turn_open = False
+        self.invalidate()
+        return stats
+
+    def get_summary(self) -> dict[str, float]:
+        """Session-wide hit rate and saved milliseconds"""
+        summary = dict(self._total)
+        calls = summary["hits"] + summary["misses"]
+        summary["hit_rate"] = summary["hits"] / calls if calls else 0.0
+        summary["saved_ms_per_turn"] = (
+            summary["saved_ms"] / summary["turns"] if summary["turns"] else 0.0
+        )
+        return summary
@@ -0,0 +1,357 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import deque
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("tracing")
+
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "0") == "1"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+TRACE_FILE = os.getenv(
+    "TRACE_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "output", "traces.jsonl"),
+)
+TRACE_BATCH_SIZE = 256
+TRACE_FLUSH_SECONDS = 1.0
+TRACE_MAX_QUEUE = 10_000
+
+# Fields holding what callers say about themselves, or their words verbatim
+# (tool args the LLM fills from speech); their values are never exported
+PII_FIELDS = frozenset(
+    {
+        "value",
+        "name",
+        "email",
+        "phone",
+        "address",
+        "company",
+        "role",
+        "mood",
+        "energy",
+        "stressors",
+        "goals",
+        "completed_goals",
+        "summary",
+        "transcript",
+        "user_input",
+        "question",
+        "search_term",
+        "product_reference",
+        "text",
+        "conversation_log",
+    }
+)
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"\+?\d[\d ().-]{7,}\d")
+
+# Job-wide fields (ctx.log_context_fields) and the span currently open in this task
+_job_fields: contextvars.ContextVar[Mapping[str, Any]] = contextvars.ContextVar(
+    "trace_job_fields", default=MappingProxyType({})
+)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "trace_current_span", default=None
+)
+
+
+def redact(key: str, value: Any) -> Any:
+    """Value safe to export: PII fields are dropped, emails and phone numbers masked"""
+    if key in PII_FIELDS and value not in (None, "", [], {}):
+        return "[redacted]"
+    if isinstance(value, str):
+        return PHONE.sub("[phone]", EMAIL.sub("[email]", value))
+    if isinstance(value, dict):
+        return {k: redact(k, v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(key, v) for v in value]
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return redact(key, str(value))
+
+
+def _evaluate(fields: dict[str, Any]) -> dict[str, Any]:
+    """Resolve lazy (callable) fields and redact everything"""
+    return {
+        key: redact(key, value() if callable(value) else value)
+        for key, value in fields.items()
+    }
+
+
+class Span:
+    """One timed operation; use as a context manager from Tracer.span()
+
+    Fields may be plain values or zero-argument callables, which are only
+    called if the span is exported.
+    """
+
+    __slots__ = (
+        "_token",
+        "_wall",
+        "fields",
+        "name",
+        "parent",
+        "recording",
+        "started",
+        "tracer",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        fields: dict[str, Any],
+        recording: bool,
+        parent: Optional["Span"],
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+        self.recording = recording
+        self.parent = parent
+
+    def set(self, **fields: Any) -> None:
+        self.fields.update(fields)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self._wall = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration_ms = (time.perf_counter() - self.started) * 1000
+        _current_span.reset(self._token)
+        if not self.recording:
+            return
+        record = {
+            "ts": round(self._wall, 6),
+            "type": "span",
+            "name": self.name,
+            "duration_ms": round(duration_ms, 3),
+            "status": "error" if exc_type else "ok",
+            **_job_fields.get(),
+        }
+        if exc_type:
+            record["error"] = exc_type.__name__
+        if self.parent is not None:
+            record["parent"] = self.parent.name
+        record["fields"] = _evaluate(self.fields)
+        self.tracer._emit(record)
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled, so callers need no checks"""
+
+    __slots__ = ()
+
+    def set(self, **fields: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Structured spans and events exported to a local JSONL file
+
+    Disabled tracing costs one attribute check per call. When enabled,
+    each root span (or event outside a span) is kept with probability
+    ``sample_rate`` and everything inside a kept span is kept with it.
+    Records are redacted, queued in memory and written in batches by a
+    background task, so tools never wait on the file; if the queue fills
+    up, new records are dropped and counted.
+
+    Args:
+        enabled: Whether anything is recorded
+        sample_rate: Fraction of root spans recorded, 0.0 to 1.0
+        path: JSONL file records are appended to
+        batch_size: Queued records that trigger an early flush
+        flush_interval: Seconds between flushes otherwise
+        max_queue: Most records held in memory before dropping
+    """
+
+    def __init__(
+        self,
+        enabled: bool = TRACE_ENABLED,
+        sample_rate: float = TRACE_SAMPLE_RATE,
+        path: str = TRACE_FILE,
+        batch_size: int = TRACE_BATCH_SIZE,
+        flush_interval: float = TRACE_FLUSH_SECONDS,
+        max_queue: int = TRACE_MAX_QUEUE,
+    ) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: deque = deque()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.exported = 0
+        self.dropped = 0
+
+    def _sampled(self, parent: Optional[Span]) -> bool:
+        if parent is not None:
+            return parent.recording
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def span(self, name: str, **fields: Any):
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        return Span(self, name, fields, self._sampled(parent), parent)
+
+    def event(self, name: str, **fields: Any) -> None:
+        """Record a point-in-time event, inside the current span if there is one"""
+        if not self.enabled:
+            return
+        parent = _current_span.get()
+        if not self._sampled(parent):
+            return
+        record = {
+            "ts": round(time.time(), 6),
+            "type": "event",
+            "name": name,
+            **_job_fields.get(),
+        }
+        if parent is not None:
+            record["parent"] = parent.name
+        record["fields"] = _evaluate(fields)
+        self._emit(record)
+
+    def _emit(self, record: dict[str, Any]) -> None:
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append(record)
+        self.recorded += 1
+        if len(self._queue) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+    def start(self) -> None:
+        """Start the background exporter on the running event loop"""
+        if self.enabled and self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._export_loop())
+
+    async def _export_loop(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            self._wake.clear()
+            await self.flush()
+
+    def _write(self, batch) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        data = "".join(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in batch
+        )
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+
+    async def flush(self) -> None:
+        """Write everything queued so far"""
+        if not self._queue:
+            return
+        batch = [self._queue.popleft() for _ in range(len(self._queue))]
+        try:
+            await asyncio.to_thread(self._write, batch)
+            self.exported += len(batch)
+        except OSError as e:
+            self.dropped += len(batch)
+            logger.warning(f"Could not export {len(batch)} trace records: {e}")
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "recorded": self.recorded,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "queued": len(self._queue),
+        }
+
+
+TRACER = Tracer()
+
+
+def _is_simple(value: Any) -> bool:
+    return value is None or isinstance(value, (str, bool, int, float))
+
+
+def trace_tool(fn: Callable) -> Callable:
+    """Wrap a tool coroutine in a span named tool.<name>
+
+    Place it under ``@function_tool``; the signature and docstring the LLM
+    sees are unchanged. Simple-valued arguments are recorded (redacted),
+    the agent and RunContext are not.
+    """
+    name = f"tool.{fn.__name__}"
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if not TRACER.enabled:
+            return await fn(*args, **kwargs)
+
+        def arguments() -> dict[str, Any]:
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            return {
+                key: value
+                for key, value in bound.items()
+                if key != "self" and _is_simple(value)
+            }
+
+        with TRACER.span(name, args=arguments):
+            return await fn(*args, **kwargs)
+
+    return wrapper
+
+
+def start_tracing(ctx, session=None) -> None:
+    """Tag this job's records with ctx.log_context_fields and export until shutdown
+
+    Call in the entrypoint once ``ctx.log_context_fields`` is set and
+    before ``session.start()``, so tool calls inherit the job's fields.
+    With a session, agent and user state changes are recorded as events.
+    """
+    _job_fields.set(ctx.log_context_fields)
+    if not TRACER.enabled:
+        return
+    TRACER.start()
+    ctx.add_shutdown_callback(TRACER.aclose)
+
+    if session is not None:
+
+        @session.on("agent_state_changed")
+        def _on_agent_state(ev) -> None:
+            TRACER.event("agent.state", old=ev.old_state, new=ev.new_state)
+
+        @session.on("user_state_changed")
+        def _on_user_state(ev) -> None:
+            TRACER.event("user.state", old=ev.old_state, new=ev.new_state)
@@ -1,23 +1,33 @@
+import asyncio
 import logging
 from dotenv import load_dotenv
-from wellness_storage import save_wellness_entry, load_wellness_log
+from wellness_storage import save_wellness_entry, get_wellness_trends
+from wellness_analytics import describe_trends
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
     JobProcess,
     MetricsCollectedEvent,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     metrics,
-    tokenize,
     function_tool,
     RunContext
 )
 import json
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+from customer_profiles import PROFILES, profile_context, start_profile_load
+from load_governor import GOVERNOR, current_load
+from connection_pool import POOL
+from tracing import TRACER, start_tracing, trace_tool
+from room_profiler import start_room_profiler
+from session_factory import (
+    create_session,
+    import_plugins,
+    load_vad,
+    register_worker_plugins,
+    room_input_options,
+    warm_session,
+)
 
 logger = logging.getLogger("wellness_agent")
 load_dotenv(".env.local")
@@ -36,6 +46,9 @@ class WellnessCompanion(Agent):
             - energy: when user mentions energy level
             - stressors: when user mentions stress or concerns
             - goals: when user mentions wellness goals
+            - completed_goals: when user says they achieved a goal from a previous check-in
+
+            When the user asks how they've been doing lately or over the week or month, call review_trends.
             
             Ask one question at a time. Be warm, supportive, and conversational.
             Reference previous sessions when available.""",
@@ -45,21 +58,33 @@ class WellnessCompanion(Agent):
             "energy": "",
             "stressors": "",
             "goals": [],
+            "completed_goals": [],
             "summary": ""
         }
         self.room = None
+        self.customer_id = None  # Signed-in customer id, once known
+
+    async def attach_profile(self, customer_id: str, profile: dict):
+        """Give the LLM the caller's recent check-ins to reference"""
+        self.customer_id = customer_id
+        context = profile_context(profile)
+        if context:
+            await self.update_instructions(self.instructions + context)
 
     @function_tool
+    @trace_tool
     async def update_wellness(self, context: RunContext, field: str, value: str):
         """Update wellness check-in information"""
-        if field == "goals":
-            if value not in self.wellness_state["goals"]:
-                self.wellness_state["goals"].append(value)
+        if field in ("goals", "completed_goals"):
+            if value not in self.wellness_state[field]:
+                self.wellness_state[field].append(value)
         else:
             self.wellness_state[field] = value
         
         self.room = context.room
-        logger.info(f"Updated wellness: {self.wellness_state}")
+        logger.debug("Updated wellness field %s", field)
+        TRACER.event("wellness.updated", field=field,
+                     filled=lambda: [k for k, v in self.wellness_state.items() if v])
         
         # Check if complete
         if all([
@@ -74,7 +99,10 @@ class WellnessCompanion(Agent):
             self.wellness_state["summary"] = summary
             
             # Save entry
-            save_wellness_entry(self.wellness_state.copy())
+            entry = self.wellness_state.copy()
+            save_wellness_entry(entry)
+            if self.customer_id:
+                await PROFILES.record_wellness(self.customer_id, entry)
             
             # Reset for next session
             self.wellness_state = {
@@ -82,6 +110,7 @@ class WellnessCompanion(Agent):
                 "energy": "",
                 "stressors": "",
                 "goals": [],
+                "completed_goals": [],
                 "summary": ""
             }
             
@@ -99,25 +128,30 @@ class WellnessCompanion(Agent):
         
         return "Anything else you'd like to add?"
 
+    @function_tool
+    @trace_tool
+    async def review_trends(self, context: RunContext):
+        """Summarize mood and energy averages, check-in streak and goal progress over the past week and month"""
+        trends = await asyncio.to_thread(get_wellness_trends)
+        return describe_trends(trends.summary())
+
 def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["vad"] = load_vad()
+    import_plugins("wellness")
 
 async def entrypoint(ctx: JobContext):
     ctx.log_context_fields = {"room": ctx.room.name}
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-matthew", 
-            style="Conversation",
-            tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
-            text_pacing=True
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
-        preemptive_generation=True,
-    )
+    # Pick cheaper pipeline settings when the node is under load
+    profile = await asyncio.to_thread(GOVERNOR.select_profile)
+    frame_monitor = GOVERNOR.monitor_room(ctx.room.name, ctx.job.id)
+    ctx.add_shutdown_callback(frame_monitor.stop)
+
+    agent = WellnessCompanion()
+    session = create_session("wellness", ctx.proc.userdata["vad"], profile)
+    warmup = asyncio.create_task(warm_session("wellness", session))
+    start_tracing(ctx, session)
+    start_room_profiler(ctx, agent)
 
     usage_collector = metrics.UsageCollector()
 
@@ -129,18 +163,23 @@ async def entrypoint(ctx: JobContext):
     async def log_usage():
         summary = usage_collector.get_summary()
         logger.info(f"Usage: {summary}")
+        logger.info(f"Connection pool: {POOL.get_stats()}")
+        logger.info(f"Profiles: {PROFILES.get_stats()}")
 
     ctx.add_shutdown_callback(log_usage)
+    ctx.add_shutdown_callback(POOL.aclose)
 
     await session.start(
-        agent=WellnessCompanion(),
+        agent=agent,
         room=ctx.room,
-        room_input_options=RoomInputOptions(
-            noise_cancellation=noise_cancellation.BVC(),
-        ),
+        room_input_options=room_input_options("wellness", profile),
     )
 
+    # Load the caller's profile in parallel with joining the room
+    start_profile_load(ctx, agent)
     await ctx.connect()
+    await warmup
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file
+    register_worker_plugins("wellness")
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm, load_fnc=current_load))
\ No newline at end of file
@@ -0,0 +1,390 @@
+import re
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, datetime
+from itertools import chain
+from typing import Any, Optional
+
+import numpy as np
+
+# Check-ins are bucketed by day; rolling means cover the last 7 and 30 days
+WINDOWS = (7, 30)
+MAX_WINDOW = max(WINDOWS)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Free-text answers map onto a 1-5 scale (1 = worst, 5 = best). Longer
+# phrases are checked first so "not good" wins over "good".
+MOOD_WORDS = [
+    ("not good", 2),
+    ("not great", 2),
+    ("not bad", 3),
+    ("not okay", 2),
+    ("great", 5),
+    ("amazing", 5),
+    ("excellent", 5),
+    ("fantastic", 5),
+    ("happy", 5),
+    ("wonderful", 5),
+    ("good", 4),
+    ("fine", 4),
+    ("calm", 4),
+    ("relaxed", 4),
+    ("content", 4),
+    ("positive", 4),
+    ("okay", 3),
+    ("ok", 3),
+    ("alright", 3),
+    ("neutral", 3),
+    ("so-so", 3),
+    ("meh", 3),
+    ("tired", 2),
+    ("stressed", 2),
+    ("anxious", 2),
+    ("low", 2),
+    ("down", 2),
+    ("worried", 2),
+    ("frustrated", 2),
+    ("sad", 1),
+    ("awful", 1),
+    ("terrible", 1),
+    ("miserable", 1),
+    ("depressed", 1),
+    ("exhausted", 1),
+]
+ENERGY_WORDS = [
+    ("very low", 1),
+    ("really low", 1),
+    ("very high", 5),
+    ("really high", 5),
+    ("bit low", 2),
+    ("little low", 2),
+    ("energetic", 5),
+    ("high", 5),
+    ("great", 5),
+    ("full", 5),
+    ("good", 4),
+    ("decent", 4),
+    ("okay", 3),
+    ("ok", 3),
+    ("medium", 3),
+    ("moderate", 3),
+    ("average", 3),
+    ("normal", 3),
+    ("low", 2),
+    ("tired", 2),
+    ("sluggish", 2),
+    ("drained", 1),
+    ("exhausted", 1),
+    ("empty", 1),
+    ("dead", 1),
+]
+# "a bit tired" is closer to neutral than "tired", "very tired" further from it
+SOFTENERS = ("a bit", "a little", "bit of", "slightly", "somewhat", "kind of", "kinda")
+INTENSIFIERS = ("very", "really", "extremely", "super", "so ")
+RATING = re.compile(r"(\d+(?:\.\d+)?)\s*(?:/|out of)\s*(\d+)")
+
+
+def _score(text: Optional[str], words) -> Optional[float]:
+    if not text:
+        return None
+    text = str(text).lower()
+    rating = RATING.search(text)
+    if rating and float(rating.group(2)) > 0:
+        return round(
+            1 + 4 * min(float(rating.group(1)) / float(rating.group(2)), 1.0), 2
+        )
+    padded = f" {re.sub(r'[^a-z/ -]', ' ', text)} "
+    for word, value in words:
+        if f" {word} " in padded:
+            score = float(value)
+            if any(s in padded for s in SOFTENERS):
+                score += (3 - score) / 2
+            elif any(f" {i}" in padded for i in INTENSIFIERS):
+                score += (score - 3) / 2
+            return round(max(1.0, min(5.0, score)), 2)
+    return None
+
+
+def normalize_mood(text: Optional[str]) -> Optional[float]:
+    """1-5 mood score from a free-text answer, or None if it can't be read"""
+    return _score(text, MOOD_WORDS)
+
+
+def normalize_energy(text: Optional[str]) -> Optional[float]:
+    """1-5 energy score from a free-text answer, or None if it can't be read"""
+    return _score(text, ENERGY_WORDS)
+
+
+def add_scores(entry: dict[str, Any]) -> dict[str, Any]:
+    """Store numeric mood/energy on a check-in entry (in place) and return it"""
+    entry["mood_score"] = normalize_mood(entry.get("mood"))
+    entry["energy_score"] = normalize_energy(entry.get("energy"))
+    return entry
+
+
+def entry_day(entry: dict[str, Any]) -> int:
+    """Days since the epoch of a check-in's timestamp (today if it has none)"""
+    timestamp = entry.get("timestamp")
+    day = date.fromisoformat(timestamp[:10]) if timestamp else date.today()
+    return day.toordinal() - EPOCH_ORDINAL
+
+
+def today_day() -> int:
+    return date.today().toordinal() - EPOCH_ORDINAL
+
+
+def _hundredths(score: Optional[float]) -> int:
+    return 0 if score is None else round(score * 100)
+
+
+class WellnessTrends:
+    """Rolling wellness aggregates, updated one check-in at a time
+
+    Keeps per-day mood/energy sums for the last 30 days plus running sums
+    for each window, so ``mean()`` is O(1): moving to a new day only
+    subtracts the days that fall out of the windows (at most 30). Scores
+    have two decimals and are summed as integer hundredths, so the running
+    sums never drift however long they are kept.
+    Check-in streaks and goal counts are updated the same way.
+
+    Entries are expected roughly in time order. A backdated entry still
+    counts toward totals, goals and any window it falls in, but doesn't
+    change the streaks.
+    """
+
+    def __init__(self) -> None:
+        self.entries = 0
+        self.anchor: Optional[int] = None  # Newest day the windows end on
+        self.days: dict[
+            int, list[int]
+        ] = {}  # day -> [mood sum, mood n, energy sum, energy n], sums in hundredths
+        self.windows: dict[int, list[int]] = {w: [0, 0, 0, 0] for w in WINDOWS}
+        self.last_day: Optional[int] = None
+        self.current_streak = 0
+        self.longest_streak = 0
+        self.goals_set = 0
+        self.goals_completed = 0
+        self.goal_counts: Counter = Counter()
+
+    def _advance(self, day: int) -> None:
+        """Move the windows forward so they end on ``day``"""
+        if self.anchor is None:
+            self.anchor = day
+            return
+        if day <= self.anchor:
+            return
+        for w, sums in self.windows.items():
+            # Days anchor-w+1 .. day-w leave the window; at most w of them exist
+            for old in range(self.anchor - w + 1, min(day - w, self.anchor) + 1):
+                bucket = self.days.get(old)
+                if bucket:
+                    for i in range(4):
+                        sums[i] -= bucket[i]
+        self.anchor = day
+        for old in [d for d in self.days if d <= day - MAX_WINDOW]:
+            del self.days[old]
+
+    def add(self, entry: dict[str, Any]) -> None:
+        day = entry_day(entry)
+        mood = entry.get("mood_score")
+        energy = entry.get("energy_score")
+        values = [
+            _hundredths(mood),
+            int(mood is not None),
+            _hundredths(energy),
+            int(energy is not None),
+        ]
+
+        self._advance(day)
+        self.entries += 1
+        if day > self.anchor - MAX_WINDOW:
+            bucket = self.days.setdefault(day, [0, 0, 0, 0])
+            for i in range(4):
+                bucket[i] += values[i]
+            for w, sums in self.windows.items():
+                if day > self.anchor - w:
+                    for i in range(4):
+                        sums[i] += values[i]
+
+        if self.last_day is None or day > self.last_day:
+            self.current_streak = (
+                self.current_streak + 1 if self.last_day == day - 1 else 1
+            )
+            self.longest_streak = max(self.longest_streak, self.current_streak)
+            self.last_day = day
+
+        goals = entry.get("goals") or []
+        self.goals_set += len(goals)
+        self.goal_counts.update(goals)
+        self.goals_completed += len(entry.get("completed_goals") or [])
+
+    def mean(
+        self, field: str, window: int = 7, today: Optional[int] = None
+    ) -> Optional[float]:
+        """Mean mood or energy score over the last ``window`` days (7 or 30)"""
+        self._advance(today if today is not None else today_day())
+        sums = self.windows[window]
+        total, count = (sums[0], sums[1]) if field == "mood" else (sums[2], sums[3])
+        return round(total / count / 100, 2) if count else None
+
+    def streak(self, today: Optional[int] = None) -> int:
+        """Consecutive days with a check-in, still alive if the last one was today or yesterday"""
+        today = today if today is not None else today_day()
+        return (
+            self.current_streak
+            if self.last_day is not None and self.last_day >= today - 1
+            else 0
+        )
+
+    def summary(self, today: Optional[int] = None) -> dict[str, Any]:
+        today = today if today is not None else today_day()
+        return {
+            "entries": self.entries,
+            **{
+                f"{field}_{w}d": self.mean(field, w, today)
+                for field in ("mood", "energy")
+                for w in WINDOWS
+            },
+            "streak": self.streak(today),
+            "longest_streak": self.longest_streak,
+            "goals_set": self.goals_set,
+            "goals_completed": self.goals_completed,
+            "top_goals": [goal for goal, _ in self.goal_counts.most_common(3)],
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "entries": self.entries,
+            "anchor": self.anchor,
+            "days": {str(day): bucket for day, bucket in self.days.items()},
+            "windows": {str(w): sums for w, sums in self.windows.items()},
+            "last_day": self.last_day,
+            "current_streak": self.current_streak,
+            "longest_streak": self.longest_streak,
+            "goals_set": self.goals_set,
+            "goals_completed": self.goals_completed,
+            "goal_counts": dict(self.goal_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "WellnessTrends":
+        trends = cls()
+        trends.entries = data["entries"]
+        trends.anchor = data["anchor"]
+        trends.days = {int(day): bucket for day, bucket in data["days"].items()}
+        trends.windows = {int(w): sums for w, sums in data["windows"].items()}
+        trends.last_day = data["last_day"]
+        trends.current_streak = data["current_streak"]
+        trends.longest_streak = data["longest_streak"]
+        trends.goals_set = data["goals_set"]
+        trends.goals_completed = data["goals_completed"]
+        trends.goal_counts = Counter(data["goal_counts"])
+        return trends
+
+
+def _scores(entries: list[dict[str, Any]], field: str, normalize) -> np.ndarray:
+    """Stored scores, normalizing (once per distinct answer) entries written before scores existed"""
+    cache: dict[Any, Optional[float]] = {}
+
+    def score(entry: dict[str, Any]) -> float:
+        value = entry.get(f"{field}_score")
+        if value is None and f"{field}_score" not in entry:
+            text = entry.get(field)
+            if text not in cache:
+                cache[text] = normalize(text)
+            value = cache[text]
+        return np.nan if value is None else value
+
+    return np.fromiter(
+        (score(e) for e in entries), dtype=np.float64, count=len(entries)
+    )
+
+
+def backfill(entries: Iterable[dict[str, Any]]) -> WellnessTrends:
+    """Build WellnessTrends from existing history in one vectorized pass"""
+    entries = list(entries)
+    trends = WellnessTrends()
+    if not entries:
+        return trends
+
+    stamps = np.array(
+        [(e.get("timestamp") or datetime.now().isoformat())[:10] for e in entries],
+        dtype="datetime64[D]",
+    )
+    days = stamps.astype(np.int64)
+    mood = _scores(entries, "mood", normalize_mood)
+    energy = _scores(entries, "energy", normalize_energy)
+
+    anchor = int(days.max())
+    trends.entries = len(entries)
+    trends.anchor = anchor
+
+    # Per-day sums for the last 30 days
+    recent = days > anchor - MAX_WINDOW
+    offsets = days[recent] - (anchor - MAX_WINDOW + 1)
+    columns = []
+    for values in (mood[recent], energy[recent]):
+        present = ~np.isnan(values)
+        columns.append(
+            np.bincount(
+                offsets,
+                weights=np.where(present, np.rint(values * 100), 0.0),
+                minlength=MAX_WINDOW,
+            )
+        )
+        columns.append(
+            np.bincount(
+                offsets, weights=present.astype(np.float64), minlength=MAX_WINDOW
+            )
+        )
+    # Integer-valued sums are exact in float64 well beyond any realistic log size
+    per_day = np.rint(np.stack(columns, axis=1)).astype(np.int64)
+    for offset in np.flatnonzero(np.bincount(offsets, minlength=MAX_WINDOW)):
+        row = per_day[offset]
+        trends.days[anchor - MAX_WINDOW + 1 + int(offset)] = [
+            int(value) for value in row
+        ]
+    for w in WINDOWS:
+        sums = per_day[MAX_WINDOW - w :].sum(axis=0)
+        trends.windows[w] = [int(value) for value in sums]
+
+    # Streaks are runs of consecutive check-in days
+    unique_days = np.unique(days)
+    breaks = np.flatnonzero(np.diff(unique_days) != 1)
+    run_ends = np.append(breaks, len(unique_days) - 1)
+    run_lengths = np.diff(np.concatenate(([-1], run_ends)))
+    trends.longest_streak = int(run_lengths.max())
+    trends.current_streak = int(run_lengths[-1])
+    trends.last_day = int(unique_days[-1])
+
+    goals = [e.get("goals") or [] for e in entries]
+    trends.goals_set = sum(map(len, goals))
+    trends.goal_counts = Counter(chain.from_iterable(goals))
+    trends.goals_completed = sum(len(e.get("completed_goals") or []) for e in entries)
+    return trends
+
+
+def describe_trends(summary: dict[str, Any]) -> str:
+    """Spoken summary of WellnessTrends.summary()"""
+    if not summary["entries"]:
+        return "We haven't done any check-ins yet, so there's no trend to look at. Shall we start one?"
+
+    parts = []
+    for field in ("mood", "energy"):
+        week, month = summary[f"{field}_7d"], summary[f"{field}_30d"]
+        if week is not None:
+            text = f"your {field} has averaged {week} out of 5 this week"
+            if month is not None and abs(week - month) >= 0.3:
+                text += (
+                    f", {'up' if week > month else 'down'} from {month} over the month"
+                )
+            parts.append(text)
+    if summary["streak"] > 1:
+        parts.append(f"you've checked in {summary['streak']} days in a row")
+    if summary["goals_set"]:
+        parts.append(
+            f"you've completed {summary['goals_completed']} of {summary['goals_set']} goals you set"
+        )
+    if not parts:
+        return "I don't have enough recent check-ins to see a trend yet."
+    return "Looking at your check-ins, " + "; ".join(parts) + "."
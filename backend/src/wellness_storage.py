@@ -1,7 +1,18 @@
+import contextlib
 import json
+import logging
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, Optional
+
+from wellness_analytics import WellnessTrends, add_scores, backfill
+
+logger = logging.getLogger("wellness_storage")
+
+# Rolling aggregates over the log, kept in step with it by save_wellness_entry,
+# and the log's (size, mtime) when they last matched it
+_trends: Optional[WellnessTrends] = None
+_trends_stamp: Optional[list[int]] = None
 
 
 def _ensure_data_directory():
@@ -17,7 +28,78 @@ def _get_wellness_file_path():
     return os.path.join(data_dir, "wellness_log.json")
 
 
-def load_wellness_log() -> List[Dict[str, Any]]:
+def _get_trends_file_path():
+    """Get the full path to the wellness_trends.json aggregate snapshot"""
+    return os.path.join(_ensure_data_directory(), "wellness_trends.json")
+
+
+def _log_stamp() -> Optional[list[int]]:
+    """Size and modification time of the log, or None if there is no log yet"""
+    try:
+        stat = os.stat(_get_wellness_file_path())
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _save_trends(trends: WellnessTrends, stamp: Optional[list[int]]) -> None:
+    filepath = _get_trends_file_path()
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"log": stamp, "trends": trends.to_dict()}, f)
+    os.replace(tmp_path, filepath)
+
+
+def _load_trends() -> tuple[Optional[WellnessTrends], Optional[list[int]]]:
+    try:
+        with open(_get_trends_file_path(), encoding="utf-8") as f:
+            snapshot = json.load(f)
+        return WellnessTrends.from_dict(snapshot["trends"]), snapshot["log"]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        return None, None
+
+
+def get_wellness_trends(
+    entries: Optional[list[dict[str, Any]]] = None,
+) -> WellnessTrends:
+    """Rolling wellness aggregates for the log
+
+    Staleness is decided from the log's size and mtime, so a query never
+    reads the log while the in-memory aggregates or the snapshot on disk
+    still match it. When the log has grown since (e.g. another process
+    saved a check-in) only the appended entries are added; the NumPy
+    backfill runs only without usable aggregates or if the log shrank.
+
+    Args:
+        entries: The log, if the caller has already loaded it
+    """
+    global _trends, _trends_stamp
+    stamp = _log_stamp()
+    if _trends is not None and _trends_stamp == stamp:
+        return _trends
+
+    snapshot, snapshot_stamp = _load_trends()
+    if snapshot is not None and (
+        _trends is None or snapshot.entries >= _trends.entries
+    ):
+        _trends, _trends_stamp = snapshot, snapshot_stamp
+        if _trends_stamp == stamp:
+            return _trends
+
+    if entries is None:
+        entries = load_wellness_log()
+    if _trends is None or _trends.entries > len(entries):
+        _trends = backfill(entries)
+    else:
+        for entry in entries[_trends.entries :]:
+            _trends.add(add_scores(entry))
+    _trends_stamp = stamp
+    with contextlib.suppress(OSError):
+        _save_trends(_trends, stamp)
+    return _trends
+
+
+def load_wellness_log() -> list[dict[str, Any]]:
     """Load wellness log entries from JSON file"""
     try:
         filepath = _get_wellness_file_path()
@@ -32,8 +114,13 @@ def load_wellness_log() -> List[Dict[str, Any]]:
         return []
 
 
-def save_wellness_entry(entry: Dict[str, Any]) -> bool:
-    """Save a wellness entry to the log"""
+def save_wellness_entry(entry: dict[str, Any]) -> bool:
+    """Save a wellness entry to the log
+
+    Returns True once the entry is in the log, even if updating the trend
+    aggregates then fails; they are rebuilt on the next trend query.
+    """
+    global _trends, _trends_stamp
     try:
         # Validate entry structure
         required_fields = ["mood", "energy", "stressors", "goals", "summary"]
@@ -44,6 +131,9 @@ def save_wellness_entry(entry: Dict[str, Any]) -> bool:
         if "timestamp" not in entry:
             entry["timestamp"] = datetime.now().isoformat()
         
+        # Numeric mood/energy scores for trend analytics
+        add_scores(entry)
+
         # Load existing entries
         entries = load_wellness_log()
         
@@ -54,7 +144,13 @@ def save_wellness_entry(entry: Dict[str, Any]) -> bool:
         filepath = _get_wellness_file_path()
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(entries, f, indent=2, ensure_ascii=False)
-        
-        return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+    # The log has grown by one entry, so this only adds it to the aggregates
+    try:
+        get_wellness_trends(entries)
+    except Exception:
+        logger.exception("Failed to update wellness trends")
+        _trends = _trends_stamp = None
+    return True
\ No newline at end of file
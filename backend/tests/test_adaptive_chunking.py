@@ -0,0 +1,64 @@
+from adaptive_chunking import AdaptiveSentenceTokenizer
+
+LISTING = (
+    "Here are the products I found:\n"
+    "1. Stoneware Coffee Mug - ₹800 (black ).\n"
+    "2. Blue Ceramic Mug - ₹650 (blue ).\n"
+    "3. Classic Cotton T-Shirt - ₹1,299 (white M).\n\n"
+    "Would you like more details about any of these, or shall I help you place an order?"
+)
+
+
+def test_first_chunk_is_the_list_header() -> None:
+    chunks = AdaptiveSentenceTokenizer().tokenize(LISTING)
+    assert chunks[0] == "Here are the products I found:"
+    # List numbers, prices and abbreviations never end a chunk
+    assert all(not chunk.endswith(("1.", "2.", "3.", "₹1,")) for chunk in chunks)
+    assert " ".join(chunks).split() == LISTING.split()
+
+
+def test_chunks_grow_after_the_first() -> None:
+    text = " ".join(
+        f"This is sentence number {i} of a fairly long recap." for i in range(20)
+    )
+    chunks = AdaptiveSentenceTokenizer(next_len=60, growth=2.0, max_len=300).tokenize(
+        text
+    )
+    lengths = [len(chunk) for chunk in chunks]
+    assert lengths[0] < lengths[1] < max(lengths)
+    assert max(lengths) <= 300
+
+
+def test_long_sentence_does_not_hold_back_the_one_before() -> None:
+    recap = (
+        "Thank you so much for your time today! Just to recap: I spoke with Asha "
+        "from Acme Corp, who is the Head of Growth. You're looking at Razorpay for "
+        "recurring subscription billing, with a timeline of next quarter. Our team "
+        "will follow up by email at asha@acme.com with pricing details and a short "
+        "onboarding plan. Have a wonderful day!"
+    )
+    chunks = AdaptiveSentenceTokenizer().tokenize(recap)
+    # Adding the next sentence would take the third chunk past its
+    # 120-character target, so that sentence starts the fourth
+    assert chunks[2] == (
+        "You're looking at Razorpay for recurring subscription billing, "
+        "with a timeline of next quarter."
+    )
+
+
+async def test_stream_matches_tokenize_and_resets_per_segment() -> None:
+    tokenizer = AdaptiveSentenceTokenizer()
+    stream = tokenizer.stream()
+    for i in range(0, len(LISTING), 5):
+        stream.push_text(LISTING[i : i + 5])
+    stream.flush()
+    stream.push_text("Sure, your order is placed. It ships tomorrow.")
+    stream.end_input()
+
+    events = [ev async for ev in stream]
+    first_segment = [ev.token for ev in events if ev.segment_id == events[0].segment_id]
+    second_segment = [
+        ev.token for ev in events if ev.segment_id != events[0].segment_id
+    ]
+    assert first_segment == tokenizer.tokenize(LISTING)
+    assert second_segment[0] == "Sure, your order is placed."
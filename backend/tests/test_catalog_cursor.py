@@ -0,0 +1,68 @@
+from catalog_cursor import ResultCursor, ordinal_position
+
+
+class Counting:
+    """Iterator over n fake products that records how many were pulled"""
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.pulled = 0
+
+    def __iter__(self):
+        for i in range(self.n):
+            self.pulled += 1
+            yield {"id": f"p-{i}", "name": f"Product {i}", "color": "blue"}
+
+
+def test_pages_are_fetched_on_demand() -> None:
+    results = Counting(1000)
+    cursor = ResultCursor(results, page_size=5)
+
+    assert [p["id"] for p in cursor.next_page()] == [f"p-{i}" for i in range(5)]
+    assert results.pulled == 5
+    assert next(p["id"] for p in cursor.next_page()) == "p-5"
+    assert results.pulled == 10
+    assert cursor.position == 10
+
+
+def test_item_reaches_past_the_current_page() -> None:
+    results = Counting(20)
+    cursor = ResultCursor(results, page_size=5)
+    cursor.next_page()
+
+    assert cursor.item(7)["id"] == "p-6"
+    assert results.pulled == 7
+    assert cursor.item(3)["id"] == "p-2"
+    assert cursor.item(25) is None
+    # The next page still starts after what was shown, not after what was fetched
+    assert cursor.next_page()[0]["id"] == "p-5"
+
+
+def test_last_page_and_has_more() -> None:
+    cursor = ResultCursor(Counting(7), page_size=5)
+    cursor.next_page()
+    assert cursor.has_more()
+    assert len(cursor.next_page()) == 2
+    assert not cursor.has_more()
+    assert cursor.next_page() == []
+
+
+def test_cursor_expires_after_ttl() -> None:
+    now = [0.0]
+    cursor = ResultCursor(Counting(10), ttl=60, clock=lambda: now[0])
+    now[0] = 50
+    cursor.next_page()
+    now[0] = 100
+    assert not cursor.expired()
+    now[0] = 111
+    assert cursor.expired()
+
+
+def test_ordinal_position() -> None:
+    assert ordinal_position("the seventh one") == 7
+    assert ordinal_position("number 12") == 12
+    assert ordinal_position("the 3rd mug") == 3
+    assert ordinal_position("item two") == 2
+    assert ordinal_position("7") == 7
+    assert ordinal_position("the blue mug") is None
+    assert ordinal_position("mug-001") is None
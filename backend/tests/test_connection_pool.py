@@ -0,0 +1,95 @@
+import asyncio
+import threading
+
+from aiohttp import web
+
+from connection_pool import ProviderConnectionPool, origin
+
+
+async def _start_server():
+    async def root(request):
+        return web.Response(text="ok")
+
+    async def stream(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            await ws.send_bytes(b"audio:" + msg.data.encode())
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", root)
+    app.router.add_get("/v1/stream", stream)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_origin_maps_websocket_schemes() -> None:
+    assert origin("wss://api.example.com/v1/listen?x=1") == "https://api.example.com"
+    assert origin("http://127.0.0.1:8080/path") == "http://127.0.0.1:8080"
+
+
+async def test_warmed_connection_is_reused_by_websocket() -> None:
+    runner, base_url = await _start_server()
+    pool = ProviderConnectionPool()
+    try:
+        await pool.warm([base_url + "/v1/stream"])
+        assert pool.get_stats()["new_connections"] == 1
+
+        ws = await pool.http_session().ws_connect(
+            base_url.replace("http", "ws", 1) + "/v1/stream"
+        )
+        await ws.send_str("hi")
+        assert (await ws.receive()).data == b"audio:hi"
+        await ws.close()
+
+        stats = pool.get_stats()
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 1
+        assert stats["warmed_hosts"] == 1
+    finally:
+        await pool.aclose()
+        await runner.cleanup()
+
+
+async def test_unreachable_host_does_not_fail_warmup() -> None:
+    pool = ProviderConnectionPool()
+    try:
+        await pool.warm(["http://127.0.0.1:1"])
+        assert pool.get_stats()["warmed_hosts"] == 0
+    finally:
+        await pool.aclose()
+
+
+def test_jobs_on_other_loops_keep_their_own_session() -> None:
+    # Thread executor: each job runs its own loop in a thread of one process
+    pool = ProviderConnectionPool()
+    sessions = {}
+    long_started, short_finished = threading.Event(), threading.Event()
+
+    async def long_job() -> None:
+        sessions["long"] = pool.http_session()
+        long_started.set()
+        await asyncio.to_thread(short_finished.wait)
+        sessions["long_open_after_short"] = not pool.http_session().closed
+        assert pool.http_session() is sessions["long"]
+        await pool.aclose()
+
+    async def short_job() -> None:
+        sessions["short"] = pool.http_session()
+        await pool.aclose()
+
+    long_thread = threading.Thread(target=asyncio.run, args=(long_job(),))
+    long_thread.start()
+    long_started.wait()
+    asyncio.run(short_job())
+    short_finished.set()
+    long_thread.join()
+
+    assert sessions["short"] is not sessions["long"]
+    assert sessions["short"].closed and sessions["long_open_after_short"]
+    assert sessions["long"].closed
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+from customer_profiles import ProfileStore, customer_key, profile_context
+
+ORDER = {
+    "id": "a1b2c3d4",
+    "items": [{"product_name": "Blue Ceramic Mug", "quantity": 2, "total_price": 1300}],
+    "total": 1300,
+    "currency": "INR",
+    "status": "CONFIRMED",
+    "created_at": "2025-12-03T10:15:00",
+}
+
+
+async def test_updates_write_through_to_disk(tmp_path) -> None:
+    store = ProfileStore(str(tmp_path))
+    await store.record_order("caller-1", ORDER)
+    await store.record_lead_fields(
+        "caller-1", {"name": "Asha", "company": "Acme", "bogus": "x"}
+    )
+
+    # A fresh store (e.g. the next job process) sees the same profile
+    profile = await ProfileStore(str(tmp_path)).get("caller-1")
+    assert profile["orders"][0]["items"] == ["2x Blue Ceramic Mug"]
+    assert profile["lead"] == {"name": "Asha", "company": "Acme"}
+    assert "caller-1" not in "".join(p.name for p in tmp_path.iterdir())
+
+
+async def test_lru_is_bounded_and_counts_hits(tmp_path) -> None:
+    store = ProfileStore(str(tmp_path), capacity=2)
+    for identity in ["a", "b", "a", "c", "a", "b"]:
+        await store.get(identity)
+
+    stats = store.get_stats()
+    assert stats["cached"] == 2
+    # a, b, c and the evicted b miss; both repeat lookups of a hit
+    assert (stats["hits"], stats["misses"]) == (2, 4)
+
+
+async def test_history_is_capped(tmp_path) -> None:
+    store = ProfileStore(str(tmp_path))
+    for i in range(8):
+        await store.record_wellness(
+            "caller-2",
+            {
+                "mood": "ok",
+                "energy": "high",
+                "goals": [],
+                "summary": f"day {i}",
+                "timestamp": f"2025-12-0{i + 1}T08:00:00",
+            },
+        )
+    profile = await store.get("caller-2")
+    assert [e["summary"] for e in profile["wellness"]] == [
+        f"day {i}" for i in range(3, 8)
+    ]
+    assert "day 7" in profile_context(profile)
+
+
+def test_new_customer_has_no_context() -> None:
+    assert profile_context({"orders": [], "wellness": [], "lead": {}}) == ""
+
+
+def participant(identity, attributes=None, metadata="", can_update_metadata=False):
+    return SimpleNamespace(
+        identity=identity,
+        attributes=attributes or {},
+        metadata=metadata,
+        permissions=SimpleNamespace(can_update_metadata=can_update_metadata),
+    )
+
+
+def test_random_frontend_identities_get_no_profile() -> None:
+    assert customer_key(participant("voice_assistant_user_4242")) is None
+
+
+def test_customer_key_comes_from_the_token() -> None:
+    assert customer_key(participant("u1", {"customer_id": "acct-7"})) == "acct-7"
+    assert customer_key(participant("u2", metadata='{"customer_id": 7}')) == "7"
+    assert customer_key(participant("u3", metadata="not json")) is None
+    # A participant who may rewrite their own metadata could claim any account
+    assert (
+        customer_key(
+            participant("u4", {"customer_id": "acct-7"}, can_update_metadata=True)
+        )
+        is None
+    )
@@ -0,0 +1,104 @@
+import inspect
+import threading
+
+import numpy as np
+from livekit.agents.inference_runner import _InferenceRunner
+from livekit.plugins.turn_detector import base, multilingual
+
+from inference_batching import BatchedMultilingualRunner, MicroBatcher
+
+
+class CausalSession:
+    """Fake ONNX session scoring every position from the tokens up to it"""
+
+    def __init__(self, last_only: bool = False) -> None:
+        self.last_only = last_only
+        self.calls = 0
+
+    def run(self, _outputs, feeds):
+        self.calls += 1
+        scores = (np.cumsum(feeds["input_ids"], axis=1) % 97) / 100
+        return [scores[:, -1:] if self.last_only else scores]
+
+
+def _runner(session: CausalSession) -> BatchedMultilingualRunner:
+    runner = BatchedMultilingualRunner()
+    runner._session = session
+    runner._per_position = None
+    runner._batching = True
+    return runner
+
+
+def test_micro_batcher_groups_concurrent_submissions() -> None:
+    batch_sizes = []
+
+    def run_batch(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(run_batch, max_batch=8, max_wait=0.05)
+    results = {}
+
+    def submit(i):
+        results[i] = batcher.submit(i)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {i: i * 2 for i in range(8)}
+    assert batcher.stats()["items"] == 8
+    assert max(batch_sizes) > 1
+
+
+def test_padded_batch_matches_single_inference() -> None:
+    batch = [
+        np.array([5, 9, 2], dtype=np.int64),
+        np.array([7], dtype=np.int64),
+        np.array([1, 1, 1, 1, 3], dtype=np.int64),
+    ]
+    single = _runner(CausalSession())
+    expected = [single._run_single(ids) for ids in batch]
+
+    session = CausalSession()
+    runner = _runner(session)
+    assert runner._run_batch(batch) == expected
+    assert session.calls == 1
+
+
+def test_last_position_models_batch_only_equal_lengths() -> None:
+    batch = [
+        np.array([5, 9], dtype=np.int64),
+        np.array([7, 1], dtype=np.int64),
+        np.array([4], dtype=np.int64),
+    ]
+    expected = [
+        _runner(CausalSession(last_only=True))._run_single(ids) for ids in batch
+    ]
+
+    runner = _runner(CausalSession(last_only=True))
+    assert runner._run_batch(batch) == expected
+    assert runner._per_position is False
+    assert runner._run_batch(batch) == expected
+
+
+def test_private_livekit_internals_still_exist() -> None:
+    # BatchedMultilingualRunner subclasses and reuses private turn detector
+    # internals; this fails loudly when a livekit-agents upgrade moves them
+    runner_cls = multilingual._EUORunnerMultilingual
+    initialize = inspect.getsource(runner_cls.initialize)
+    assert "self._session" in initialize and "self._tokenizer" in initialize
+    assert callable(runner_cls._format_chat_ctx)
+    assert list(inspect.signature(runner_cls.run).parameters) == ["self", "data"]
+    assert isinstance(base.MAX_HISTORY_TOKENS, int)
+    assert callable(multilingual._remote_inference_url)
+    assert callable(multilingual.MultilingualModel._inference_method)
+    assert callable(_InferenceRunner.register_runner)
+    if not multilingual._remote_inference_url():
+        registered = _InferenceRunner.registered_runners
+        assert (
+            registered[BatchedMultilingualRunner.INFERENCE_METHOD]
+            is BatchedMultilingualRunner
+        )
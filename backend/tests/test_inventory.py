@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import commerce_backend
+from inventory import Inventory, OutOfStockError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_reservation_holds_stock_until_confirmed() -> None:
+    inventory = Inventory({"mug-001": 2})
+
+    reservation = inventory.reserve("mug-001", 2)
+    assert inventory.available("mug-001") == 0
+    assert inventory.reserve("mug-001") is None
+    assert "mug-001" not in inventory.in_stock_skus()
+
+    assert inventory.confirm(reservation)
+    assert not inventory.confirm(reservation)
+    assert inventory.available("mug-001") == 0
+
+
+def test_confirming_a_hold_twice_sells_nothing() -> None:
+    inventory = Inventory({"mug-001": 5})
+    reservation = inventory.reserve("mug-001", 2)
+
+    assert not inventory.confirm(reservation, reservation)
+    assert inventory.available("mug-001") == 3
+    assert inventory.confirm(reservation)
+    assert inventory.available("mug-001") == 3
+
+
+def test_expired_reservation_returns_to_stock() -> None:
+    clock = FakeClock()
+    inventory = Inventory({"hoodie-001": 1}, reservation_ttl=30, clock=clock)
+
+    reservation = inventory.reserve("hoodie-001")
+    clock.now = 31
+
+    assert inventory.available("hoodie-001") == 1
+    assert "hoodie-001" in inventory.in_stock_skus()
+    assert not inventory.confirm(reservation)
+
+
+def test_confirm_is_all_or_nothing() -> None:
+    clock = FakeClock()
+    inventory = Inventory({"a": 1, "b": 1}, reservation_ttl=10, clock=clock)
+    first = inventory.reserve("a")
+    clock.now = 5
+    second = inventory.reserve("b")
+    clock.now = 12
+
+    inventory.available("a")  # triggers expiry of the first hold
+    assert not inventory.confirm(first, second)
+    assert inventory.available("b") == 0
+    assert inventory.confirm(second)
+
+
+def test_concurrent_sessions_never_oversell() -> None:
+    inventory = Inventory({"mug-002": 3})
+
+    def checkout(_):
+        reservation = inventory.reserve("mug-002")
+        return reservation is not None and inventory.confirm(reservation)
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        sold = sum(pool.map(checkout, range(300)))
+
+    assert sold == 3
+    assert inventory.available("mug-002") == 0
+
+
+def test_rejects_non_positive_quantity() -> None:
+    with pytest.raises(ValueError):
+        Inventory({"a": 1}).reserve("a", 0)
+
+
+@pytest.fixture
+def shop(monkeypatch):
+    inventory = Inventory({"mug-001": 10, "hoodie-001": 3})
+    monkeypatch.setattr(commerce_backend, "INVENTORY", inventory)
+    monkeypatch.setattr(commerce_backend, "ORDERS", [])
+    monkeypatch.setattr(commerce_backend, "save_orders_to_file", lambda: None)
+    return inventory
+
+
+def test_small_hold_cannot_pay_for_a_bigger_line(shop) -> None:
+    hold = shop.reserve("hoodie-001", 1)
+
+    line = {"product_id": "hoodie-001", "quantity": 5, "reservation_id": hold}
+    with pytest.raises(OutOfStockError):
+        commerce_backend.create_order([line])
+    assert shop.available("hoodie-001") == 3
+
+    line["quantity"] = 3
+    assert commerce_backend.create_order([line])["items"][0]["quantity"] == 3
+    assert shop.available("hoodie-001") == 0
+
+
+def test_hold_for_another_product_is_released(shop) -> None:
+    mug_hold = shop.reserve("mug-001", 1)
+
+    commerce_backend.create_order(
+        [{"product_id": "hoodie-001", "quantity": 1, "reservation_id": mug_hold}]
+    )
+
+    assert shop.available("hoodie-001") == 2
+    assert shop.available("mug-001") == 10
+    assert shop.get_reservation(mug_hold) is None
+
+
+def test_lines_cannot_share_a_hold(shop) -> None:
+    hold = shop.reserve("mug-001", 2)
+    line = {"product_id": "mug-001", "quantity": 2, "reservation_id": hold}
+
+    with pytest.raises(ValueError):
+        commerce_backend.create_order([line, dict(line)])
+    assert shop.available("mug-001") == 8
+    assert shop.get_reservation(hold) is not None
+    assert commerce_backend.ORDERS == []
@@ -0,0 +1,64 @@
+import json
+import time
+
+from load_governor import FULL, MINIMAL, REDUCED, FrameDeadlineMonitor, LoadGovernor
+
+
+def _governor(tmp_path, cpu: float) -> LoadGovernor:
+    governor = LoadGovernor(
+        state_dir=str(tmp_path), reduced_threshold=0.6, minimal_threshold=0.8
+    )
+    governor.cpu_load = lambda: cpu
+    return governor
+
+
+def _publish(
+    tmp_path, name: str, p99_lag_ms: float, late_ratio: float = 0.0, age: float = 0.0
+) -> None:
+    entry = {
+        "room": name,
+        "updated": time.time() - age,
+        "frames": 100,
+        "p99_lag_ms": p99_lag_ms,
+        "late_ratio": late_ratio,
+    }
+    (tmp_path / f"{name}.json").write_text(json.dumps(entry))
+
+
+def test_idle_node_gets_full_profile(tmp_path) -> None:
+    assert _governor(tmp_path, cpu=0.2).select_profile() is FULL
+
+
+def test_cpu_pressure_degrades_new_sessions(tmp_path) -> None:
+    assert _governor(tmp_path, cpu=0.65).select_profile() is REDUCED
+    assert _governor(tmp_path, cpu=0.9).select_profile() is MINIMAL
+
+
+def test_late_audio_frames_raise_load(tmp_path) -> None:
+    governor = _governor(tmp_path, cpu=0.1)
+    _publish(tmp_path, "calm", p99_lag_ms=2.0)
+    _publish(tmp_path, "laggy", p99_lag_ms=18.0)
+    assert governor.load() == 18.0 / 20.0
+
+    # Stale stats from rooms that went away are ignored
+    _publish(tmp_path, "laggy", p99_lag_ms=18.0, age=60)
+    assert governor.load() == 0.1
+
+
+def test_jobs_in_one_process_publish_separately(tmp_path) -> None:
+    for job_id, lag in (("AJ_one", 2.0), ("AJ_two", 18.0)):
+        monitor = FrameDeadlineMonitor(f"room-{job_id}", job_id, str(tmp_path))
+        monitor.lags_ms.append(lag)
+        monitor._publish()
+
+    stats = LoadGovernor(state_dir=str(tmp_path)).room_stats()
+    assert sorted(room["job"] for room in stats) == ["AJ_one", "AJ_two"]
+
+
+def test_jobs_read_the_worker_cpu_sample(tmp_path) -> None:
+    LoadGovernor(state_dir=str(tmp_path))._publish_cpu(0.7)
+
+    job = LoadGovernor(state_dir=str(tmp_path))
+    assert job.cpu_load() == 0.7
+    assert job._cpu_thread is None
+    assert job.room_stats() == []
@@ -0,0 +1,97 @@
+import json
+
+from order_analytics import OrderAnalytics, stream_orders
+from pricing import PricingEngine, revenue_report
+
+
+def make_order(
+    i: int, day: str, hour: int = 10, lines=(("mug-001", 1),), currency: str = "INR"
+) -> dict:
+    return {
+        "id": f"order-{i}",
+        "items": [
+            {
+                "product_id": pid,
+                "product_name": "Crème mug",
+                "quantity": qty,
+                "unit_price": 800,
+                "unit_price_minor": 80000,
+                "currency": currency,
+            }
+            for pid, qty in lines
+        ],
+        "currency": currency,
+        "status": "CONFIRMED",
+        "created_at": f"{day}T{hour:02d}:15:00",
+    }
+
+
+def write_orders(path, orders) -> None:
+    # Same layout commerce_backend.save_orders_to_file writes
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(orders, f, indent=2, ensure_ascii=False)
+
+
+def test_streams_orders_with_resumable_offsets(tmp_path) -> None:
+    path = tmp_path / "orders.json"
+    orders = [make_order(i, "2025-12-01") for i in range(20)]
+    write_orders(path, orders)
+
+    # A tiny read size splits objects (and the two-byte "è") across reads
+    streamed = list(stream_orders(str(path), read_size=7))
+    assert [order for _, order in streamed] == orders
+
+    offset, order = streamed[12]
+    assert next(stream_orders(str(path), offset))[1] == order
+
+
+def test_reports_match_revenue_report(tmp_path) -> None:
+    path = tmp_path / "orders.json"
+    orders = [
+        make_order(1, "2025-12-01", 9, [("mug-001", 2), ("mug-002", 1)]),
+        make_order(2, "2025-12-01", 9, [("hoodie-001", 1)], currency="USD"),
+        make_order(3, "2025-12-02", 18, [("mug-001", 1)]),
+    ]
+    write_orders(path, orders)
+    analytics = OrderAnalytics(str(path), cache_path=None, chunk_size=2)
+    assert analytics.refresh() == 3
+
+    by_product = {
+        row["product"]: row["revenue_minor"] for row in analytics.report("product")
+    }
+    assert by_product == revenue_report(PricingEngine(), orders)
+
+    # Two mug lines in one order still count as one order for the category
+    mugs = next(row for row in analytics.report("category") if row["category"] == "mug")
+    assert (mugs["orders"], mugs["units"]) == (2, 4)
+
+    assert [(row["hour"], row["orders"]) for row in analytics.report("hour")] == [
+        ("09", 2),
+        ("18", 1),
+    ]
+    assert [
+        row["orders"] for row in analytics.report("currency", start="2025-12-02")
+    ] == [1]
+
+
+def test_cache_only_reads_new_orders(tmp_path) -> None:
+    path, cache = tmp_path / "orders.json", tmp_path / "cache.json"
+    orders = [make_order(i, "2025-12-01") for i in range(5)]
+    write_orders(path, orders)
+    first = OrderAnalytics(str(path), str(cache))
+    first.refresh()
+    first.save()
+
+    # commerce_backend rewrites the whole file on every order
+    orders += [make_order(i, "2025-12-02") for i in range(5, 8)]
+    write_orders(path, orders)
+    second = OrderAnalytics(str(path), str(cache))
+    assert second.refresh() == 3
+    assert second.orders == 8
+    assert sum(row["orders"] for row in second.report("hour")) == 8
+
+    # A file that no longer starts with the cached orders is re-read from scratch
+    write_orders(path, orders[6:])
+    third = OrderAnalytics(str(path), str(cache))
+    assert third.refresh() == 2
+    assert third.orders == 2
@@ -0,0 +1,57 @@
+import json
+import os
+from datetime import date
+
+from order_helper import OrderIdGenerator, OrderSink, iter_orders
+
+
+def test_order_ids_are_unique_and_monotonic() -> None:
+    ids = OrderIdGenerator()
+    generated = [ids.next_id() for _ in range(5000)]
+
+    assert len(set(generated)) == len(generated)
+    assert generated == sorted(generated)
+
+
+def test_sink_batches_into_daily_segments(tmp_path) -> None:
+    sink = OrderSink(directory=str(tmp_path), max_batch=3, max_delay=60)
+
+    for i in range(4):
+        sink.write({"drinkType": "latte", "name": f"customer-{i}"})
+
+    # Only the first full batch has been written so far
+    (segment,) = os.listdir(tmp_path)
+    with open(tmp_path / segment, encoding="utf-8") as f:
+        assert [json.loads(line)["name"] for line in f] == [
+            "customer-0",
+            "customer-1",
+            "customer-2",
+        ]
+
+    sink.close()
+    names = [
+        order["name"]
+        for order in iter_orders(date.today(), date.today(), str(tmp_path))
+    ]
+    assert names == ["customer-0", "customer-1", "customer-2", "customer-3"]
+
+
+def test_write_leaves_the_callers_order_alone(tmp_path) -> None:
+    sink = OrderSink(directory=str(tmp_path))
+    order = {"drinkType": "mocha", "name": "Ravi"}
+    order_id = sink.write(order)
+    sink.close()
+
+    assert order == {"drinkType": "mocha", "name": "Ravi"}
+    (saved,) = iter_orders(date.today(), date.today(), str(tmp_path))
+    assert saved == {**order, "id": order_id}
+
+
+def test_iter_orders_filters_by_date_range(tmp_path) -> None:
+    sink = OrderSink(directory=str(tmp_path))
+    sink.write({"id": "20250101000000000-1-000001", "name": "new year"})
+    sink.write({"id": "20250103000000000-1-000002", "name": "third"})
+    sink.close()
+
+    orders = list(iter_orders(date(2025, 1, 2), date(2025, 1, 31), str(tmp_path)))
+    assert [order["name"] for order in orders] == ["third"]
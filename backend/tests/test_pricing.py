@@ -0,0 +1,97 @@
+import numpy as np
+
+from pricing import PricingEngine, from_minor, reprice_orders, revenue_report, to_minor
+
+
+def test_minor_unit_round_trip() -> None:
+    assert to_minor(800) == 80000
+    assert to_minor(12.345) == 1235
+    assert from_minor(80000) == 800
+    assert from_minor(1235) == 12.35
+
+
+def test_quote_applies_discount_then_tax() -> None:
+    engine = PricingEngine(tax_bp=1800)
+    quote = engine.quote(
+        [
+            {"unit_price_minor": 80000, "quantity": 2, "currency": "INR"},
+            {"unit_price_minor": 65000, "quantity": 1, "currency": "INR"},
+        ],
+        discount_bp=1000,
+    )
+
+    assert quote["subtotal"] == 225000
+    assert quote["discount"] == 22500
+    assert quote["tax"] == 36450
+    assert quote["total"] == 238950
+
+
+def test_mixed_currency_cart_is_totalled_in_base_currency() -> None:
+    engine = PricingEngine(rates={"INR": 1.0, "USD": 80.0})
+    quote = engine.quote(
+        [
+            {"unit_price_minor": 1000, "quantity": 1, "currency": "USD"},
+            {"unit_price_minor": 50000, "quantity": 1, "currency": "INR"},
+        ]
+    )
+
+    assert quote["currency"] == "INR"
+    assert quote["line_totals"] == [80000, 50000]
+
+
+def test_bulk_reprice_and_revenue_report() -> None:
+    engine = PricingEngine()
+    orders = [
+        {
+            "items": [
+                {
+                    "product_id": "mug-001",
+                    "quantity": 2,
+                    "unit_price": 700,
+                    "currency": "INR",
+                }
+            ]
+        },
+        {
+            "items": [
+                {
+                    "product_id": "mug-001",
+                    "quantity": 1,
+                    "unit_price": 700,
+                    "currency": "INR",
+                },
+                {
+                    "product_id": "retired",
+                    "quantity": 1,
+                    "unit_price": 100,
+                    "currency": "INR",
+                },
+            ]
+        },
+    ]
+    catalog = {"mug-001": {"price": 800, "currency": "INR"}}
+
+    totals = reprice_orders(engine, orders, catalog)
+    assert np.array_equal(totals, [160000, 90000])
+
+    assert revenue_report(engine, orders) == {"mug-001": 210000, "retired": 10000}
+
+
+async def test_order_reply_shows_the_engine_line_total(monkeypatch) -> None:
+    import agent
+    import commerce_backend
+    from inventory import Inventory
+
+    product = {**commerce_backend.PRODUCTS_BY_ID["mug-001"], "price": 249.95}
+    monkeypatch.setitem(commerce_backend.PRODUCTS_BY_ID, "mug-001", product)
+    monkeypatch.setattr(commerce_backend, "INVENTORY", Inventory({"mug-001": 5}))
+    monkeypatch.setattr(commerce_backend, "ORDERS", [])
+    monkeypatch.setattr(commerce_backend, "save_orders_to_file", lambda: None)
+    shop = agent.EcommerceAgent()
+    monkeypatch.setattr(shop, "resolve_product", lambda reference: product)
+
+    reply = await shop.place_order(None, "the mug", 3)
+
+    # 249.95 * 3 is 749.8499999999999 in floats
+    assert "3x Stoneware Coffee Mug - ₹749.85\n" in reply
+    assert "Total: ₹749.85" in reply
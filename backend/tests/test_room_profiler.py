@@ -0,0 +1,63 @@
+import threading
+import time
+
+import room_profiler
+from room_profiler import SamplingProfiler, profiling_requested
+
+
+def handle_shopping(seconds: float) -> int:
+    # Stands in for a CPU-heavy tool
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        n += sum(i for i in range(200))
+    return n
+
+
+def test_profiling_is_requested_by_env_or_metadata() -> None:
+    assert profiling_requested("room-1", rooms="room-1, room-2")
+    assert profiling_requested("anything", rooms="*")
+    assert not profiling_requested("room-3", rooms="room-1")
+    # The metadata flag wins in both directions
+    assert profiling_requested("room-3", '{"profile": true}', rooms="")
+    assert not profiling_requested("room-1", '{"profile": false}', rooms="room-1")
+    assert not profiling_requested("room-3", "not json", rooms="")
+
+
+def test_samples_are_tagged_by_tool(tmp_path) -> None:
+    profiler = SamplingProfiler(interval=0.002, tools=["handle_shopping"])
+    profiler.start()
+    handle_shopping(0.3)
+    profiler.stop()
+
+    assert not profiler.running
+    assert profiler.get_stats()["tools"]["handle_shopping"] > 10
+
+    path = tmp_path / "room.collapsed"
+    profiler.write(str(path))
+    stack, count = path.read_text().splitlines()[0].rsplit(" ", 1)
+    assert stack.startswith("stage:tool;tool:handle_shopping;")
+    assert "test_room_profiler:handle_shopping" in stack and int(count) > 0
+
+
+def test_shared_process_samples_are_tagged_by_job(monkeypatch) -> None:
+    def job_loop() -> None:
+        monkeypatch.setitem(room_profiler._JOB_THREADS, threading.get_ident(), "job-a")
+        handle_shopping(0.3)
+
+    profiler = SamplingProfiler(
+        interval=0.002, tools=["handle_shopping"], shared_process=True
+    )
+    profiler.start()
+    # Thread executor jobs share the process, so no SIGPROF even on the main thread
+    assert profiler._thread is not None
+    thread = threading.Thread(target=job_loop)
+    thread.start()
+    thread.join()
+    profiler.stop()
+
+    assert profiler.get_stats()["jobs"]["job-a"] > 10
+    assert any(
+        stack.startswith("job:job-a;stage:tool;tool:handle_shopping;")
+        for stack in profiler.samples
+    )
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import session_factory
+from load_governor import FULL, MINIMAL, REDUCED
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+
+def test_persona_plugins_follow_config() -> None:
+    assert session_factory.persona_plugins("shopping") == [
+        "deepgram",
+        "google",
+        "murf",
+        "silero",
+        "multilingual",
+        "bvc",
+    ]
+
+
+def test_agent_modules_import_no_provider_plugins() -> None:
+    code = (
+        "import sys, agent, agent_sdr, wellness_agent\n"
+        "print(sorted(m for m in sys.modules if m.startswith('livekit.plugins') or m == 'inference_batching'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_profile_controls_turn_detection() -> None:
+    config = session_factory.PERSONAS["sdr"]
+    assert session_factory._build_turn_detection(config, REDUCED) == "vad"
+    assert session_factory._build_turn_detection(config, MINIMAL) == "vad"
+    assert (
+        session_factory._build_turn_detection({"turn_detection": "vad"}, FULL) == "vad"
+    )
+
+
+def test_unknown_provider_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        session_factory._build_llm({"provider": "nope", "model": "x"})
+
+
+async def test_profile_stream_context_reaches_adaptive_chunking() -> None:
+    config = session_factory.PERSONAS["shopping"]["tts"]
+    first_chunk_at = {}
+    for profile in (FULL, MINIMAL):
+        stream = session_factory._build_tokenizer(config, profile).stream()
+        text = "Alright, here is the blue mug."
+        for end in range(1, len(text) + 1):
+            stream.push_text(text[end - 1])
+            if not stream._event_ch.empty():
+                first_chunk_at[profile.name] = end
+                break
+        assert stream._event_ch.recv_nowait().token == "Alright,"
+
+    # The minimal profile's shorter context lets the first chunk go sooner
+    assert first_chunk_at["minimal"] < first_chunk_at["full"]
@@ -0,0 +1,97 @@
+import pytest
+
+from order_helper import is_order_complete, new_coffee_order, price_coffee_order
+from slot_filling import Slot, SlotSchema
+
+
+def test_coffee_order_asks_for_missing_slots_in_order() -> None:
+    order = new_coffee_order()
+    assert order.next_slot().name == "drinkType"
+
+    order.set("drinkType", "Latte")
+    order.set("milk", "oat")
+    assert order.next_slot().name == "size"
+    assert not is_order_complete(order)
+
+    order.set("size", "large")
+    order.set("name", "  John ")
+    assert order.next_question() is None
+    assert is_order_complete(order)
+    assert order.to_dict() == {
+        "drinkType": "latte",
+        "size": "large",
+        "milk": "oat milk",
+        "extras": [],
+        "name": "John",
+    }
+
+
+def test_extras_are_optional_deduplicated_and_priced() -> None:
+    order = new_coffee_order()
+    for slot, value in [
+        ("drinkType", "mocha"),
+        ("size", "medium"),
+        ("milk", "almond"),
+        ("name", "Sarah"),
+    ]:
+        order.set(slot, value)
+    assert is_order_complete(order)
+
+    order.set("extras", "vanilla")
+    order.set("extras", "shot")
+    order.set("extras", "Vanilla")
+
+    assert order.values["extras"] == ["vanilla", "extra shot"]
+    assert price_coffee_order(order) == 200 + 30 + 40 + 30 + 50
+
+
+def test_rejects_values_outside_schema() -> None:
+    order = new_coffee_order()
+    with pytest.raises(ValueError):
+        order.set("size", "gigantic")
+    assert not order.is_filled("size")
+
+
+def test_blank_value_clears_an_allowed_values_slot() -> None:
+    order = new_coffee_order()
+    order.set("size", "large")
+
+    assert order.set("size", "  ") == ""
+    assert not order.is_filled("size")
+    assert order.next_slot().name == "drinkType"
+    assert order.to_dict()["size"] == ""
+
+
+def test_one_extra_can_be_removed() -> None:
+    order = new_coffee_order()
+    order.set("extras", "vanilla")
+    order.set("extras", "shot")
+
+    assert order.remove("extras", "Vanilla") == "vanilla"
+    assert order.values["extras"] == ["extra shot"]
+    assert order.is_filled("extras")
+
+    order.remove("extras", "extra shot")
+    assert not order.is_filled("extras")
+    assert order.to_dict()["extras"] == []
+    with pytest.raises(ValueError):
+        order.remove("size", "large")
+
+
+def test_schema_is_reusable_for_other_personas() -> None:
+    schema = SlotSchema(
+        [
+            Slot("name", "May I have your name?"),
+            Slot("email", "Could I get your business email?"),
+            Slot("team_size", "How large is your team?", required=False),
+        ]
+    )
+    lead = schema.new_state()
+    lead.set("email", "priya@example.com")
+    assert lead.next_question() == "May I have your name?"
+
+    lead.set("name", "Priya")
+    assert lead.is_complete()
+
+    lead.set("name", "")
+    assert lead.next_slot().name == "name"
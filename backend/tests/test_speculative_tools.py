@@ -0,0 +1,71 @@
+import pytest
+
+from speculative_tools import SpeculativeTool, SpeculativeToolRunner
+
+
+def _runner(calls: list) -> SpeculativeToolRunner:
+    def run(category: str = ""):
+        calls.append(category)
+        return f"products in {category}"
+
+    return SpeculativeToolRunner(
+        [
+            SpeculativeTool(
+                "browse_catalog",
+                predict=lambda text: {"category": "mug"} if "mug" in text else None,
+                run=run,
+            ),
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_matching_call_uses_speculated_result() -> None:
+    calls: list = []
+    runner = _runner(calls)
+
+    runner.on_transcript("show me some mu")
+    runner.on_transcript("show me some mugs")
+
+    assert await runner.take("browse_catalog", {"category": "Mug"}) == "products in mug"
+    assert calls == ["mug"]
+
+    stats = runner.end_turn()
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_mismatched_or_invalidated_call_is_a_miss() -> None:
+    runner = _runner([])
+
+    runner.on_transcript("show me mugs")
+    assert await runner.take("browse_catalog", {"category": "clothing"}) is None
+
+    runner.invalidate("browse_catalog")
+    assert await runner.take("browse_catalog", {"category": "mug"}) is None
+
+    summary = runner.get_summary()
+    assert summary["hits"] == 0
+    assert summary["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_speculated_result_is_a_miss() -> None:
+    runner = SpeculativeToolRunner(
+        [SpeculativeTool("get_order_status", predict=lambda text: {}, run=lambda: None)]
+    )
+
+    runner.on_transcript("where is my order")
+    assert await runner.take("get_order_status", {}) is None
+
+    stats = runner.end_turn()
+    assert (stats["hits"], stats["misses"], stats["saved_ms"]) == (0, 1, 0.0)
+
+
+def test_browse_price_is_the_number_after_under() -> None:
+    from agent import predict_browse
+
+    assert predict_browse("something under 500 for 2 people") == {"max_price": 500}
+    assert predict_browse("anything under ₹1,000?") == {"max_price": 1000}
+    assert predict_browse("I have 2 kids, under the bed") is None
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+import tracing
+from tracing import Tracer, redact, trace_tool
+
+
+class FakeJobContext:
+    def __init__(self) -> None:
+        self.log_context_fields = {"room": "room-42"}
+        self.shutdown_callbacks = []
+
+    def add_shutdown_callback(self, callback) -> None:
+        self.shutdown_callbacks.append(callback)
+
+
+class LeadAgent:
+    @trace_tool
+    async def collect_lead_field(self, context, field: str, value: str):
+        """Collect lead information"""
+        tracing.TRACER.event("lead.field_collected", field=field)
+        if field == "bad":
+            raise ValueError(field)
+        return f"Saved {field}"
+
+
+class FaqAgent:
+    @trace_tool
+    async def answer_from_faq(self, context, question: str, top_k: int = 3):
+        """Answer a question from the FAQ"""
+        return "We offer a 14-day free trial."
+
+
+@pytest.fixture
+def tracer(tmp_path, monkeypatch):
+    tracer = Tracer(enabled=True, path=str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr(tracing, "TRACER", tracer)
+    return tracer
+
+
+def read_records(tracer: Tracer) -> list:
+    with open(tracer.path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_redacts_personal_data() -> None:
+    assert redact("value", "Asha Rao") == "[redacted]"
+    assert redact("field", "email") == "email"
+    assert (
+        redact("reply", "mail me at asha@acme.io or +91 98765 43210")
+        == "mail me at [email] or [phone]"
+    )
+    assert redact("args", {"field": "mood", "value": "anxious"}) == {
+        "field": "mood",
+        "value": "[redacted]",
+    }
+
+
+async def test_tool_spans_are_exported_with_room(tracer) -> None:
+    ctx = FakeJobContext()
+    tracing.start_tracing(ctx)
+    agent = LeadAgent()
+
+    assert (
+        await agent.collect_lead_field(object(), field="email", value="asha@acme.io")
+        == "Saved email"
+    )
+    with pytest.raises(ValueError):
+        await agent.collect_lead_field(object(), field="bad", value="x")
+    for callback in ctx.shutdown_callbacks:
+        await callback()
+
+    event, span, _, failed = read_records(tracer)
+    assert (
+        event["name"] == "lead.field_collected"
+        and event["parent"] == "tool.collect_lead_field"
+    )
+    assert span["room"] == "room-42" and span["status"] == "ok"
+    assert span["fields"]["args"] == {"field": "email", "value": "[redacted]"}
+    assert (failed["status"], failed["error"]) == ("error", "ValueError")
+
+
+async def test_speech_args_are_not_recorded(tracer) -> None:
+    await FaqAgent().answer_from_faq(
+        object(), question="I'm Asha, my card ending 4242 was charged twice", top_k=2
+    )
+    await tracer.flush()
+
+    (span,) = read_records(tracer)
+    assert span["fields"]["args"] == {"question": "[redacted]", "top_k": 2}
+
+
+async def test_lazy_fields_only_run_when_recorded(tracer) -> None:
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        return "x"
+
+    tracer.sample_rate = 0.0
+    with tracer.span("outer", detail=expensive):
+        tracer.event("inner", detail=expensive)
+    tracer.enabled = False
+    tracer.event("disabled", detail=expensive)
+    assert calls == [] and tracer.recorded == 0
+
+    tracer.enabled, tracer.sample_rate = True, 1.0
+    tracer.event("kept", detail=expensive)
+    assert calls == [1]
@@ -0,0 +1,160 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from wellness_analytics import (
+    WellnessTrends,
+    add_scores,
+    backfill,
+    entry_day,
+    normalize_energy,
+    normalize_mood,
+)
+
+START = date(2025, 11, 1)
+
+
+def check_in(
+    day: int, mood: str = "good", energy: str = "high", goals=None, completed=None
+) -> dict:
+    entry = {
+        "mood": mood,
+        "energy": energy,
+        "stressors": "",
+        "goals": goals or [],
+        "completed_goals": completed or [],
+        "summary": "",
+        "timestamp": f"{START + timedelta(days=day)}T09:00:00",
+    }
+    return add_scores(entry)
+
+
+def test_normalizes_free_text() -> None:
+    assert (
+        normalize_mood("great") > normalize_mood("okay") > normalize_mood("pretty low")
+    )
+    assert normalize_mood("a bit stressed") > normalize_mood("really stressed")
+    assert normalize_energy("7 out of 10") == pytest.approx(3.8)
+    assert normalize_energy("") is None
+    assert normalize_mood("purple") is None
+
+
+def test_windows_roll_over() -> None:
+    trends = WellnessTrends()
+    trends.add(check_in(0, mood="awful"))
+    trends.add(check_in(20, mood="great"))
+    last = entry_day(check_in(20))
+
+    assert trends.mean("mood", 7, today=last) == normalize_mood("great")
+    assert trends.mean("mood", 30, today=last) == pytest.approx(
+        (normalize_mood("awful") + normalize_mood("great")) / 2
+    )
+    # A quiet month empties both windows
+    assert trends.mean("mood", 30, today=last + 40) is None
+
+
+def test_streaks_and_goals() -> None:
+    trends = WellnessTrends()
+    for day in [0, 1, 2, 5, 6]:
+        trends.add(
+            check_in(day, goals=["walk"], completed=["walk"] if day == 6 else [])
+        )
+    last = entry_day(check_in(6))
+
+    summary = trends.summary(today=last)
+    assert (summary["streak"], summary["longest_streak"]) == (2, 3)
+    assert (summary["goals_set"], summary["goals_completed"]) == (5, 1)
+    assert trends.streak(today=last + 2) == 0
+
+
+def test_backfill_matches_incremental() -> None:
+    moods = ["great", "low", "okay", "good", "tired", "happy"]
+    entries = [
+        check_in(day // 2, mood=moods[day % len(moods)], goals=["sleep"])
+        for day in range(90)
+    ]
+    # Entries written before scores existed are normalized during backfill
+    for entry in entries[:20]:
+        del entry["mood_score"], entry["energy_score"]
+
+    incremental = WellnessTrends()
+    for entry in entries:
+        incremental.add(add_scores(dict(entry)))
+    today = entry_day(entries[-1])
+
+    assert backfill(entries).summary(today) == incremental.summary(today)
+
+
+def test_round_trips_through_json() -> None:
+    trends = backfill([check_in(day, goals=["stretch"]) for day in range(10)])
+    restored = WellnessTrends.from_dict(json.loads(json.dumps(trends.to_dict())))
+    restored.add(check_in(10, mood="great"))
+    trends.add(check_in(10, mood="great"))
+
+    today = entry_day(check_in(10))
+    assert restored.summary(today) == trends.summary(today)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    import wellness_storage
+
+    monkeypatch.setattr(
+        wellness_storage, "_ensure_data_directory", lambda: str(tmp_path)
+    )
+    monkeypatch.setattr(wellness_storage, "_trends", None)
+    monkeypatch.setattr(wellness_storage, "_trends_stamp", None)
+    return wellness_storage
+
+
+def test_trend_queries_do_not_reread_the_log(storage, monkeypatch) -> None:
+    for day in range(3):
+        assert storage.save_wellness_entry(check_in(day))
+
+    def reread():
+        raise AssertionError("the log was read for a trend query")
+
+    monkeypatch.setattr(storage, "load_wellness_log", reread)
+    assert storage.get_wellness_trends().entries == 3
+    # A new process picks up the snapshot instead
+    monkeypatch.setattr(storage, "_trends", None)
+    assert storage.get_wellness_trends().entries == 3
+
+
+def test_entries_appended_elsewhere_are_added_not_backfilled(
+    storage, monkeypatch
+) -> None:
+    for day in range(3):
+        storage.save_wellness_entry(check_in(day))
+
+    # Another process appends a check-in without updating the snapshot
+    path = storage._get_wellness_file_path()
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    entries.append(check_in(3, mood="sad"))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f)
+
+    monkeypatch.setattr(
+        storage, "backfill", lambda entries: pytest.fail("the log was backfilled")
+    )
+    trends = storage.get_wellness_trends()
+    today = entry_day(entries[-1])
+    assert trends.entries == 4
+    assert trends.summary(today) == backfill(entries).summary(today)
+
+
+def test_a_failed_trend_update_still_saves_the_check_in(storage, monkeypatch) -> None:
+    for day in range(2):
+        storage.save_wellness_entry(check_in(day))
+
+    def broken_add(self, entry):
+        raise ValueError("bad entry")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(WellnessTrends, "add", broken_add)
+        assert storage.save_wellness_entry(check_in(2))
+
+    assert len(storage.load_wellness_log()) == 3
+    assert storage.get_wellness_trends().entries == 3
@@ -10,11 +10,26 @@ export async function GET() {
       return NextResponse.json([]);
     }
 
-    const files = fs.readdirSync(ordersDir).filter(file => file.endsWith('.json'));
-    const orders = files.map(file => {
+    const files = fs.readdirSync(ordersDir).filter(file => file.endsWith('.json') || file.endsWith('.jsonl'));
+    const orders = files.flatMap(file => {
       const filePath = path.join(ordersDir, file);
       const content = fs.readFileSync(filePath, 'utf-8');
-      return JSON.parse(content);
+      if (file.endsWith('.jsonl')) {
+        // Daily order segments: one order per line. The last line of a
+        // segment that is still being written may be torn; skip it like
+        // the Python reader does.
+        return content
+          .split('\n')
+          .filter((line) => line.trim())
+          .flatMap((line) => {
+            try {
+              return [JSON.parse(line)];
+            } catch {
+              return [];
+            }
+          });
+      }
+      return [JSON.parse(content)];
     });
 
     return NextResponse.json(orders);